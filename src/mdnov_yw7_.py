@@ -1,7 +1,7 @@
 #!/usr/bin/python3
 """Converter between .mdnov and .yw7 file format.
 
-usage: mdnov_yw7.py sourcefile
+usage: mdnov_yw7.py [-w WORKERS] [-c] [-f] [-e] [--compact] [-s] [-p] [--from {yw7,mdnov}] sourcefile
 
 Version @release
 Requires Python 3.6+
@@ -19,29 +19,60 @@ but WITHOUT ANY WARRANTY; without even the implied warranty of
 MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
 GNU General Public License for more details.
 """
+import argparse
 import os
+import shutil
 import sys
+import time
+import zipfile
 
+from mdnvlib.converter.fingerprint import is_up_to_date
+from mdnvlib.converter.fingerprint import save_fingerprint
 from mdnvlib.converter.ui_cmd import UiCmd
+from mdnvlib.file.compression import get_compression
+from mdnvlib.file.compression import strip_compression
 from mdnvlib.mdnov.mdnov_file import MdnovFile
 from mdnvlib.model.novel import Novel
 from mdnvlib.model.nv_tree import NvTree
+from mdnvlib.model.writing_progress import WritingProgress
+from mdnvlib.novx_globals import Error
 from mdnvlib.novx_globals import norm_path
 from yw7lib.yw7_file import Yw7File
 
+CONVERTER_VERSION = '@release'
+ARCHIVE_EXTENSION = '.zip'
+ARCHIVE_SUFFIX = '_converted'
+MEMORY_FILE_NAME = 'novel'
+# Placeholder file name for conversions in memory
+STDIN_PATH = '-'
+
 
 class Yw7Converter():
 
-    def run(self, sourcePath):
-        sourceRoot, sourceExtension = os.path.splitext(sourcePath)
+    def run(self, sourcePath, force=False, **kwargs):
+        """Convert the source file and write the target file next to it.
+        
+        Positional arguments:
+            sourcePath: str -- path to the .yw7 or .mdnov source file.
+        
+        Optional arguments:
+            force: bool -- if True, convert even if the target file is up to date.
+            kwargs -- keyword arguments passed to the file constructors.
+            
+        Skip the conversion if the target file was created by the 
+        same converter version from the unchanged source file.
+        A compressed source file results in a target file with the same compression.
+        """
+        compression = get_compression(sourcePath)
+        sourceRoot, sourceExtension = os.path.splitext(strip_compression(sourcePath))
         if sourceExtension == Yw7File.EXTENSION:
-            targetPath = f'{sourceRoot}{MdnovFile.EXTENSION}'
-            source = Yw7File(sourcePath)
-            target = MdnovFile(targetPath)
+            targetPath = f'{sourceRoot}{MdnovFile.EXTENSION}{compression}'
+            source = Yw7File(sourcePath, **kwargs)
+            target = MdnovFile(targetPath, **kwargs)
         elif sourceExtension == MdnovFile.EXTENSION:
-            targetPath = f'{sourceRoot}{Yw7File.EXTENSION}'
-            source = MdnovFile(sourcePath)
-            target = Yw7File(targetPath)
+            targetPath = f'{sourceRoot}{Yw7File.EXTENSION}{compression}'
+            source = MdnovFile(sourcePath, **kwargs)
+            target = Yw7File(targetPath, **kwargs)
         else:
             self.ui.set_info_how(f'!File format "{sourceExtension}" is not supported.')
             return
@@ -50,26 +81,333 @@ class Yw7Converter():
             self.ui.set_info_how(f'!File not found: "{sourcePath}".')
             return
 
+        settings = self._get_settings(**kwargs)
+        if not force and is_up_to_date(sourcePath, targetPath, settings):
+            self.ui.set_info_how(f'File is up to date: "{norm_path(targetPath)}".')
+            return
+
         if os.path.isfile(targetPath):
             if not self.ui.ask_yes_no(f'Overwrite existing file "{norm_path(targetPath)}"?'):
                 self.ui.set_info_how('!Action canceled by user.')
                 return
 
         source.novel = Novel(tree=NvTree())
-        source.read()
-        target.novel = source.novel
-        target.wcLog = source.wcLog
-        target.write()
+        try:
+            source.read()
+            for message in source.readErrors:
+                self.ui.show_warning(message)
+            target.novel = source.novel
+            target.wcLog = source.wcLog
+            target.write()
+        except Error as ex:
+            self.ui.set_info_how(f'!{str(ex)}')
+            return
+
+        save_fingerprint(sourcePath, targetPath, settings)
         self.ui.set_info_how(f'File written: "{norm_path(targetPath)}".')
 
+    def run_archive(self, sourcePath, force=False, **kwargs):
+        """Convert the projects in a zip archive and write a new archive next to it.
+        
+        Positional arguments:
+            sourcePath: str -- path to the zip archive.
+        
+        Optional arguments:
+            force: bool -- if True, convert even if the target archive is up to date.
+            kwargs -- keyword arguments passed to the file constructors.
+            
+        Each .yw7 and .mdnov member is read into memory, converted, 
+        and written to the new archive in place of the source member. 
+        All other members are copied unchanged, as a stream.
+        Nothing is extracted to the file system.
+        """
+        sourceRoot, __ = os.path.splitext(sourcePath)
+        targetPath = f'{sourceRoot}{ARCHIVE_SUFFIX}{ARCHIVE_EXTENSION}'
+        if not os.path.isfile(sourcePath):
+            self.ui.set_info_how(f'!File not found: "{sourcePath}".')
+            return
+
+        settings = self._get_settings(**kwargs)
+        if not force and is_up_to_date(sourcePath, targetPath, settings):
+            self.ui.set_info_how(f'File is up to date: "{norm_path(targetPath)}".')
+            return
+
+        if os.path.isfile(targetPath):
+            if not self.ui.ask_yes_no(f'Overwrite existing file "{norm_path(targetPath)}"?'):
+                self.ui.set_info_how('!Action canceled by user.')
+                return
+
+        converted = 0
+        try:
+            with zipfile.ZipFile(sourcePath) as sourceArchive:
+                with zipfile.ZipFile(targetPath, 'w', zipfile.ZIP_DEFLATED) as targetArchive:
+                    for info in sourceArchive.infolist():
+                        targetName = self._get_target_name(info.filename)
+                        if targetName is None:
+                            with sourceArchive.open(info) as source:
+                                with targetArchive.open(info, 'w') as target:
+                                    shutil.copyfileobj(source, target)
+                            continue
+
+                        __, sourceExtension = os.path.splitext(info.filename)
+                        targetData, readErrors = convert_data(
+                            sourceArchive.read(info),
+                            sourceExtension,
+                            **kwargs
+                            )
+                        for message in readErrors:
+                            self.ui.show_warning(f'{info.filename}: {message}')
+                        targetInfo = zipfile.ZipInfo(targetName, time.localtime()[:6])
+                        targetInfo.compress_type = zipfile.ZIP_DEFLATED
+                        targetArchive.writestr(targetInfo, targetData)
+                        converted += 1
+        except (Error, zipfile.BadZipFile, zipfile.LargeZipFile, OSError) as ex:
+            try:
+                os.remove(targetPath)
+            except OSError:
+                pass
+            self.ui.set_info_how(f'!Cannot convert archive "{norm_path(sourcePath)}": {str(ex)}')
+            return
+
+        if not converted:
+            os.remove(targetPath)
+            self.ui.set_info_how(f'!No .yw7 or .mdnov file found in "{norm_path(sourcePath)}".')
+            return
+
+        save_fingerprint(sourcePath, targetPath, settings)
+        self.ui.set_info_how(f'File written: "{norm_path(targetPath)}".')
+
+    def report_progress(self, sourcePath, **kwargs):
+        """Show a writing progress report of the source file's word count log.
+
+        Positional arguments:
+            sourcePath: str -- path to the .yw7 or .mdnov source file.
+
+        Optional arguments:
+            kwargs -- keyword arguments passed to the file constructor.
+        """
+        sourceRoot, sourceExtension = os.path.splitext(strip_compression(sourcePath))
+        if sourceExtension == Yw7File.EXTENSION:
+            source = Yw7File(sourcePath, **kwargs)
+        elif sourceExtension == MdnovFile.EXTENSION:
+            source = MdnovFile(sourcePath, **kwargs)
+        else:
+            self.ui.set_info_how(f'!File format "{sourceExtension}" is not supported.')
+            return
+
+        if not os.path.isfile(sourcePath):
+            self.ui.set_info_how(f'!File not found: "{sourcePath}".')
+            return
+
+        source.novel = Novel(tree=NvTree())
+        try:
+            source.read()
+        except Error as ex:
+            self.ui.set_info_how(f'!{str(ex)}')
+            return
+
+        if not source.wcLog:
+            self.ui.set_info_how(f'!No word count log: "{norm_path(sourcePath)}".')
+            return
+
+        progress = WritingProgress(
+            source.wcLog,
+            wordTarget=source.novel.wordTarget,
+            wordCountStart=source.novel.wordCountStart,
+            )
+        latestDate, latestCount, __ = source.wcLog.latest()
+        lines = [
+            f'Writing progress: "{norm_path(sourcePath)}"',
+            f'Word count on {latestDate}: {latestCount}',
+            ]
+        delta = progress.get_delta()
+        if delta is not None:
+            lines.append(f'Words since start: {delta}')
+        lines.append(f'Average words per day (7 days): {progress.get_rolling_averages(7)[-1][1]:.1f}')
+        lines.append(f'Average words per day (30 days): {progress.get_rolling_averages(30)[-1][1]:.1f}')
+        lines.append(f'Current streak: {progress.currentStreak} days')
+        lines.append(f'Longest streak: {progress.longestStreak} days')
+        if progress.wordTarget:
+            lines.append(f'Word target: {progress.wordTarget}')
+            completion = progress.get_projected_completion()
+            if completion is not None:
+                lines.append(f'Projected completion: {completion}')
+        lines.append('Words per week:')
+        for year, week, words in progress.get_weekly_words():
+            lines.append(f'  {year}-W{week:02}: {words}')
+        self.ui.set_info_what('\n'.join(lines))
+
+    def _get_settings(self, **kwargs):
+        """Return a string identifying the converter and the options affecting the target file.
+        
+        Optional arguments:
+            kwargs -- keyword arguments passed to the file constructors.
+        """
+        settings = [CONVERTER_VERSION]
+        if kwargs.get('compact', False):
+            settings.append('compact')
+        return ';'.join(settings)
+
+    def _get_target_name(self, sourceName):
+        """Return the name of the converted project file, or None if sourceName is not a project file."""
+        sourceRoot, sourceExtension = os.path.splitext(sourceName)
+        if sourceExtension == Yw7File.EXTENSION:
+            return f'{sourceRoot}{MdnovFile.EXTENSION}'
+
+        if sourceExtension == MdnovFile.EXTENSION:
+            return f'{sourceRoot}{Yw7File.EXTENSION}'
+
+        return None
+
+
+def convert_data(data, sourceFormat, **kwargs):
+    """Convert a project in memory, without accessing the file system.
+    
+    Positional arguments:
+        data: bytes or str -- the content of a .yw7 or .mdnov file.
+        sourceFormat: str -- the source file extension, either ".yw7" or ".mdnov".
+    
+    Optional arguments:
+        kwargs -- keyword arguments passed to the file constructors.
+    
+    Return a tuple: (the converted content, list of messages about invalid source data).
+    The converted content is of the same type as data.
+    Raise the "Error" exception in case of error. 
+    """
+    if sourceFormat == Yw7File.EXTENSION:
+        source = Yw7File(f'{MEMORY_FILE_NAME}{Yw7File.EXTENSION}', **kwargs)
+        target = MdnovFile(f'{MEMORY_FILE_NAME}{MdnovFile.EXTENSION}', **kwargs)
+    elif sourceFormat == MdnovFile.EXTENSION:
+        source = MdnovFile(f'{MEMORY_FILE_NAME}{MdnovFile.EXTENSION}', **kwargs)
+        target = Yw7File(f'{MEMORY_FILE_NAME}{Yw7File.EXTENSION}', **kwargs)
+    else:
+        raise Error(f'File format "{sourceFormat}" is not supported.')
+
+    source.novel = Novel(tree=NvTree())
+    source.read_data(data)
+    target.novel = source.novel
+    target.wcLog = source.wcLog
+    targetData = target.write_data()
+    if isinstance(data, str):
+        targetData = targetData.decode('utf-8')
+    return targetData, source.readErrors
+
+
+def main(sourcePath, suffix='', workers=1, cache=False, force=False, eventParser=False, compact=False, snapshot=False, progress=False, sourceFormat=None):
+    if sourcePath == STDIN_PATH:
+        # Read the source from stdin and write the target to stdout.
+        # Messages go to stderr, so as not to mix them with the target.
+        if sourceFormat is None:
+            sys.exit('FAIL: The source format must be specified when reading from stdin.')
+
+        try:
+            targetData, readErrors = convert_data(
+                sys.stdin.buffer.read(),
+                f'.{sourceFormat}',
+                workers=workers,
+                eventParser=eventParser,
+                compact=compact,
+                )
+        except Error as ex:
+            sys.exit(f'FAIL: {str(ex)}')
+
+        for message in readErrors:
+            print(f'WARNING: {message}', file=sys.stderr)
+        sys.stdout.buffer.write(targetData)
+        return
 
-def main(sourcePath, suffix=''):
     ui = UiCmd('Converter between .mdnov and .yw7 file format')
     converter = Yw7Converter()
     converter.ui = ui
-    converter.run(sourcePath)
+    if progress:
+        converter.report_progress(sourcePath, eventParser=eventParser, snapshot=snapshot)
+        ui.start()
+        return
+
+    if sourcePath.lower().endswith(ARCHIVE_EXTENSION):
+        converter.run_archive(
+            sourcePath,
+            force=force,
+            workers=workers,
+            eventParser=eventParser,
+            compact=compact,
+            )
+        ui.start()
+        return
+
+    converter.run(
+        sourcePath,
+        force=force,
+        workers=workers,
+        cache=cache,
+        eventParser=eventParser,
+        compact=compact,
+        snapshot=snapshot,
+        )
     ui.start()
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    parser = argparse.ArgumentParser(
+        description='Converter between .mdnov and .yw7 file format',
+        )
+    parser.add_argument(
+        'sourcePath',
+        metavar='sourcefile',
+        help='the .yw7 or .mdnov file to convert, a zip archive containing such files, or - for stdin',
+        )
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=1,
+        help='maximum number of worker processes for the section content conversion',
+        )
+    parser.add_argument(
+        '-c', '--cache',
+        action='store_true',
+        help='keep the section content conversions in a cache file next to the project',
+        )
+    parser.add_argument(
+        '-f', '--force',
+        action='store_true',
+        help='convert even if the target file is up to date',
+        )
+    parser.add_argument(
+        '-e', '--event-parser',
+        action='store_true',
+        dest='eventParser',
+        help='read .yw7 files without building an element tree, saving memory',
+        )
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='write .yw7 files without indentation',
+        )
+    parser.add_argument(
+        '-s', '--snapshot',
+        action='store_true',
+        help='keep a snapshot of parsed .mdnov files next to the project for faster reloading; do not use with projects received from others',
+        )
+    parser.add_argument(
+        '-p', '--progress',
+        action='store_true',
+        help='show a writing progress report of the word count log instead of converting',
+        )
+    parser.add_argument(
+        '--from',
+        choices=['yw7', 'mdnov'],
+        dest='sourceFormat',
+        help='the format of the source read from stdin; the target is written to stdout',
+        )
+    args = parser.parse_args()
+    main(
+        args.sourcePath,
+        workers=args.workers,
+        cache=args.cache,
+        force=args.force,
+        eventParser=args.eventParser,
+        compact=args.compact,
+        snapshot=args.snapshot,
+        progress=args.progress,
+        sourceFormat=args.sourceFormat,
+        )
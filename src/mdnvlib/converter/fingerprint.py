@@ -0,0 +1,88 @@
+"""Helper module for detecting conversions that need not be repeated.
+
+After a conversion, a fingerprint file is saved next to the target file.
+It holds the size and hash of the source file, the converter settings,
+and the size and modification time of the target file.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnvlib
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from hashlib import sha256
+import json
+import os
+
+FINGERPRINT_EXTENSION = '.fingerprint'
+
+
+def get_fingerprint_path(targetPath):
+    """Return the path to the fingerprint file belonging to targetPath."""
+    return f'{targetPath}{FINGERPRINT_EXTENSION}'
+
+
+def get_file_hash(filePath):
+    """Return the SHA-256 hex digest of the file's content."""
+    fileHash = sha256()
+    with open(filePath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            fileHash.update(chunk)
+    return fileHash.hexdigest()
+
+
+def is_up_to_date(sourcePath, targetPath, settings):
+    """Return True if targetPath was converted from the unchanged sourcePath.
+
+    Positional arguments:
+        sourcePath: str -- path to the source file.
+        targetPath: str -- path to the target file.
+        settings: str -- converter version and output-relevant options.
+
+    Compare the cheap file attributes first, and hash the source only if they match.
+    Return False if the fingerprint is missing or cannot be read.
+    """
+    try:
+        with open(get_fingerprint_path(targetPath), 'r', encoding='utf-8') as f:
+            fingerprint = json.load(f)
+        if fingerprint['settings'] != settings:
+            return False
+
+        targetStat = os.stat(targetPath)
+        if fingerprint['targetSize'] != targetStat.st_size:
+            return False
+
+        if fingerprint['targetMtime'] != targetStat.st_mtime:
+            return False
+
+        if fingerprint['sourceSize'] != os.path.getsize(sourcePath):
+            return False
+
+        return fingerprint['sourceHash'] == get_file_hash(sourcePath)
+
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+
+
+def save_fingerprint(sourcePath, targetPath, settings):
+    """Save the fingerprint of a conversion next to the target file.
+
+    Positional arguments:
+        sourcePath: str -- path to the source file.
+        targetPath: str -- path to the target file just written.
+        settings: str -- converter version and output-relevant options.
+
+    A fingerprint that cannot be written just means
+    that the next conversion will not be skipped.
+    """
+    try:
+        targetStat = os.stat(targetPath)
+        fingerprint = dict(
+            settings=settings,
+            sourceSize=os.path.getsize(sourcePath),
+            sourceHash=get_file_hash(sourcePath),
+            targetSize=targetStat.st_size,
+            targetMtime=targetStat.st_mtime,
+        )
+        with open(get_fingerprint_path(targetPath), 'w', encoding='utf-8') as f:
+            json.dump(fingerprint, f)
+    except OSError:
+        pass
@@ -0,0 +1,519 @@
+"""Provide a class for a SQLite database of mdnovel projects.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnvlib
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from hashlib import sha256
+import json
+import os
+import sqlite3
+
+from mdnvlib.converter.fingerprint import get_file_hash
+from mdnvlib.mdnov.mdnov_file import MdnovFile
+from mdnvlib.model.novel import Novel
+from mdnvlib.model.novel_state import ELEMENT_KINDS
+from mdnvlib.model.novel_state import get_element_state
+from mdnvlib.model.novel_state import new_element
+from mdnvlib.model.nv_tree import NvTree
+from mdnvlib.model.word_count_log import WordCountLog
+from mdnvlib.novx_globals import CH_ROOT
+from mdnvlib.novx_globals import Error
+from mdnvlib.novx_globals import PL_ROOT
+from mdnvlib.novx_globals import _
+from mdnvlib.novx_globals import norm_path
+
+NOVEL_ID = 'book'
+# Element ID of the novel's own attributes
+
+REFERENCE_ATTRIBUTES = (
+    # (kind, element attribute holding a list of referenced IDs)
+    ('sections', 'characters'),
+    ('sections', 'locations'),
+    ('sections', 'items'),
+    ('plotLines', 'sections'),
+    )
+
+
+def get_project_key(filePath):
+    """Return the normalized absolute path identifying a project in the database.
+
+    Relative paths and symbolic links are resolved, and on Windows, the letter
+    case is normalized, so that each file is stored only once, however
+    the path is written.
+    """
+    return os.path.normcase(os.path.realpath(filePath))
+
+
+class ProjectStore:
+    """SQLite database mirroring the data model of many mdnovel projects.
+
+    The elements are stored as JSON records, with their position in the
+    project tree. Tags and references to other elements are stored in
+    separate indexed tables, so they can be queried without loading the novel.
+
+    Importing and exporting is incremental: Only elements that have
+    changed since the last synchronization are written to the database,
+    and an mdnov file is only written if its elements have changed.
+    If both the mdnov file and the project's elements in the database
+    have changed since the last synchronization, an Error is raised
+    instead of discarding either change.
+    The projects are identified by their normalized paths,
+    as returned by get_project_key().
+
+    Public methods:
+        close() -- commit the changes and close the database.
+        export_file(filePath) -- write the project to its mdnov file, if changed.
+        find_references(refId, filePath=None) -- return the elements referring to an element.
+        find_tag(tag, filePath=None) -- return the elements having a tag.
+        get_children(filePath, parentId) -- return the IDs of an element's children.
+        get_element(filePath, elemId) -- return an element instance, or None.
+        get_word_count_log(filePath) -- return the project's word count log.
+        import_file(filePath) -- read an mdnov file and store the changed elements.
+        load_novel(filePath) -- return a Novel instance built from the database.
+        set_element(filePath, elemId, element) -- store a changed element.
+    """
+    STORE_VERSION = 2
+    # Increment this, if the data model, the schema, or the project keys change.
+    # The tables of a database with another version are discarded.
+
+    def __init__(self, dbPath):
+        """Open the database; create it, if necessary.
+
+        Positional arguments:
+            dbPath: str -- path to the database file.
+
+        Raise sqlite3.Error if the database cannot be opened.
+        """
+        self._connection = sqlite3.connect(dbPath)
+        self._connection.execute('PRAGMA foreign_keys = ON')
+        version = self._connection.execute('PRAGMA user_version').fetchone()[0]
+        if version != self.STORE_VERSION:
+            for table in ('wclog', 'refs', 'tags', 'elements', 'projects'):
+                self._connection.execute(f'DROP TABLE IF EXISTS {table}')
+            self._connection.execute(f'PRAGMA user_version = {self.STORE_VERSION}')
+        self._connection.executescript(
+            '''CREATE TABLE IF NOT EXISTS projects (
+                projectId INTEGER PRIMARY KEY,
+                path TEXT NOT NULL UNIQUE,
+                fileSize INTEGER,
+                fileMtime INTEGER,
+                fileHash TEXT,
+                changed INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS elements (
+                projectId INTEGER NOT NULL REFERENCES projects ON DELETE CASCADE,
+                elemId TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                parentId TEXT,
+                position INTEGER NOT NULL,
+                title TEXT,
+                record TEXT NOT NULL,
+                hash BLOB NOT NULL,
+                PRIMARY KEY (projectId, elemId)
+            );
+            CREATE INDEX IF NOT EXISTS elementsByParent ON elements (projectId, parentId, position);
+            CREATE TABLE IF NOT EXISTS tags (
+                projectId INTEGER NOT NULL,
+                elemId TEXT NOT NULL,
+                tag TEXT NOT NULL,
+                FOREIGN KEY (projectId, elemId) REFERENCES elements ON DELETE CASCADE
+            );
+            CREATE INDEX IF NOT EXISTS tagsByTag ON tags (tag, projectId);
+            CREATE INDEX IF NOT EXISTS tagsByElement ON tags (projectId, elemId);
+            CREATE TABLE IF NOT EXISTS refs (
+                projectId INTEGER NOT NULL,
+                elemId TEXT NOT NULL,
+                refId TEXT NOT NULL,
+                FOREIGN KEY (projectId, elemId) REFERENCES elements ON DELETE CASCADE
+            );
+            CREATE INDEX IF NOT EXISTS refsByRefId ON refs (refId, projectId);
+            CREATE INDEX IF NOT EXISTS refsByElement ON refs (projectId, elemId);
+            CREATE TABLE IF NOT EXISTS wclog (
+                projectId INTEGER NOT NULL REFERENCES projects ON DELETE CASCADE,
+                date TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                totalCount INTEGER NOT NULL,
+                PRIMARY KEY (projectId, date)
+            );'''
+            )
+
+    def close(self):
+        """Commit the changes and close the database."""
+        if self._connection is None:
+            return
+
+        self._connection.commit()
+        self._connection.close()
+        self._connection = None
+
+    def export_file(self, filePath):
+        """Write the project to its mdnov file, if changed since the last synchronization.
+
+        Positional arguments:
+            filePath: str -- path to the mdnov file.
+
+        Return True if the file has been written.
+        If the file has been changed externally, but the database
+        has not, re-import the file instead of overwriting it.
+        Raise KeyError if the project is not in the database.
+        Raise Error if both the file and the database have changed.
+        """
+        projectId = self._get_project_id(filePath)
+        changed = self._is_project_changed(projectId)
+        if self._is_file_changed(projectId, filePath):
+            if changed:
+                self._raise_conflict(filePath)
+
+            self.import_file(filePath)
+            return False
+
+        if not changed and os.path.isfile(filePath):
+            return False
+
+        mdnovFile = MdnovFile(filePath)
+        mdnovFile.novel = self.load_novel(filePath)
+        mdnovFile.wcLog = self.get_word_count_log(filePath)
+        mdnovFile.write()
+        self._store_word_count_log(projectId, mdnovFile.wcLog)
+        self._store_file_state(projectId, filePath)
+        self._connection.commit()
+        return True
+
+    def find_references(self, refId, filePath=None):
+        """Return a list of (project key, element ID) tuples of the elements referring to refId.
+
+        Positional arguments:
+            refId: str -- ID of the referenced element.
+
+        Optional arguments:
+            filePath: str -- path to the mdnov file to search; if None, search all projects.
+        """
+        return self._find('refs', 'refId', refId, filePath)
+
+    def find_tag(self, tag, filePath=None):
+        """Return a list of (project key, element ID) tuples of the elements having a tag.
+
+        Positional arguments:
+            tag: str -- the tag to search for.
+
+        Optional arguments:
+            filePath: str -- path to the mdnov file to search; if None, search all projects.
+        """
+        return self._find('tags', 'tag', tag, filePath)
+
+    def get_children(self, filePath, parentId):
+        """Return a list of the IDs of an element's children, or a tree root's children.
+
+        Positional arguments:
+            filePath: str -- path to the mdnov file.
+            parentId: str -- ID of the parent element, or tree root.
+        """
+        return [
+            row[0] for row in self._connection.execute(
+                'SELECT elemId FROM elements WHERE projectId = ? AND parentId = ? ORDER BY position',
+                (self._get_project_id(filePath), parentId)
+                )
+            ]
+
+    def get_element(self, filePath, elemId):
+        """Return a new element instance built from the database, or None if not found.
+
+        Positional arguments:
+            filePath: str -- path to the mdnov file.
+            elemId: str -- element ID.
+
+        The novel's own attributes have the element ID "book".
+        """
+        row = self._connection.execute(
+            'SELECT kind, record FROM elements WHERE projectId = ? AND elemId = ?',
+            (self._get_project_id(filePath), elemId)
+            ).fetchone()
+        if row is None:
+            return None
+
+        return self._new_element(*row)
+
+    def get_word_count_log(self, filePath):
+        """Return a WordCountLog instance with the project's word count log.
+
+        Positional arguments:
+            filePath: str -- path to the mdnov file.
+        """
+        return WordCountLog(
+            self._connection.execute(
+                'SELECT date, count, totalCount FROM wclog WHERE projectId = ? ORDER BY date',
+                (self._get_project_id(filePath),)
+                )
+            )
+
+    def import_file(self, filePath):
+        """Read an mdnov file and store the elements changed since the last synchronization.
+
+        Positional arguments:
+            filePath: str -- path to the mdnov file.
+
+        Return the number of elements added, changed, or deleted.
+        Skip reading the file if its size, modification time, and hash are unchanged.
+        Raise Error if the file cannot be read, or if both the file
+        and the database have changed since the last synchronization.
+        """
+        row = self._connection.execute(
+            'SELECT projectId FROM projects WHERE path = ?',
+            (get_project_key(filePath),)
+            ).fetchone()
+        if row is not None:
+            projectId = row[0]
+            if self._is_file_unchanged(projectId, filePath):
+                return 0
+
+            if self._is_project_changed(projectId):
+                self._raise_conflict(filePath)
+
+        mdnovFile = MdnovFile(filePath)
+        mdnovFile.novel = Novel(tree=NvTree())
+        mdnovFile.read()
+        if row is None:
+            projectId = self._connection.execute(
+                'INSERT INTO projects (path) VALUES (?)',
+                (get_project_key(filePath),)
+                ).lastrowid
+        novel = mdnovFile.novel
+
+        storedElements = {}
+        for elemId, parentId, position, elemHash in self._connection.execute(
+            'SELECT elemId, parentId, position, hash FROM elements WHERE projectId = ?',
+            (projectId,)
+            ):
+            storedElements[elemId] = (parentId, position, elemHash)
+        changes = 0
+        for elemId, kind, parentId, position, element in self._get_elements(novel):
+            record, elemHash = self._get_record(element, kind)
+            stored = storedElements.pop(elemId, None)
+            if stored is None or stored[2] != elemHash:
+                self._store_element(projectId, elemId, kind, parentId, position, element, record, elemHash)
+                changes += 1
+            elif stored[:2] != (parentId, position):
+                self._connection.execute(
+                    'UPDATE elements SET parentId = ?, position = ? WHERE projectId = ? AND elemId = ?',
+                    (parentId, position, projectId, elemId)
+                    )
+                changes += 1
+        self._connection.executemany(
+            'DELETE FROM elements WHERE projectId = ? AND elemId = ?',
+            [(projectId, elemId) for elemId in storedElements]
+            )
+        changes += len(storedElements)
+        self._store_word_count_log(projectId, mdnovFile.wcLog)
+        self._store_file_state(projectId, filePath)
+        self._connection.commit()
+        return changes
+
+    def load_novel(self, filePath):
+        """Return a new Novel instance built from the database.
+
+        Positional arguments:
+            filePath: str -- path to the mdnov file.
+
+        Raise KeyError if the project is not in the database.
+        """
+        projectId = self._get_project_id(filePath)
+        novel = None
+        elements = []
+        for elemId, kind, parentId, record in self._connection.execute(
+            'SELECT elemId, kind, parentId, record FROM elements WHERE projectId = ? ORDER BY position',
+            (projectId,)
+            ):
+            element = self._new_element(kind, record)
+            if kind == 'novel':
+                novel = element
+            else:
+                elements.append((elemId, kind, parentId, element))
+        if novel is None:
+            novel = Novel()
+        novel.tree = NvTree()
+        for kind, __, __ in ELEMENT_KINDS:
+            setattr(novel, kind, {})
+        roots = [root for __, __, root in ELEMENT_KINDS if root is not None]
+        detachedElements = []
+        childElements = []
+        for elemId, kind, parentId, element in elements:
+            if parentId is None:
+                detachedElements.append((elemId, kind, element))
+            elif parentId in roots:
+                novel.tree.append(parentId, elemId)
+            else:
+                childElements.append((parentId, elemId))
+        for parentId, elemId in childElements:
+            # The parents must be in the tree before their children.
+            novel.tree.append(parentId, elemId)
+
+        # Insert the elements in tree order, like the mdnov reader does.
+        elementsById = {elemId: (kind, element) for elemId, kind, __, element in elements}
+        for root in roots:
+            for elemId in novel.tree.get_children(root):
+                kind, element = elementsById[elemId]
+                getattr(novel, kind)[elemId] = element
+                if root in (CH_ROOT, PL_ROOT):
+                    for childId in novel.tree.get_children(elemId):
+                        kind, element = elementsById[childId]
+                        getattr(novel, kind)[childId] = element
+        for elemId, kind, element in detachedElements:
+            getattr(novel, kind)[elemId] = element
+        return novel
+
+    def set_element(self, filePath, elemId, element):
+        """Store a changed element, and mark the project for export.
+
+        Positional arguments:
+            filePath: str -- path to the mdnov file.
+            elemId: str -- ID of an element already in the database.
+            element -- the changed element.
+
+        Raise KeyError if the project or the element is not in the database.
+        """
+        projectId = self._get_project_id(filePath)
+        row = self._connection.execute(
+            'SELECT kind, parentId, position FROM elements WHERE projectId = ? AND elemId = ?',
+            (projectId, elemId)
+            ).fetchone()
+        if row is None:
+            raise KeyError(elemId)
+
+        kind, parentId, position = row
+        record, elemHash = self._get_record(element, kind)
+        self._store_element(projectId, elemId, kind, parentId, position, element, record, elemHash)
+        self._connection.execute('UPDATE projects SET changed = 1 WHERE projectId = ?', (projectId,))
+
+    def _find(self, table, column, value, filePath):
+        query = f'SELECT path, elemId FROM {table} JOIN projects USING (projectId) WHERE {column} = ?'
+        parameters = [value]
+        if filePath is not None:
+            query = f'{query} AND projectId = ?'
+            parameters.append(self._get_project_id(filePath))
+        return [tuple(row) for row in self._connection.execute(query, parameters)]
+
+    def _get_elements(self, novel):
+        """Return an iterator over (elemId, kind, parentId, position, element) tuples.
+
+        The position is the index among the siblings in the tree,
+        or among the elements of the same kind, if not in the tree.
+        """
+        treePositions = {}
+        for __, __, root in ELEMENT_KINDS:
+            if root is None:
+                continue
+
+            for position, elemId in enumerate(novel.tree.get_children(root)):
+                treePositions[elemId] = (root, position)
+                if root in (CH_ROOT, PL_ROOT):
+                    for childPosition, childId in enumerate(novel.tree.get_children(elemId)):
+                        treePositions[childId] = (elemId, childPosition)
+        yield NOVEL_ID, 'novel', None, 0, novel
+        for kind, __, __ in ELEMENT_KINDS:
+            elements = getattr(novel, kind)
+            for position, elemId in enumerate(elements):
+                parentId, treePosition = treePositions.get(elemId, (None, position))
+                yield elemId, kind, parentId, treePosition, elements[elemId]
+
+    def _get_project_id(self, filePath):
+        row = self._connection.execute(
+            'SELECT projectId FROM projects WHERE path = ?',
+            (get_project_key(filePath),)
+            ).fetchone()
+        if row is None:
+            raise KeyError(filePath)
+
+        return row[0]
+
+    def _get_record(self, element, kind):
+        """Return a (JSON record, hash) tuple of the element's state."""
+        record = json.dumps(get_element_state(element, kind), sort_keys=True, ensure_ascii=False)
+        return record, sha256(record.encode('utf-8')).digest()
+
+    def _is_file_changed(self, projectId, filePath):
+        """Return True if the file exists and has changed since the last synchronization."""
+        return os.path.isfile(filePath) and not self._is_file_unchanged(projectId, filePath)
+
+    def _is_file_unchanged(self, projectId, filePath):
+        """Return True if the file's size, modification time and hash are as stored."""
+        fileSize, fileMtime, fileHash = self._connection.execute(
+            'SELECT fileSize, fileMtime, fileHash FROM projects WHERE projectId = ?',
+            (projectId,)
+            ).fetchone()
+        try:
+            fileStat = os.stat(filePath)
+            if fileSize != fileStat.st_size or fileMtime != fileStat.st_mtime_ns:
+                return False
+
+            return fileHash == get_file_hash(filePath)
+
+        except OSError:
+            return False
+
+    def _is_project_changed(self, projectId):
+        """Return True if elements have been changed in the database since the last synchronization."""
+        return bool(self._connection.execute(
+            'SELECT changed FROM projects WHERE projectId = ?',
+            (projectId,)
+            ).fetchone()[0])
+
+    def _new_element(self, kind, record):
+        return new_element(kind, json.loads(record))
+
+    def _raise_conflict(self, filePath):
+        raise Error(f'{_("File and database have both changed")}: "{norm_path(filePath)}".')
+
+    def _store_element(self, projectId, elemId, kind, parentId, position, element, record, elemHash):
+        """Insert or replace the element with its tags and references."""
+        self._connection.execute(
+            'DELETE FROM elements WHERE projectId = ? AND elemId = ?',
+            (projectId, elemId)
+            )
+        self._connection.execute(
+            'INSERT INTO elements VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (projectId, elemId, kind, parentId, position, element.title, record, elemHash)
+            )
+        tags = getattr(element, 'tags', None)
+        if tags:
+            self._connection.executemany(
+                'INSERT INTO tags VALUES (?, ?, ?)',
+                [(projectId, elemId, tag) for tag in tags]
+                )
+        refIds = []
+        for refKind, attribute in REFERENCE_ATTRIBUTES:
+            if refKind == kind:
+                refIds.extend(getattr(element, attribute) or [])
+        if kind == 'plotPoints' and element.sectionAssoc:
+            refIds.append(element.sectionAssoc)
+        if refIds:
+            self._connection.executemany(
+                'INSERT INTO refs VALUES (?, ?, ?)',
+                [(projectId, elemId, refId) for refId in refIds]
+                )
+
+    def _store_file_state(self, projectId, filePath):
+        """Store the file's size, modification time and hash, and clear the changed flag."""
+        fileStat = os.stat(filePath)
+        self._connection.execute(
+            'UPDATE projects SET fileSize = ?, fileMtime = ?, fileHash = ?, changed = 0 WHERE projectId = ?',
+            (fileStat.st_size, fileStat.st_mtime_ns, get_file_hash(filePath), projectId)
+            )
+
+    def _store_word_count_log(self, projectId, wcLog):
+        """Store the entries of the word count log that are new or changed."""
+        stored = {
+            row[0]: (row[1], row[2]) for row in self._connection.execute(
+                'SELECT date, count, totalCount FROM wclog WHERE projectId = ?',
+                (projectId,)
+                )
+            }
+        changedEntries = []
+        for wcDate, count, totalCount in wcLog:
+            if stored.pop(wcDate, None) != (count, totalCount):
+                changedEntries.append((projectId, wcDate, count, totalCount))
+        self._connection.executemany('INSERT OR REPLACE INTO wclog VALUES (?, ?, ?, ?)', changedEntries)
+        self._connection.executemany(
+            'DELETE FROM wclog WHERE projectId = ? AND date = ?',
+            [(projectId, wcDate) for wcDate in stored]
+            )
@@ -0,0 +1,58 @@
+"""Helper module for reading and writing compressed files.
+
+Files with a ".gz" or ".xz" extension appended are decompressed
+when reading, and compressed when writing, as a stream.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnvlib
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import gzip
+import lzma
+
+COMPRESSORS = {
+    '.gz': gzip.open,
+    '.xz': lzma.open,
+    }
+COMPRESSION_ERRORS = (OSError, EOFError, lzma.LZMAError)
+# Errors raised when reading corrupt or truncated compressed files
+
+
+def get_compression(filePath):
+    """Return the compression extension of filePath in lower case, or an empty string."""
+    extension = filePath[-3:].lower()
+    if extension in COMPRESSORS:
+        return extension
+
+    return ''
+
+
+def strip_compression(filePath):
+    """Return filePath without compression extension."""
+    compression = get_compression(filePath)
+    if compression:
+        return filePath[:-len(compression)]
+
+    return filePath
+
+
+def open_file(filePath, mode='r', encoding=None):
+    """Return a file object, compressing or decompressing according to the extension.
+
+    Positional arguments:
+        filePath: str -- path to the file.
+
+    Optional arguments:
+        mode: str -- file mode, as for open(); text mode is the default.
+        encoding: str -- text encoding, as for open().
+
+    Raise OSError if the file cannot be opened.
+    Reading corrupt compressed data raises one of COMPRESSION_ERRORS.
+    """
+    compressor = COMPRESSORS.get(get_compression(filePath), None)
+    if compressor is None:
+        return open(filePath, mode, encoding=encoding)
+
+    if 'b' not in mode and 't' not in mode:
+        mode = f'{mode}t'
+    return compressor(filePath, mode, encoding=encoding)
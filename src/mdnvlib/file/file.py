@@ -10,7 +10,8 @@ from abc import ABC
 import os
 from urllib.parse import quote
 
-from mdnvlib.novx_globals import _
+from mdnvlib.file.compression import strip_compression
+from mdnvlib.novx_globals import LazyTranslation
 
 
 class File(ABC):
@@ -20,7 +21,7 @@ class File(ABC):
     attributes and structural information (a full set or a subset
     of the information included in a mdnovel project file).
     """
-    DESCRIPTION = _('File')
+    DESCRIPTION = LazyTranslation('File')
     EXTENSION = None
     SUFFIX = None
     # To be extended by subclass methods.
@@ -42,6 +43,8 @@ class File(ABC):
         self.projectPath = None
         # URL-coded path to the project directory.
         self.sectionsSplit = False
+        self.readErrors = []
+        # Messages about invalid data that has been skipped while reading.
         self.filePath = filePath
 
     @property
@@ -53,20 +56,22 @@ class File(ABC):
         """Setter for the filePath instance variable.
                 
         - Format the path string according to Python's requirements. 
-        - Accept only filenames with the right suffix and extension.
+        - Accept only filenames with the right suffix and extension,
+          optionally followed by a compression extension.
         """
         filePath = filePath.replace('\\', '/')
         if self.SUFFIX is not None:
             suffix = self.SUFFIX
         else:
             suffix = ''
-        if filePath.lower().endswith(f'{suffix}{self.EXTENSION}'.lower()):
+        basePath = strip_compression(filePath)
+        if basePath.lower().endswith(f'{suffix}{self.EXTENSION}'.lower()):
             self._filePath = filePath
             try:
-                head, tail = os.path.split(os.path.realpath(filePath))
+                head, tail = os.path.split(os.path.realpath(basePath))
                 # realpath() completes relative paths, but may not work on virtual file systems.
             except:
-                head, tail = os.path.split(filePath)
+                head, tail = os.path.split(basePath)
             self.projectPath = quote(head.replace('\\', '/'), '/:')
             self.projectName = quote(tail.replace(f'{suffix}{self.EXTENSION}', ''))
 
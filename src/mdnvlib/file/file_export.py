@@ -9,6 +9,7 @@ License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 import os
 from string import Template
 
+from mdnvlib.file.compression import open_file
 from mdnvlib.file.file import File
 from mdnvlib.file.filter import Filter
 from mdnvlib.model.character import Character
@@ -98,7 +99,7 @@ class FileExport(File):
             else:
                 backedUp = True
         try:
-            with open(self.filePath, 'w', encoding='utf-8') as f:
+            with open_file(self.filePath, 'w', encoding='utf-8') as f:
                 f.write(text)
         except:
             if backedUp:
@@ -0,0 +1,56 @@
+"""Helper module for distributing CPU-bound work to a process pool.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnvlib
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from mdnvlib.novx_globals import is_headless
+from mdnvlib.novx_globals import set_headless
+
+MIN_PARALLEL_ITEMS = 64
+# Below this number of items, starting worker processes costs more than it saves.
+
+
+def map_in_batches(function, items, workers=1, batchSize=None):
+    """Return a list with the results of function applied to each of the items.
+
+    Positional arguments:
+        function -- module-level function taking one item as argument.
+        items: list -- arguments to be processed.
+
+    Optional arguments:
+        workers: int -- maximum number of worker processes.
+        batchSize: int -- number of items sent to a worker at once.
+
+    The result order corresponds to the item order, no matter
+    which worker has processed an item. With one worker, or with
+    only a few items, process the items in the calling process.
+    If the pool cannot be started, or a worker process dies,
+    process all items again in the calling process.
+    The workers skip the localization, if the calling process does.
+    """
+    if workers is None or workers < 2 or len(items) < MIN_PARALLEL_ITEMS:
+        return [function(item) for item in items]
+
+    if not batchSize:
+        batchSize = max(1, len(items) // (workers * 4))
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(is_headless(),),
+            ) as executor:
+            return list(executor.map(function, items, chunksize=batchSize))
+
+    except (NotImplementedError, OSError, BrokenProcessPool):
+        # The platform does not support process pools, or a worker has died.
+        return [function(item) for item in items]
+
+
+def _init_worker(headless):
+    """Pass the calling process's settings on to a worker process."""
+    if headless:
+        set_headless()
@@ -7,9 +7,14 @@ License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 from datetime import date
 import os
 
+from mdnvlib.file.compression import COMPRESSION_ERRORS
+from mdnvlib.file.compression import open_file
 from mdnvlib.md.md_file import MdFile
 from mdnvlib.md.md_helper import sanitize_markdown
+from mdnvlib.mdnov.mdnov_snapshot import load_snapshot
+from mdnvlib.mdnov.mdnov_snapshot import save_snapshot
 from mdnvlib.model.basic_element import BasicElement
+from mdnvlib.model.bulk_load import BulkLoad
 from mdnvlib.model.chapter import Chapter
 from mdnvlib.model.character import Character
 from mdnvlib.model.novel import Novel
@@ -17,14 +22,17 @@ from mdnvlib.model.plot_line import PlotLine
 from mdnvlib.model.plot_point import PlotPoint
 from mdnvlib.model.section import Section
 from mdnvlib.model.world_element import WorldElement
+from mdnvlib.model.word_count_log import WordCountLog
 from mdnvlib.novx_globals import CHAPTER_PREFIX
 from mdnvlib.novx_globals import CHARACTER_PREFIX
 from mdnvlib.novx_globals import CH_ROOT
 from mdnvlib.novx_globals import CR_ROOT
+from mdnvlib.novx_globals import Error
 from mdnvlib.novx_globals import ITEM_PREFIX
 from mdnvlib.novx_globals import IT_ROOT
 from mdnvlib.novx_globals import LC_ROOT
 from mdnvlib.novx_globals import LOCATION_PREFIX
+from mdnvlib.novx_globals import LazyTranslation
 from mdnvlib.novx_globals import PLOT_LINE_PREFIX
 from mdnvlib.novx_globals import PLOT_POINT_PREFIX
 from mdnvlib.novx_globals import PL_ROOT
@@ -33,20 +41,19 @@ from mdnvlib.novx_globals import PRJ_NOTE_PREFIX
 from mdnvlib.novx_globals import SECTION_PREFIX
 from mdnvlib.novx_globals import _
 from mdnvlib.novx_globals import intersection
-from mdnvlib.novx_globals import list_to_string
 
 
 class MdnovFile(MdFile):
     """mdnov file representation.
 
     Public instance variables:
-        wcLog: dict[str, list[str, str]] -- Daily word count logs.
-        wcLogUpdate: dict[str, list[str, str]] -- Word counts missing in the log.
+        wcLog: WordCountLog -- Daily word count logs.
+        wcLogUpdate: WordCountLog -- Word counts missing in the log.
         timestamp: float -- Time of last file modification (number of seconds since the epoch).
     
     
     """
-    DESCRIPTION = _('mdnovel project')
+    DESCRIPTION = LazyTranslation('mdnovel project')
     EXTENSION = '.mdnov'
 
     _fileHeader = '''@@book
@@ -135,26 +142,27 @@ $Links$Desc
             filePath: str -- path to the mdnov file.
             
         Optional arguments:
-            kwargs -- keyword arguments (not used here).            
+            workers: int -- maximum number of worker processes for counting words.
+            snapshot: bool -- if True, keep a binary snapshot of the parsed file next to it,
+                              and read the snapshot instead as long as the file is unchanged.
         
         Extends the superclass constructor.
         """
         super().__init__(filePath)
         self.on_element_change = None
+        self.workers = kwargs.get('workers', 1)
+        self.useSnapshot = kwargs.get('snapshot', False)
 
-        self.wcLog = {}
-        # key: str -- date (iso formatted)
-        # value: list -- [word count: str, with unused: str]
-
-        self.wcLogUpdate = {}
-        # key: str -- date (iso formatted)
-        # value: list -- [word count: str, with unused: str]
+        self.wcLog = WordCountLog()
+        self.wcLogUpdate = WordCountLog()
 
         self.timestamp = None
         self._range = None
         self._collectedLines = None
+        self._elemId = None
         self._properties = {}
         self._plId = None
+        self._bulkLoad = None
 
     def adjust_section_types(self):
         """Make sure that nodes with "Unused" parents inherit the type."""
@@ -189,13 +197,66 @@ $Links$Desc
         """Read and parse the mdnov file.
         
         Overrides the superclass method.
+        Raise the "Error" exception in case of error. 
+        """
+        if self.useSnapshot and self._read_snapshot():
+            return
+
+        try:
+            with open_file(self.filePath, 'r', encoding='utf-8') as f:
+                lines = f.read().split('\n')
+        except (UnicodeDecodeError,) + COMPRESSION_ERRORS as ex:
+            raise Error(f'{_("Can not process file")} - {str(ex)}')
+
+        self._read_lines(lines)
+        if self.useSnapshot:
+            save_snapshot(self.filePath, self.novel, self.wcLog, self.readErrors)
+        self._get_timestamp()
+        self._keep_word_count()
+
+    def read_data(self, data):
+        """Get the instance variables from the content of a mdnov file.
+        
+        Positional arguments:
+            data: bytes or str -- the file content.
+        
+        The file is neither opened nor checked for a snapshot.
+        Raise the "Error" exception in case of error. 
         """
-        with open(self.filePath, 'r', encoding='utf-8') as f:
-            lines = f.read().split('\n')
+        if isinstance(data, str):
+            text = data
+        else:
+            try:
+                text = data.decode('utf-8')
+            except UnicodeDecodeError as ex:
+                raise Error(f'{_("Can not process file")} - {str(ex)}')
+
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        # Translate the line breaks like reading the file in text mode does.
+        self._read_lines(text.split('\n'))
+        self.timestamp = None
+        self._keep_word_count()
+
+    def write(self):
+        self._update_word_count_log()
+        self.adjust_section_types()
+        super().write()
+        self._get_timestamp()
+
+    def write_data(self):
+        """Return the content of a mdnov file as bytes, without writing the file."""
+        self._update_word_count_log()
+        self.adjust_section_types()
+        return self._get_text().encode('utf-8')
+
+    def _read_lines(self, lines):
+        """Parse the lines of a mdnov file and get the instance variables."""
         processor = None
         elemId = None
         chId = None
         self._collectedLines = None
+        self.readErrors = []
+        self._bulkLoad = BulkLoad(on_element_change=self.on_element_change, workers=self.workers)
         self.novel.tree.reset()
         for self._line in lines:
             if self._line.startswith('@@book'):
@@ -207,7 +268,7 @@ $Links$Desc
             if self._line.startswith(f'@@{CHAPTER_PREFIX}'):
                 processor = self._read_chapter
                 elemId = self._line.split('@@')[1].strip()
-                self.novel.chapters[elemId] = Chapter(on_element_change=self.on_element_change)
+                self.novel.chapters[elemId] = self._bulkLoad.create(Chapter)
                 self.novel.tree.append(CH_ROOT, elemId)
                 element = self.novel.chapters[elemId]
                 chId = elemId
@@ -216,7 +277,7 @@ $Links$Desc
             if self._line.startswith(f'@@{CHARACTER_PREFIX}'):
                 processor = self._read_character
                 elemId = self._line.split('@@')[1].strip()
-                self.novel.characters[elemId] = Character(on_element_change=self.on_element_change)
+                self.novel.characters[elemId] = self._bulkLoad.create(Character)
                 self.novel.tree.append(CR_ROOT, elemId)
                 element = self.novel.characters[elemId]
                 continue
@@ -224,7 +285,7 @@ $Links$Desc
             if self._line.startswith(f'@@{ITEM_PREFIX}'):
                 processor = self._read_world_element
                 elemId = self._line.split('@@')[1].strip()
-                self.novel.items[elemId] = WorldElement(on_element_change=self.on_element_change)
+                self.novel.items[elemId] = self._bulkLoad.create(WorldElement)
                 self.novel.tree.append(IT_ROOT, elemId)
                 element = self.novel.items[elemId]
                 continue
@@ -232,7 +293,7 @@ $Links$Desc
             if self._line.startswith(f'@@{LOCATION_PREFIX}'):
                 processor = self._read_world_element
                 elemId = self._line.split('@@')[1].strip()
-                self.novel.locations[elemId] = WorldElement(on_element_change=self.on_element_change)
+                self.novel.locations[elemId] = self._bulkLoad.create(WorldElement)
                 self.novel.tree.append(LC_ROOT, elemId)
                 element = self.novel.locations[elemId]
                 continue
@@ -240,7 +301,7 @@ $Links$Desc
             if self._line.startswith(f'@@{PLOT_LINE_PREFIX}'):
                 processor = self._read_plot_line
                 elemId = self._line.split('@@')[1].strip()
-                self.novel.plotLines[elemId] = PlotLine(on_element_change=self.on_element_change)
+                self.novel.plotLines[elemId] = self._bulkLoad.create(PlotLine)
                 self.novel.tree.append(PL_ROOT, elemId)
                 element = self.novel.plotLines[elemId]
                 plId = elemId
@@ -249,7 +310,7 @@ $Links$Desc
             if self._line.startswith(f'@@{PLOT_POINT_PREFIX}'):
                 processor = self._read_plot_point
                 elemId = self._line.split('@@')[1].strip()
-                self.novel.plotPoints[elemId] = PlotPoint(on_element_change=self.on_element_change)
+                self.novel.plotPoints[elemId] = self._bulkLoad.create(PlotPoint)
                 self.novel.tree.append(plId, elemId)
                 element = (self.novel.plotPoints[elemId])
                 continue
@@ -265,7 +326,7 @@ $Links$Desc
             if self._line.startswith(f'@@{SECTION_PREFIX}'):
                 processor = self._read_section
                 elemId = self._line.split('@@')[1].strip()
-                self.novel.sections[elemId] = Section(on_element_change=self.on_element_change)
+                self.novel.sections[elemId] = self._bulkLoad.create(Section)
                 self.novel.tree.append(chId, elemId)
                 element = self.novel.sections[elemId]
                 continue
@@ -276,6 +337,7 @@ $Links$Desc
                 continue
 
             if processor is not None:
+                self._elemId = elemId
                 processor(element)
 
         for scId in self.novel.sections:
@@ -303,14 +365,8 @@ $Links$Desc
             for scId in self.novel.plotLines[plId].sections:
                 self.novel.sections[scId].scPlotLines.append(plId)
 
-        self._get_timestamp()
-        self._keep_word_count()
-
-    def write(self):
-        self._update_word_count_log()
-        self.adjust_section_types()
-        super().write()
-        self._get_timestamp()
+        self._bulkLoad.commit()
+        self._bulkLoad = None
 
     def _add_key(self, text, key):
         if not key:
@@ -392,17 +448,13 @@ $Links$Desc
             return mapping
 
         lines = ['@@Progress']
-        wcLastCount = None
-        wcLastTotalCount = None
-        for wc in self.wcLog:
-            if self.novel.saveWordCount:
-                # Discard entries with unchanged word count.
-                if self.wcLog[wc][0] == wcLastCount and self.wcLog[wc][1] == wcLastTotalCount:
-                    continue
-
-                wcLastCount = self.wcLog[wc][0]
-                wcLastTotalCount = self.wcLog[wc][1]
-            lines.append(f'- {list_to_string([wc, self.wcLog[wc][0], self.wcLog[wc][1]])}')
+        if self.novel.saveWordCount:
+            # Discard entries with unchanged word count.
+            entries = self.wcLog.compacted()
+        else:
+            entries = self.wcLog
+        for wcDate, count, totalCount in entries:
+            lines.append(f'- {wcDate};{count};{totalCount}')
         mapping['Wordcountlog'] = '\n'.join(lines)
         return mapping
 
@@ -465,18 +517,14 @@ $Links$Desc
         if not self.wcLog:
             return
 
-        actualCountInt, actualTotalCountInt = self.count_words()
-        actualCount = str(actualCountInt)
-        actualTotalCount = str(actualTotalCountInt)
-        latestDate = list(self.wcLog)[-1]
-        latestCount = self.wcLog[latestDate][0]
-        latestTotalCount = self.wcLog[latestDate][1]
+        actualCount, actualTotalCount = self.count_words()
+        __, latestCount, latestTotalCount = self.wcLog.latest()
         if actualCount != latestCount or actualTotalCount != latestTotalCount:
             try:
                 fileDateIso = date.fromtimestamp(self.timestamp).isoformat()
             except:
                 fileDateIso = date.today().isoformat()
-            self.wcLogUpdate[fileDateIso] = [actualCount, actualTotalCount]
+            self.wcLogUpdate.add(fileDateIso, actualCount, actualTotalCount)
 
     def _read_element(self, element):
         if self._line.startswith('---'):
@@ -485,6 +533,8 @@ $Links$Desc
                 self._collectedLines = []
             else:
                 element.from_yaml(self._collectedLines)
+                for message in element.get_yaml_errors():
+                    self.readErrors.append(f'{self._elemId or "book"}: {message}')
                 self._range = None
             return
 
@@ -494,7 +544,10 @@ $Links$Desc
                 # write collected lines
                 text = '\n'.join(self._collectedLines).strip()
                 classProperty = self._properties.get(self._range, None)
-                if classProperty is not None:
+                if classProperty is Section.sectionContent:
+                    self._bulkLoad.set_section_content(element, f'{text}\n')
+                    self._plId = None
+                elif classProperty is not None:
                     classProperty.fset(element, f'{text}\n')
                     self._plId = None
                 elif self._range == 'Plotline':
@@ -578,6 +631,35 @@ $Links$Desc
         }
         self._read_element(element)
 
+    def _read_snapshot(self):
+        """Take the novel and the word count log from a fresh snapshot.
+
+        Return True on success, or False if the file must be parsed.
+        """
+        snapshot = load_snapshot(self.filePath, self.novel)
+        if snapshot is None:
+            return False
+
+        self.wcLog, self.readErrors = snapshot
+        if self.on_element_change is not None:
+            elementDicts = (
+                self.novel.chapters,
+                self.novel.sections,
+                self.novel.plotLines,
+                self.novel.plotPoints,
+                self.novel.characters,
+                self.novel.locations,
+                self.novel.items,
+                )
+            for elements in elementDicts:
+                for element in elements.values():
+                    element.on_element_change = self.on_element_change
+            self.on_element_change()
+            # Notify once for the whole load, like BulkLoad.commit().
+        self._get_timestamp()
+        self._keep_word_count()
+        return True
+
     def _read_word_count_log(self, element):
         self._range = 'Progress'
         self._read_element(element)
@@ -606,18 +688,17 @@ $Links$Desc
             if not line:
                 continue
 
-            wc = (line.strip('- ').split(';'))
-            self.wcLog[wc[0]] = [wc[1], wc[2]]
+            try:
+                wcDate, count, totalCount = line.strip('- ').split(';')
+                self.wcLog.add(wcDate, count, totalCount)
+            except ValueError:
+                self.readErrors.append(f'{_("Invalid word count log entry")}: "{line}"')
 
     def _update_word_count_log(self):
         """Add today's word count and word count when reading, if not logged."""
         if self.novel.saveWordCount:
-            newCountInt, newTotalCountInt = self.count_words()
-            newCount = str(newCountInt)
-            newTotalCount = str(newTotalCountInt)
-            todayIso = date.today().isoformat()
-            self.wcLogUpdate[todayIso] = [newCount, newTotalCount]
-            for wcDate in self.wcLogUpdate:
-                self.wcLog[wcDate] = self.wcLogUpdate[wcDate]
-        self.wcLogUpdate = {}
+            newCount, newTotalCount = self.count_words()
+            self.wcLogUpdate.add(date.today().isoformat(), newCount, newTotalCount)
+            self.wcLog.update(self.wcLogUpdate)
+        self.wcLogUpdate = WordCountLog()
 
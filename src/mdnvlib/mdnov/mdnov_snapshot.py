@@ -0,0 +1,111 @@
+"""Helper module for snapshots of parsed mdnov files.
+
+A snapshot file is saved next to the mdnov file. It holds the
+parsed novel and word count log, so that reading the unchanged
+file again does not require parsing.
+
+The snapshot begins with a header holding a magic number, the format
+version, and the size, modification time and hash of the mdnov file.
+The data follows as JSON. Unlike pickled data, a snapshot supplied 
+together with a project cannot execute code when being loaded.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnvlib
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import json
+import os
+import struct
+
+from mdnvlib.converter.fingerprint import get_file_hash
+from mdnvlib.model.novel_state import get_novel_state
+from mdnvlib.model.novel_state import set_novel_state
+from mdnvlib.model.word_count_log import WordCountLog
+
+SNAPSHOT_EXTENSION = '.snapshot'
+SNAPSHOT_MAGIC = b'MDNVSNAP'
+SNAPSHOT_VERSION = 2
+# Increment this when the data model changes.
+# Snapshots of other versions are ignored.
+_HEADER = struct.Struct('<8sHQq64s')
+# magic, version, file size, file mtime in nanoseconds, file hash (hex digest)
+
+
+def get_snapshot_path(filePath):
+    """Return the path to the snapshot file belonging to filePath."""
+    return f'{filePath}{SNAPSHOT_EXTENSION}'
+
+
+def load_snapshot(filePath, novel):
+    """Load a fresh snapshot into novel; return the (wcLog, readErrors) tuple, or None.
+
+    Positional arguments:
+        filePath: str -- path to the mdnov file.
+        novel: Novel -- the novel to be filled, with its tree.
+
+    Compare the cheap file attributes first, and hash the file only if they match.
+    Return None if the snapshot is missing, stale, of another version,
+    or cannot be read. The novel is left unchanged in this case.
+    """
+    try:
+        with open(get_snapshot_path(filePath), 'rb') as f:
+            magic, version, fileSize, fileMtime, fileHash = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                return None
+
+            fileStat = os.stat(filePath)
+            if fileSize != fileStat.st_size or fileMtime != fileStat.st_mtime_ns:
+                return None
+
+            if fileHash.decode('ascii') != get_file_hash(filePath):
+                return None
+
+            data = json.loads(f.read().decode('utf-8'))
+        wcLog = WordCountLog(data['wcLog'])
+        readErrors = list(data['readErrors'])
+        set_novel_state(novel, data['novel'])
+        return wcLog, readErrors
+
+    except Exception:
+        # Any error just means that the file must be parsed.
+        return None
+
+
+def save_snapshot(filePath, novel, wcLog, readErrors):
+    """Save a snapshot of the parsed mdnov file next to it.
+
+    Positional arguments:
+        filePath: str -- path to the mdnov file just read.
+        novel: Novel -- the parsed novel.
+        wcLog: WordCountLog -- the parsed word count log.
+        readErrors: list of str -- messages about invalid data.
+
+    A snapshot that cannot be written just means that
+    the file will be parsed again next time.
+    """
+    snapshotPath = get_snapshot_path(filePath)
+    try:
+        fileStat = os.stat(filePath)
+        header = _HEADER.pack(
+            SNAPSHOT_MAGIC,
+            SNAPSHOT_VERSION,
+            fileStat.st_size,
+            fileStat.st_mtime_ns,
+            get_file_hash(filePath).encode('ascii'),
+            )
+        data = json.dumps(
+            {
+                'novel': get_novel_state(novel),
+                'wcLog': list(wcLog),
+                'readErrors': readErrors,
+            },
+            ensure_ascii=False,
+            ).encode('utf-8')
+        with open(snapshotPath, 'wb') as f:
+            f.write(header)
+            f.write(data)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.remove(snapshotPath)
+        except OSError:
+            pass
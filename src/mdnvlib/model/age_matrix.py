@@ -0,0 +1,132 @@
+"""Provide a class for the ages of the characters at the section dates.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnvlib
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from datetime import date
+from datetime import datetime
+
+from mdnvlib.model.date_time_tools import difference_in_years
+
+
+class AgeMatrix:
+    """Ages of all characters at the dates of all sections.
+
+    Public methods:
+        get_age(crId, scId) -- return a character's age at a section's date.
+        get_character_ages(crId) -- return a character's ages at all section dates.
+        get_section_ages(scId) -- return all characters' ages at a section's date.
+
+    The ages are calculated like date_time_tools.get_age() does:
+    A positive value indicates the age.
+    A negative value indicates the number of years since death.
+    None indicates that the age is unknown.
+
+    All dates are parsed only once, and the ages are computed once
+    per character and distinct section date, however many sections
+    share a date. Sections with day instead of date are placed
+    relative to the novel's reference date; out of the date range,
+    their ages are unknown.
+    The matrix is not updated when the novel changes.
+    """
+
+    def __init__(self, novel):
+        """Compute the ages.
+
+        Positional arguments:
+            novel: Novel -- the novel whose characters and sections are used.
+        """
+        referenceDay = None
+        if novel.referenceDate:
+            referenceDay = date.fromisoformat(novel.referenceDate).toordinal()
+
+        # Map the sections to the distinct dates.
+        self._dateIndices = {}
+        # key: str -- section ID, value: int -- index of the section date
+        dateIndices = {}
+        # key: int -- date ordinal, value: int -- index of the date
+        for scId, section in novel.sections.items():
+            try:
+                if section.date:
+                    day = date.fromisoformat(section.date).toordinal()
+                elif section.day and referenceDay is not None:
+                    day = referenceDay + int(section.day)
+                else:
+                    continue
+
+                if not 1 <= day <= date.max.toordinal():
+                    continue
+
+            except ValueError:
+                continue
+
+            if day not in dateIndices:
+                dateIndices[day] = len(dateIndices)
+            self._dateIndices[scId] = dateIndices[day]
+        sectionDates = [None] * len(dateIndices)
+        for day, i in dateIndices.items():
+            sectionDates[i] = datetime.fromordinal(day)
+
+        # Compute the ages per character and section date.
+        self._ages = {}
+        # key: str -- character ID, value: list of int or None -- ages by date index
+        for crId, character in novel.characters.items():
+            birthDate = _parse_date(character.birthDate)
+            deathDate = _parse_date(character.deathDate)
+            self._ages[crId] = [_get_age(now, birthDate, deathDate) for now in sectionDates]
+
+    def get_age(self, crId, scId):
+        """Return the character's age at the section's date, or None if unknown."""
+        i = self._dateIndices.get(scId, None)
+        if i is None or crId not in self._ages:
+            return None
+
+        return self._ages[crId][i]
+
+    def get_character_ages(self, crId):
+        """Return a dictionary of the character's ages by section ID."""
+        ages = self._ages.get(crId, None)
+        if ages is None:
+            return {}
+
+        return {scId: ages[i] for scId, i in self._dateIndices.items()}
+
+    def get_section_ages(self, scId):
+        """Return a dictionary of all characters' ages at the section's date by character ID."""
+        i = self._dateIndices.get(scId, None)
+        if i is None:
+            return {crId: None for crId in self._ages}
+
+        return {crId: ages[i] for crId, ages in self._ages.items()}
+
+
+def _get_age(now, birthDate, deathDate):
+    """Return the age or time since dead in years, or None if unknown.
+
+    Positional arguments:
+        now, birthDate, deathDate: datetime -- dates, or None if not set.
+    """
+    try:
+        if deathDate is not None and now > deathDate:
+            return -1 * difference_in_years(deathDate, now)
+
+        if birthDate is None:
+            return None
+
+        return difference_in_years(birthDate, now)
+
+    except ValueError:
+        # February 29 in a non-leap year
+        return None
+
+
+def _parse_date(dateIso):
+    """Return a datetime for an ISO-formatted date, or None if not set or invalid."""
+    if not dateIso:
+        return None
+
+    try:
+        return datetime.fromisoformat(dateIso)
+    except ValueError:
+        return None
@@ -7,6 +7,8 @@ License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 from urllib.parse import quote
 from urllib.parse import unquote
 
+from mdnvlib.model.front_matter import parse_front_matter
+
 
 class BasicElement:
     """Basic data model element representation.
@@ -44,6 +46,21 @@ class BasicElement:
         else:
             self._links = links
 
+    def __getstate__(self):
+        """Return the element's state as a dictionary.
+
+        The change callback and the parsed front matter are left out.
+        """
+        state = self.__dict__.copy()
+        state.pop('on_element_change', None)
+        state.pop('_metaDict', None)
+        return state
+
+    def __setstate__(self, state):
+        """Restore the element's state, with the standard callback."""
+        self.__dict__.update(state)
+        self.on_element_change = self.do_nothing
+
     @property
     def title(self):
         return self._title
@@ -92,16 +109,7 @@ class BasicElement:
         pass
 
     def from_yaml(self, yaml):
-        self._metaDict = {}
-        for entry in yaml:
-            try:
-                metaData = entry.split(':', maxsplit=1)
-                metaKey = metaData[0].strip()
-                metaValue = metaData[1].strip()
-                self._metaDict[metaKey] = metaValue
-            except:
-                pass
-
+        self._metaDict = parse_front_matter(yaml)
         self.title = self._get_meta_value('Title')
 
     def get_links(self):
@@ -117,6 +125,13 @@ class BasicElement:
                 linkList.append((relativeLink, absoluteLink))
         return linkList
 
+    def get_yaml_errors(self):
+        """Return a list of messages about invalid front matter values."""
+        try:
+            return self._metaDict.errors
+        except AttributeError:
+            return []
+
     def set_links(self, linkList):
         links = self.links
         for relativeLink, absoluteLink in linkList:
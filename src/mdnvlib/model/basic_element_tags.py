@@ -6,7 +6,6 @@ License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 from mdnvlib.model.basic_element_notes import BasicElementNotes
 from mdnvlib.novx_globals import list_to_string
-from mdnvlib.novx_globals import string_to_list
 
 
 class BasicElementTags(BasicElementNotes):
@@ -36,7 +35,7 @@ class BasicElementTags(BasicElementNotes):
 
     def from_yaml(self, yaml):
         super().from_yaml(yaml)
-        tags = string_to_list(self._get_meta_value('Tags'))
+        tags = self._metaDict.get_list('Tags')
         strippedTags = []
         for tag in tags:
             strippedTags.append(tag.strip())
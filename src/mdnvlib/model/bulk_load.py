@@ -0,0 +1,81 @@
+"""Provide a class for loading many novel elements at once.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnvlib
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from mdnvlib.file.worker_pool import map_in_batches
+from mdnvlib.model.section import get_word_count
+
+
+class BulkLoad:
+    """Loader that defers the per-element work until all elements are read.
+
+    File readers create the elements with create(), and pass the section
+    contents to set_section_content(). Until commit() is called,
+    the elements have no change callback, so setting their properties
+    does not notify anyone, and the section contents are neither checked
+    nor counted. The other property setters still check their values
+    on each call. On commit, the change callback is called once
+    for the whole load.
+
+    Public methods:
+        commit() -- set the section contents, and assign and call the change callback.
+        create(elementClass, **kwargs) -- return a new element without change callback.
+        set_section_content(section, text) -- defer setting the section's content.
+    """
+
+    def __init__(self, on_element_change=None, workers=1):
+        """Set up an empty load.
+
+        Optional arguments:
+            on_element_change -- callback to be assigned to the elements on commit.
+            workers: int -- maximum number of worker processes for counting words.
+        """
+        self._on_element_change = on_element_change
+        self._workers = workers
+        self._elements = []
+        self._sections = []
+        self._contents = []
+
+    def commit(self):
+        """Set the section contents, and assign and call the change callback.
+
+        Count the words of all section contents in one batch,
+        distributing the work to several processes, if requested.
+        Call the change callback once, if any element has been loaded.
+        """
+        wordCounts = map_in_batches(get_word_count, self._contents, workers=self._workers)
+        for section, text, wordCount in zip(self._sections, self._contents, wordCounts):
+            section.set_counted_content(text, wordCount)
+        if self._on_element_change is not None:
+            for element in self._elements:
+                element.on_element_change = self._on_element_change
+            if self._elements:
+                self._on_element_change()
+        self._elements = []
+        self._sections = []
+        self._contents = []
+
+    def create(self, elementClass, **kwargs):
+        """Return a new element without change callback.
+
+        Positional arguments:
+            elementClass -- BasicElement subclass.
+
+        Optional arguments:
+            kwargs -- initial values passed to the element's constructor.
+        """
+        element = elementClass(**kwargs)
+        self._elements.append(element)
+        return element
+
+    def set_section_content(self, section, text):
+        """Defer setting the section's content until commit.
+
+        Positional arguments:
+            section: Section -- the section to be updated.
+            text: str -- the section content.
+        """
+        self._sections.append(section)
+        self._contents.append(text)
@@ -5,14 +5,13 @@ For further information see https://github.com/peter88213/mdnvlib
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 from mdnvlib.model.world_element import WorldElement
-from mdnvlib.novx_globals import _
-from mdnvlib.novx_globals import verified_date
+from mdnvlib.novx_globals import LazyTranslation
 
 
 class Character(WorldElement):
     """mdnovel character representation."""
-    MAJOR_MARKER = _('Major Character')
-    MINOR_MARKER = _('Minor Character')
+    MAJOR_MARKER = LazyTranslation('Major Character')
+    MINOR_MARKER = LazyTranslation('Minor Character')
 
     def __init__(self,
             bio=None,
@@ -109,8 +108,8 @@ class Character(WorldElement):
         super().from_yaml(yaml)
         self.isMajor = self._get_meta_value('major', None) == '1'
         self.fullName = self._get_meta_value('FullName')
-        self.birthDate = verified_date(self._get_meta_value('BirthDate'))
-        self.deathDate = verified_date(self._get_meta_value('DeathDate'))
+        self.birthDate = self._metaDict.get_date('BirthDate')
+        self.deathDate = self._metaDict.get_date('DeathDate')
 
     def to_yaml(self, yaml):
         yaml = super().to_yaml(yaml)
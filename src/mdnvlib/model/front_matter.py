@@ -0,0 +1,125 @@
+"""Provide a parser for the YAML front matter of the mdnov elements.
+
+The front matter is a YAML subset with one "key: value" entry per line.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnvlib
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from datetime import date
+from datetime import time
+from functools import lru_cache
+import re
+import sys
+
+from mdnvlib.novx_globals import _
+from mdnvlib.novx_globals import string_to_list
+
+FRONT_MATTER_ENTRY = re.compile(r'\s*([^:]*?)\s*:\s*(.*?)\s*$')
+# Lines without colon are ignored.
+
+
+class FrontMatter(dict):
+    """Dictionary of the front matter entries, with typed accessors.
+
+    Public instance variables:
+        errors: list of str -- messages about invalid values.
+
+    Public methods:
+        get_date(key) -- return a verified iso date string or None.
+        get_int_string(key) -- return a string representing a number or None.
+        get_list(key) -- return a list of strings.
+        get_time(key) -- return a verified iso time string or None.
+
+    The accessors do not raise exceptions on invalid values,
+    but return None and add a message to the errors list.
+    """
+    __slots__ = ('errors',)
+
+    def __init__(self):
+        super().__init__()
+        self.errors = []
+
+    def get_date(self, key):
+        """Return the value as verified iso date string, or None if invalid or missing."""
+        return self._verify(key, parse_date, _('Invalid date'))
+
+    def get_int_string(self, key):
+        """Return the value as string representing a number, or None if invalid or missing."""
+        return self._verify(key, parse_int_string, _('Invalid number'))
+
+    def get_list(self, key):
+        """Return the value as a list of strings."""
+        return string_to_list(self.get(key, None))
+
+    def get_time(self, key):
+        """Return the value as verified iso time string with seconds, or None if invalid or missing."""
+        return self._verify(key, parse_time, _('Invalid time'))
+
+    def _verify(self, key, parser, message):
+        text = self.get(key, None)
+        if text is None:
+            return None
+
+        value = parser(text)
+        if value is None:
+            self.errors.append(f'{message}: {key}: "{text}"')
+        return value
+
+
+def parse_front_matter(lines):
+    """Return a FrontMatter record made from the lines.
+
+    Positional arguments:
+        lines: list of str -- front matter lines.
+
+    The keys are interned, because the same keys occur in many elements.
+    """
+    record = FrontMatter()
+    match = FRONT_MATTER_ENTRY.match
+    for line in lines:
+        entry = match(line)
+        if entry is not None:
+            record[sys.intern(entry.group(1))] = entry.group(2)
+    return record
+
+
+@lru_cache(maxsize=4096)
+def parse_date(dateStr):
+    """Return dateStr if it is an iso-formatted date, otherwise return None.
+
+    The results are cached, because many sections share a date.
+    """
+    try:
+        date.fromisoformat(dateStr)
+    except ValueError:
+        return None
+
+    return dateStr
+
+
+def parse_int_string(intStr):
+    """Return intStr if it represents a number, otherwise return None."""
+    try:
+        int(intStr)
+    except ValueError:
+        return None
+
+    return intStr
+
+
+@lru_cache(maxsize=4096)
+def parse_time(timeStr):
+    """Return timeStr with seconds, if it is an iso-formatted time, otherwise return None.
+
+    The results are cached, because many sections share a time.
+    """
+    try:
+        time.fromisoformat(timeStr)
+    except ValueError:
+        return None
+
+    while timeStr.count(':') < 2:
+        timeStr = f'{timeStr}:00'
+        # adding minutes or seconds, if missing
+    return timeStr
@@ -17,3 +17,78 @@ def create_id(elements, prefix=''):
         i += 1
     return f'{prefix}{i}'
 
+
+class IdAllocator:
+    """Allocator for unused element IDs.
+
+    Instead of probing for the lowest unused number on each call,
+    scan the existing IDs once per prefix for the highest number,
+    and then hand out the numbers above it.
+
+    Public methods:
+        add(elementId) -- register an ID created elsewhere.
+        new_id(prefix) -- return an unused ID.
+        new_ids(prefix, count) -- return a list of unused IDs.
+    """
+
+    def __init__(self, elements):
+        """Keep a reference to the existing IDs for scanning.
+        
+        Positional arguments:
+            elements -- iterable containing all existing IDs, e.g. a list or a dictionary.
+        """
+        self._elements = elements
+        self._highWaterMarks = {}
+        # highest ID number in use, by prefix
+
+    def add(self, elementId):
+        """Register an ID that was created elsewhere.
+        
+        Positional arguments:
+            elementId: str -- ID added to the elements after the allocator was set up.
+        """
+        for prefix in self._highWaterMarks:
+            number = self._get_number(elementId, prefix)
+            if number is not None and number > self._highWaterMarks[prefix]:
+                self._highWaterMarks[prefix] = number
+
+    def new_id(self, prefix=''):
+        """Return an unused ID.
+        
+        Optional arguments:
+            prefix: str -- ID prefix, e.g. 'sc'.
+        """
+        return self.new_ids(prefix, 1)[0]
+
+    def new_ids(self, prefix='', count=1):
+        """Return a list of unused IDs.
+        
+        Optional arguments:
+            prefix: str -- ID prefix, e.g. 'sc'.
+            count: int -- number of IDs to allocate.
+        """
+        if prefix not in self._highWaterMarks:
+            self._highWaterMarks[prefix] = self._scan(prefix)
+        first = self._highWaterMarks[prefix] + 1
+        self._highWaterMarks[prefix] += count
+        return [f'{prefix}{i}' for i in range(first, first + count)]
+
+    def _get_number(self, elementId, prefix):
+        """Return the number of an ID with the given prefix, or None."""
+        if not elementId.startswith(prefix):
+            return None
+
+        number = elementId[len(prefix):]
+        if not number.isdecimal():
+            return None
+
+        return int(number)
+
+    def _scan(self, prefix):
+        """Return the highest number of the existing IDs with the given prefix."""
+        highest = 0
+        for elementId in self._elements:
+            number = self._get_number(elementId, prefix)
+            if number is not None and number > highest:
+                highest = number
+        return highest
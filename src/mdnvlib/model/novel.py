@@ -5,10 +5,8 @@ For further information see https://github.com/peter88213/mdnvlib
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 from datetime import date
-import locale
 
 from mdnvlib.model.basic_element import BasicElement
-from mdnvlib.novx_globals import verified_date
 
 
 class Novel(BasicElement):
@@ -398,6 +396,70 @@ class Novel(BasicElement):
                     self._referenceDate = newVal
                     self.on_element_change()
 
+    def convert_dates_to_days(self):
+        """Convert the specific dates of all sections to days.
+
+        Return a list of the IDs of the sections whose date cannot be converted.
+        These sections remain unchanged.
+        Sections that already have a day or have no date are skipped.
+        The reference date is parsed only once, and each distinct date
+        is parsed only once, however many sections share it.
+        Raise ValueError if the reference date is missing or invalid.
+        """
+        failures = []
+        referenceDay = self._get_reference_day()
+        days = {}
+        # key: str -- date (iso formatted), value: str -- day, or None if invalid
+        for scId, section in self.sections.items():
+            if section.day or not section.date:
+                continue
+
+            if section.date not in days:
+                try:
+                    days[section.date] = str(date.fromisoformat(section.date).toordinal() - referenceDay)
+                except (ValueError, TypeError):
+                    days[section.date] = None
+            day = days[section.date]
+            if day is None:
+                failures.append(scId)
+                continue
+
+            section.day = day
+            section.date = None
+        return failures
+
+    def convert_days_to_dates(self):
+        """Convert the days of all sections to specific dates.
+
+        Return a list of the IDs of the sections whose day cannot be converted.
+        These sections remain unchanged.
+        Sections that already have a date or have no day are skipped.
+        The reference date is parsed only once, and each distinct day
+        is converted only once, however many sections share it.
+        Raise ValueError if the reference date is missing or invalid.
+        """
+        failures = []
+        referenceDay = self._get_reference_day()
+        dates = {}
+        # key: str -- day, value: str -- date (iso formatted), or None if invalid
+        for scId, section in self.sections.items():
+            if section.date or not section.day:
+                continue
+
+            if section.day not in dates:
+                try:
+                    dates[section.day] = date.fromordinal(referenceDay + int(section.day)).isoformat()
+                except (ValueError, TypeError, OverflowError):
+                    dates[section.day] = None
+            sectionDate = dates[section.day]
+            if sectionDate is None:
+                failures.append(scId)
+                continue
+
+            section.date = sectionDate
+            section.day = None
+        return failures
+
     def from_yaml(self, yaml):
         super().from_yaml(yaml)
         self.renumberChapters = self._get_meta_value('renumberChapters', None) == '1'
@@ -460,7 +522,7 @@ class Novel(BasicElement):
             self.wordTarget = int(wt)
 
         # Reference date.
-        self.referenceDate = verified_date(self._get_meta_value('ReferenceDate'))
+        self.referenceDate = self._metaDict.get_date('ReferenceDate')
 
     def to_yaml(self, yaml):
         yaml = super().to_yaml(yaml)
@@ -541,3 +603,13 @@ class Novel(BasicElement):
                             self.sections[scId].scPlotPoints[ppId] = plId
                             break
 
+    def _get_reference_day(self):
+        """Return the ordinal of the reference date.
+
+        Raise ValueError if the reference date is missing or invalid.
+        """
+        try:
+            return date.fromisoformat(self._referenceDate).toordinal()
+
+        except (ValueError, TypeError):
+            raise ValueError(f'Invalid reference date: {self._referenceDate}')
@@ -0,0 +1,122 @@
+"""Helper module for representing the data model as plain data.
+
+The plain data consists of dictionaries, lists, strings, numbers,
+booleans, and None. So it can be stored as JSON, which, other than
+pickled data, cannot execute code when being loaded.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnvlib
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from mdnvlib.model.basic_element import BasicElement
+from mdnvlib.model.chapter import Chapter
+from mdnvlib.model.character import Character
+from mdnvlib.model.novel import Novel
+from mdnvlib.model.plot_line import PlotLine
+from mdnvlib.model.plot_point import PlotPoint
+from mdnvlib.model.section import Section
+from mdnvlib.model.world_element import WorldElement
+from mdnvlib.novx_globals import CH_ROOT
+from mdnvlib.novx_globals import CR_ROOT
+from mdnvlib.novx_globals import IT_ROOT
+from mdnvlib.novx_globals import LC_ROOT
+from mdnvlib.novx_globals import PL_ROOT
+from mdnvlib.novx_globals import PN_ROOT
+
+ELEMENT_KINDS = (
+    # (kind: Novel attribute name, element class, tree root or None for children of elements)
+    ('chapters', Chapter, CH_ROOT),
+    ('sections', Section, None),
+    ('plotLines', PlotLine, PL_ROOT),
+    ('plotPoints', PlotPoint, None),
+    ('characters', Character, CR_ROOT),
+    ('locations', WorldElement, LC_ROOT),
+    ('items', WorldElement, IT_ROOT),
+    ('projectNotes', BasicElement, PN_ROOT),
+    )
+ELEMENT_CLASSES = {kind: elementClass for kind, elementClass, __ in ELEMENT_KINDS}
+ELEMENT_CLASSES['novel'] = Novel
+NOVEL_OWN_ATTRIBUTES = tuple(kind for kind, __, __ in ELEMENT_KINDS) + ('tree', 'on_element_change')
+# Novel attributes that are never taken from a state
+TREE_ROOTS = tuple(root for __, __, root in ELEMENT_KINDS if root is not None)
+
+
+def get_element_state(element, kind):
+    """Return a dictionary with the element's state.
+
+    Positional arguments:
+        element -- a data model element.
+        kind: str -- the element's kind, as in ELEMENT_CLASSES.
+
+    The novel's state does not include its elements and its tree.
+    """
+    state = element.__getstate__()
+    if kind == 'novel':
+        for attribute, __, __ in ELEMENT_KINDS:
+            state.pop(attribute, None)
+        state.pop('tree', None)
+    return state
+
+
+def get_novel_state(novel):
+    """Return a dictionary with the states of the novel, its elements, and its tree."""
+    elements = []
+    for kind, __, __ in ELEMENT_KINDS:
+        for elemId, element in getattr(novel, kind).items():
+            elements.append([kind, elemId, get_element_state(element, kind)])
+    branches = []
+    # (parent ID, child ID) pairs, parents first
+    for root in TREE_ROOTS:
+        for elemId in novel.tree.get_children(root):
+            branches.append([root, elemId])
+            if root in (CH_ROOT, PL_ROOT):
+                for childId in novel.tree.get_children(elemId):
+                    branches.append([elemId, childId])
+    return {
+        'novel': get_element_state(novel, 'novel'),
+        'elements': elements,
+        'tree': branches,
+        }
+
+
+def new_element(kind, state):
+    """Return a new element instance with the given state.
+
+    Positional arguments:
+        kind: str -- the element's kind, as in ELEMENT_CLASSES.
+        state: dict -- the element's state, as returned by get_element_state().
+
+    Raise KeyError if the kind is unknown.
+    """
+    elementClass = ELEMENT_CLASSES[kind]
+    element = elementClass.__new__(elementClass)
+    element.__setstate__(state)
+    return element
+
+
+def set_novel_state(novel, novelState):
+    """Replace the novel's attributes, elements, and tree with the given state.
+
+    Positional arguments:
+        novel: Novel -- the novel to be updated in place.
+        novelState: dict -- the state returned by get_novel_state().
+
+    The novel keeps its identity, its tree instance, its element
+    dictionaries, and its change callback. All elements are created
+    before the novel is changed, so invalid element data leaves the novel
+    unchanged. Raise KeyError, TypeError or ValueError in that case.
+    """
+    elements = {kind: {} for kind, __, __ in ELEMENT_KINDS}
+    for kind, elemId, state in novelState['elements']:
+        elements[kind][elemId] = new_element(kind, state)
+    branches = [(parentId, elemId) for parentId, elemId in novelState['tree']]
+    attributes = dict(novelState['novel'])
+    for attribute in NOVEL_OWN_ATTRIBUTES:
+        attributes.pop(attribute, None)
+    novel.__dict__.update(attributes)
+    for kind, __, __ in ELEMENT_KINDS:
+        getattr(novel, kind).clear()
+        getattr(novel, kind).update(elements[kind])
+    novel.tree.reset()
+    for parentId, elemId in branches:
+        novel.tree.append(parentId, elemId)
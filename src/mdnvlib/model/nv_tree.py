@@ -18,6 +18,14 @@ class NvTree:
     """mdnovel project structure, emulating the ttk.Treeview interface.
     
     This allows independence from the tkinter library.
+    
+    An index maps each item to its parent, and, per parent, 
+    each child to its position. So parent(), index(), next(), 
+    and prev() need no search through the children lists.
+    The positions of a parent's children are re-indexed lazily 
+    after the parent's list of children has changed.
+    The lists returned by get_children() must not be modified
+    by the caller; use the tree methods instead.
     """
 
     def __init__(self):
@@ -36,39 +44,57 @@ class NvTree:
         self.srtTurningPoints = {}
         # key: plot line ID
         # value : plot point ID
+        self._parents = {}
+        # key: item ID
+        # value: parent ID
+        self._positions = {}
+        # key: parent ID
+        # value: dictionary of the children's positions by child ID
 
     def append(self, parent, iid):
         """Creates a new item with identifier iid."""
+        children = self._get_children_list(parent, create=True)
+        if children is None:
+            return
+
         if parent in self.roots:
-            self.roots[parent].append(iid)
+            self._forget_descendants(iid)
             if parent == CH_ROOT:
                 self.srtSections[iid] = []
             elif parent == PL_ROOT:
                 self.srtTurningPoints[iid] = []
-            return
-
-        if parent.startswith(CHAPTER_PREFIX):
-            if parent in self.srtSections:
-                self.srtSections[parent].append(iid)
-            else:
-                self.srtSections[parent] = [iid]
-            return
-
-        if parent.startswith(PLOT_LINE_PREFIX):
-            if parent in self.srtTurningPoints:
-                self.srtTurningPoints[parent].append(iid)
-            else:
-                self.srtTurningPoints[parent] = [iid]
+        children.append(iid)
+        self._parents[iid] = parent
+        positions = self._positions.get(parent, None)
+        if positions is not None:
+            positions[iid] = len(children) - 1
 
     def delete(self, *items):
         """Delete all specified items and all their descendants. The root
         item may not be deleted."""
-        raise NotImplementedError
+        for item in items:
+            if item in self.roots:
+                raise ValueError(f'Root item "{item}" may not be deleted.')
+
+            parent = self._parents.get(item, None)
+            if parent is None:
+                continue
+
+            self._get_children_list(parent).remove(item)
+            self._positions.pop(parent, None)
+            self._forget_descendants(item)
+            self.srtSections.pop(item, None)
+            self.srtTurningPoints.pop(item, None)
+            del self._parents[item]
 
     def delete_children(self, parent):
         """Delete all parent's descendants."""
         if parent in self.roots:
+            for item in self.roots[parent]:
+                self._forget_descendants(item)
+                self._parents.pop(item, None)
             self.roots[parent] = []
+            self._positions.pop(parent, None)
             if parent == CH_ROOT:
                 self.srtSections = {}
                 return
@@ -78,50 +104,49 @@ class NvTree:
             return
 
         if parent.startswith(CHAPTER_PREFIX):
+            self._forget_descendants(parent)
             self.srtSections[parent] = []
             return
 
         if parent.startswith(PLOT_LINE_PREFIX):
+            self._forget_descendants(parent)
             self.srtTurningPoints[parent] = []
 
     def get_children(self, item):
         """Returns the list of children belonging to item."""
-        if item in self.roots:
-            return self.roots[item]
+        children = self._get_children_list(item)
+        if children is None and item.startswith((CHAPTER_PREFIX, PLOT_LINE_PREFIX)):
+            return []
 
-        if item.startswith(CHAPTER_PREFIX):
-            return self.srtSections.get(item, [])
-
-        if item.startswith(PLOT_LINE_PREFIX):
-            return self.srtTurningPoints.get(item, [])
+        return children
 
     def index(self, item):
         """Return the integer index of item within its parent's list
-        of children."""
-        raise NotImplementedError
+        of children.
+        
+        Raise KeyError if item is not in the tree.
+        """
+        parent = self._parents.get(item, None)
+        if parent is None:
+            raise KeyError(f'Item "{item}" not found.')
+
+        return self._get_positions(parent)[item]
 
     def insert(self, parent, index, iid):
         """Create a new item with identifier iid."""
+        children = self._get_children_list(parent, create=True)
+        if children is None:
+            return
+
         if parent in self.roots:
-            self.roots[parent].insert(index, iid)
+            self._forget_descendants(iid)
             if parent == CH_ROOT:
                 self.srtSections[iid] = []
             elif parent == PL_ROOT:
                 self.srtTurningPoints[iid] = []
-            return
-
-        if parent.startswith(CHAPTER_PREFIX):
-            if parent in self.srtSections:
-                self.srtSections[parent].insert(index, iid)
-            else:
-                self.srtSections[parent] = [iid]
-            return
-
-        if parent.startswith(PLOT_LINE_PREFIX):
-            if parent in self.srtTurningPoints:
-                self.srtTurningPoints[parent].insert(index, iid)
-            else:
-                self.srtTurningPoints[parent] = [iid]
+        children.insert(index, iid)
+        self._parents[iid] = parent
+        self._positions.pop(parent, None)
 
     def move(self, item, parent, index):
         """Move item to position index in parent's list of children.
@@ -131,22 +156,56 @@ class NvTree:
         beginning, if greater than or equal to the number of children,
         it is moved to the end. If item was detached it is reattached.
         """
-        raise NotImplementedError
+        newSiblings = self._get_children_list(parent, create=True)
+        if newSiblings is None:
+            raise ValueError(f'Item "{item}" cannot be moved under "{parent}".')
+
+        ancestor = parent
+        while ancestor:
+            if ancestor == item:
+                raise ValueError(f'Item "{item}" cannot be moved under one of its descendants.')
+
+            ancestor = self._parents.get(ancestor, '')
+        oldParent = self._parents.get(item, None)
+        if oldParent is not None:
+            self._get_children_list(oldParent).remove(item)
+            self._positions.pop(oldParent, None)
+        index = max(0, min(index, len(newSiblings)))
+        newSiblings.insert(index, item)
+        self._parents[item] = parent
+        self._positions.pop(parent, None)
 
     def next(self, item):
         """Return the identifier of item's next sibling, or '' if item
         is the last child of its parent."""
-        raise NotImplementedError
+        parent = self._parents.get(item, None)
+        if parent is None:
+            return ''
+
+        siblings = self._get_children_list(parent)
+        index = self._get_positions(parent)[item] + 1
+        if index < len(siblings):
+            return siblings[index]
+
+        return ''
 
     def parent(self, item):
         """Return the ID of the parent of item, or '' if item is at the
         top level of the hierarchy."""
-        raise NotImplementedError
+        return self._parents.get(item, '')
 
     def prev(self, item):
         """Return the identifier of item's previous sibling, or '' if
         item is the first child of its parent."""
-        raise NotImplementedError
+        parent = self._parents.get(item, None)
+        if parent is None:
+            return ''
+
+        index = self._get_positions(parent)[item] - 1
+        if index >= 0:
+            return self._get_children_list(parent)[index]
+
+        return ''
 
     def reset(self):
         """Clear the tree."""
@@ -154,23 +213,68 @@ class NvTree:
             self.roots[item] = []
         self.srtSections = {}
         self.srtTurningPoints = {}
+        self._parents = {}
+        self._positions = {}
 
     def set_children(self, item, newchildren):
         """Replaces item’s child with newchildren."""
         if item in self.roots:
+            self.delete_children(item)
             self.roots[item] = newchildren[:]
-            if item == CH_ROOT:
-                self.srtSections = {}
-                return
-
-            if item == PL_ROOT:
-                self.srtTurningPoints = {}
+        elif item.startswith(CHAPTER_PREFIX):
+            self._forget_descendants(item)
+            self.srtSections[item] = newchildren[:]
+        elif item.startswith(PLOT_LINE_PREFIX):
+            self._forget_descendants(item)
+            self.srtTurningPoints[item] = newchildren[:]
+        else:
             return
 
-        if item.startswith(CHAPTER_PREFIX):
-            self.srtSections[item] = newchildren[:]
+        for child in newchildren:
+            self._parents[child] = item
+
+    def _forget_descendants(self, item):
+        """Remove the index entries of item's children, if any."""
+        children = self._get_children_list(item)
+        if not children:
             return
 
-        if item.startswith(PLOT_LINE_PREFIX):
-            self.srtTurningPoints[item] = newchildren[:]
+        for child in children:
+            if self._parents.get(child, None) == item:
+                del self._parents[child]
+        self._positions.pop(item, None)
+
+    def _get_children_list(self, item, create=False):
+        """Return the list of item's children, or None if item cannot have children.
+        
+        Optional arguments:
+            create: bool -- if True, create an empty list for chapters and plot lines without one.
+        """
+        children = self.roots.get(item, None)
+        if children is not None:
+            return children
+
+        children = self.srtSections.get(item, None)
+        if children is not None:
+            return children
+
+        children = self.srtTurningPoints.get(item, None)
+        if children is not None:
+            return children
+
+        if not create:
+            return None
+
+        if item.startswith(CHAPTER_PREFIX):
+            children = self.srtSections[item] = []
+        elif item.startswith(PLOT_LINE_PREFIX):
+            children = self.srtTurningPoints[item] = []
+        return children
 
+    def _get_positions(self, parent):
+        """Return a dictionary with the positions of parent's children; re-index if necessary."""
+        positions = self._positions.get(parent, None)
+        if positions is None:
+            positions = {child: i for i, child in enumerate(self._get_children_list(parent))}
+            self._positions[parent] = positions
+        return positions
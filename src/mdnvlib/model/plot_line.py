@@ -5,7 +5,6 @@ For further information see https://github.com/peter88213/mdnvlib
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 from mdnvlib.model.basic_element_notes import BasicElementNotes
-from mdnvlib.novx_globals import string_to_list
 from mdnvlib.novx_globals import list_to_string
 
 
@@ -56,8 +55,7 @@ class PlotLine(BasicElementNotes):
     def from_yaml(self, yaml):
         super().from_yaml(yaml)
         self.shortName = self._get_meta_value('ShortName')
-        plSections = self._get_meta_value('Sections')
-        self.sections = string_to_list(plSections)
+        self.sections = self._metaDict.get_list('Sections')
 
     def to_yaml(self, yaml):
         yaml = super().to_yaml(yaml)
@@ -13,12 +13,9 @@ import re
 from mdnvlib.model.basic_element_tags import BasicElementTags
 from mdnvlib.model.date_time_tools import get_specific_date
 from mdnvlib.model.date_time_tools import get_unspecific_date
-from mdnvlib.novx_globals import _
+from mdnvlib.novx_globals import LazyTranslation
+from mdnvlib.novx_globals import get_locale_date
 from mdnvlib.novx_globals import list_to_string
-from mdnvlib.novx_globals import string_to_list
-from mdnvlib.novx_globals import verified_date
-from mdnvlib.novx_globals import verified_int_string
-from mdnvlib.novx_globals import verified_time
 
 # Regular expressions for counting words and characters like in LibreOffice.
 # See: https://help.libreoffice.org/latest/en-GB/text/swriter/guide/words_count.html
@@ -29,20 +26,30 @@ NO_WORD_LIMITS = re.compile(r'\<note\>.*?\<\/note\>|\<comment\>.*?\<\/comment\>|
 # this is to be replaced by empty strings when counting words
 
 
+def get_word_count(text):
+    """Return the number of words in text, counted like in LibreOffice."""
+    if text is None:
+        return 0
+
+    text = ADDITIONAL_WORD_LIMITS.sub(' ', text)
+    text = NO_WORD_LIMITS.sub('', text)
+    return len(text.split())
+
+
 class Section(BasicElementTags):
     """mdnovel section representation."""
 
     SCENE = ['-', 'A', 'R', 'x']
     # emulating an enumeration for the scene Action/Reaction/Other type
 
-    STATUS = [
+    STATUS = LazyTranslation([
         None,
-        _('Outline'),
-        _('Draft'),
-        _('1st Edit'),
-        _('2nd Edit'),
-        _('Done')
-    ]
+        'Outline',
+        'Draft',
+        '1st Edit',
+        '2nd Edit',
+        'Done',
+        ])
     # emulating an enumeration for the section completion status
 
     NULL_DATE = '0001-01-01'
@@ -82,14 +89,14 @@ class Section(BasicElementTags):
         self._conflict = conflict
         self._outcome = outcome
         self._plotlineNotes = plotNotes
+        self._localeDate = None
+        # To be set on first access
         try:
             newDate = date.fromisoformat(scDate)
             self._weekDay = newDate.weekday()
-            self._localeDate = newDate.strftime('%x')
             self._date = scDate
         except:
             self._weekDay = None
-            self._localeDate = None
             self._date = None
         self._time = scTime
         self._day = day
@@ -117,13 +124,7 @@ class Section(BasicElementTags):
             assert type(text) == str
         if self._sectionContent != text:
             self._sectionContent = text
-            if text is not None:
-                text = ADDITIONAL_WORD_LIMITS.sub(' ', text)
-                text = NO_WORD_LIMITS.sub('', text)
-                wordList = text.split()
-                self.wordCount = len(wordList)
-            else:
-                self.wordCount = 0
+            self.wordCount = get_word_count(text)
             self.on_element_change()
 
     @property
@@ -268,10 +269,7 @@ class Section(BasicElementTags):
                 return
                 # date and week day remain unchanged
 
-            try:
-                self._localeDate = newDate.strftime('%x')
-            except:
-                self._localeDate = newVal
+            self._localeDate = None
             self._date = newVal
             self.on_element_change()
 
@@ -283,6 +281,11 @@ class Section(BasicElementTags):
     @property
     def localeDate(self):
         # the preferred date representation for the current locale
+        if self._localeDate is None and self._date is not None:
+            try:
+                self._localeDate = get_locale_date(date.fromisoformat(self._date))
+            except:
+                self._localeDate = self._date
         return self._localeDate
 
     @property
@@ -469,28 +472,25 @@ class Section(BasicElementTags):
         self.appendToPrev = self._get_meta_value('append', None) == '1'
 
         # Date/Day and Time.
-        self.date = verified_date(self._get_meta_value('Date'))
+        self.date = self._metaDict.get_date('Date')
         if not self.date:
-            self.day = verified_int_string(self._get_meta_value('Day'))
+            self.day = self._metaDict.get_int_string('Day')
 
-        self.time = verified_time(self._get_meta_value('Time'))
+        self.time = self._metaDict.get_time('Time')
 
         # Duration.
-        self.lastsDays = verified_int_string(self._get_meta_value('LastsDays'))
-        self.lastsHours = verified_int_string(self._get_meta_value('LastsHours'))
-        self.lastsMinutes = verified_int_string(self._get_meta_value('LastsMinutes'))
+        self.lastsDays = self._metaDict.get_int_string('LastsDays')
+        self.lastsHours = self._metaDict.get_int_string('LastsHours')
+        self.lastsMinutes = self._metaDict.get_int_string('LastsMinutes')
 
         # Characters references.
-        scCharacters = self._get_meta_value('Characters')
-        self.characters = string_to_list(scCharacters)
+        self.characters = self._metaDict.get_list('Characters')
 
         # Locations references.
-        scLocations = self._get_meta_value('Locations')
-        self.locations = string_to_list(scLocations)
+        self.locations = self._metaDict.get_list('Locations')
 
         # Items references.
-        scItems = self._get_meta_value('Items')
-        self.items = string_to_list(scItems)
+        self.items = self._metaDict.get_list('Items')
 
     def get_end_date_time(self):
         """Return the end (date, time, day) tuple calculated from start and duration."""
@@ -532,6 +532,22 @@ class Section(BasicElementTags):
                     pass
         return endDate, endTime, endDay
 
+    def set_counted_content(self, text, wordCount):
+        """Set sectionContent with a word count calculated elsewhere.
+        
+        Positional arguments:
+            text: str -- section content.
+            wordCount: int -- number of words, as returned by get_word_count().
+        
+        This is for readers that count the words in a worker process.
+        """
+        if text is not None:
+            assert type(text) == str
+        if self._sectionContent != text:
+            self._sectionContent = text
+            self.wordCount = wordCount
+            self.on_element_change()
+
     def to_yaml(self, yaml):
         yaml = super().to_yaml(yaml)
         if self.scType:
@@ -0,0 +1,206 @@
+"""Provide a class for a chronological index of the novel's sections.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnvlib
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from array import array
+from bisect import bisect_left
+from bisect import bisect_right
+from datetime import date
+from datetime import datetime
+from datetime import time
+from datetime import timedelta
+
+SECONDS_PER_DAY = 86400
+MIN_SECONDS = date.min.toordinal() * SECONDS_PER_DAY
+MAX_SECONDS = (date.max.toordinal() + 1) * SECONDS_PER_DAY - 1
+# Range of the date/times that can be represented
+
+
+class Timeline:
+    """Chronological index of the novel's sections.
+
+    Public instance variables:
+        unresolved: list of str -- IDs of the sections without valid date or day, or out of range.
+
+    Public methods:
+        get_chronological() -- return the section IDs sorted by start.
+        get_gaps(startIso=None, endIso=None) -- return the periods not covered by any section.
+        get_overlapping(startIso, endIso) -- return the IDs of the sections overlapping a period.
+        get_span(scId) -- return the start and end of a section.
+
+    The index is built once from the "normal" sections of the novel,
+    and is not updated when the sections change.
+    Start and end are stored as seconds since 0001-01-01T00:00.
+    Sections with day instead of date are placed relative to the
+    novel's reference date; without reference date, they are unresolved.
+    A section without time starts at midnight.
+    Dates are passed and returned as ISO-formatted strings
+    with or without time.
+    """
+
+    def __init__(self, novel):
+        """Build the index.
+
+        Positional arguments:
+            novel: Novel -- the novel whose sections are indexed.
+        """
+        if novel.referenceDate:
+            referenceDay = date.fromisoformat(novel.referenceDate).toordinal()
+        else:
+            referenceDay = None
+        spans = []
+        self.unresolved = []
+        for scId, section in novel.sections.items():
+            if section.scType != 0:
+                continue
+
+            span = get_section_span(section, referenceDay)
+            if span is None:
+                self.unresolved.append(scId)
+            else:
+                spans.append((span[0], span[1], scId))
+        spans.sort()
+        self._scIds = [scId for __, __, scId in spans]
+        self._starts = array('q', [start for start, __, __ in spans])
+        self._ends = array('q', [end for __, end, __ in spans])
+        self._positions = {scId: i for i, scId in enumerate(self._scIds)}
+
+        # Build a max tree over the ends for the overlap queries.
+        self._size = 1
+        while self._size < len(self._ends):
+            self._size *= 2
+        self._maxEnds = array('q', [-1] * (2 * self._size))
+        self._maxEnds[self._size:self._size + len(self._ends)] = self._ends
+        for node in range(self._size - 1, 0, -1):
+            self._maxEnds[node] = max(self._maxEnds[2 * node], self._maxEnds[2 * node + 1])
+
+        # Collect the gaps between the covered periods.
+        self._gapStarts = array('q')
+        self._gapEnds = array('q')
+        coveredUntil = None
+        for start, end in zip(self._starts, self._ends):
+            if coveredUntil is not None and start > coveredUntil:
+                self._gapStarts.append(coveredUntil)
+                self._gapEnds.append(start)
+            if coveredUntil is None or end > coveredUntil:
+                coveredUntil = end
+
+    def get_chronological(self):
+        """Return a list of the section IDs, sorted by start and end."""
+        return list(self._scIds)
+
+    def get_gaps(self, startIso=None, endIso=None):
+        """Return a list of (start, end) tuples of the periods between the sections.
+
+        Optional arguments:
+            startIso: str -- return only gaps ending after this date/time.
+            endIso: str -- return only gaps starting before this date/time.
+        """
+        first = 0
+        last = len(self._gapStarts)
+        if startIso is not None:
+            first = bisect_right(self._gapEnds, to_seconds(startIso))
+        if endIso is not None:
+            last = bisect_left(self._gapStarts, to_seconds(endIso))
+        return [
+            (to_iso(self._gapStarts[i]), to_iso(self._gapEnds[i]))
+            for i in range(first, last)
+            ]
+
+    def get_overlapping(self, startIso, endIso):
+        """Return the IDs of the sections overlapping a period, sorted by start.
+
+        Positional arguments:
+            startIso: str -- start date/time of the period.
+            endIso: str -- end date/time of the period.
+
+        Sections ending at the start of the period, or starting
+        at its end, are included.
+        """
+        start = to_seconds(startIso)
+        count = bisect_right(self._starts, to_seconds(endIso))
+        # Only the first count sections start before the period ends.
+        found = []
+        stack = [(1, 0, self._size)]
+        while stack:
+            node, first, last = stack.pop()
+            if first >= count or self._maxEnds[node] < start:
+                continue
+
+            if node >= self._size:
+                found.append(first)
+                continue
+
+            middle = (first + last) // 2
+            stack.append((2 * node + 1, middle, last))
+            stack.append((2 * node, first, middle))
+        return [self._scIds[i] for i in found]
+
+    def get_span(self, scId):
+        """Return a (start, end) tuple of ISO-formatted date/times, or None if not indexed."""
+        i = self._positions.get(scId, None)
+        if i is None:
+            return None
+
+        return to_iso(self._starts[i]), to_iso(self._ends[i])
+
+
+def get_section_span(section, referenceDay=None):
+    """Return a (start, end) tuple of seconds since 0001-01-01T00:00, or None.
+
+    Positional arguments:
+        section: Section -- the section whose date/time and duration is used.
+
+    Optional arguments:
+        referenceDay: int -- ordinal of the reference date for sections with day.
+
+    Return None if the section has neither a valid date,
+    nor a valid day with reference date, or if the span
+    is out of the date range.
+    """
+    try:
+        if section.date:
+            day = date.fromisoformat(section.date).toordinal()
+        elif section.day and referenceDay is not None:
+            day = referenceDay + int(section.day)
+        else:
+            return None
+
+        start = day * SECONDS_PER_DAY
+        if section.time:
+            startTime = time.fromisoformat(section.time)
+            start += startTime.hour * 3600 + startTime.minute * 60 + startTime.second
+        duration = 0
+        if section.lastsDays:
+            duration += int(section.lastsDays) * SECONDS_PER_DAY
+        if section.lastsHours:
+            duration += int(section.lastsHours) * 3600
+        if section.lastsMinutes:
+            duration += int(section.lastsMinutes) * 60
+    except ValueError:
+        return None
+
+    end = start + duration
+    if not MIN_SECONDS <= start <= MAX_SECONDS or not MIN_SECONDS <= end <= MAX_SECONDS:
+        return None
+
+    return start, end
+
+
+def to_iso(seconds):
+    """Return the ISO-formatted date/time of seconds since 0001-01-01T00:00."""
+    day, seconds = divmod(seconds, SECONDS_PER_DAY)
+    return (datetime.fromordinal(day) + timedelta(seconds=seconds)).isoformat()
+
+
+def to_seconds(dateTimeIso):
+    """Return the seconds since 0001-01-01T00:00 of an ISO-formatted date or date/time."""
+    dateTime = datetime.fromisoformat(dateTimeIso)
+    return (
+        dateTime.toordinal() * SECONDS_PER_DAY
+        +dateTime.hour * 3600
+        +dateTime.minute * 60
+        +dateTime.second
+        )
@@ -0,0 +1,157 @@
+"""Provide a class for the daily word count log.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnvlib
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from array import array
+from bisect import bisect_left
+from bisect import bisect_right
+from datetime import date
+
+
+class WordCountLog:
+    """Daily word count log, sorted by date.
+
+    Public methods:
+        add(dateIso, count, totalCount) -- set the word counts of a day.
+        compact() -- remove the entries with unchanged word counts.
+        compacted() -- return an iterator over the entries with changed word counts.
+        get_arrays() -- return the arrays of days, counts, and total counts.
+        get_range(startIso=None, endIso=None) -- return an iterator over the entries of a date range.
+        latest() -- return the latest entry, or None if the log is empty.
+        update(wcLog) -- add all entries of another log.
+
+    The entries are (date: str, count: int, totalCount: int) tuples,
+    with the date formatted acc. to ISO 8601.
+    Iterating over the log yields the entries in chronological order.
+
+    The dates are stored as ordinals, and the word counts as integers,
+    each in an array. Thus, adding a new day and getting the latest entry
+    take constant time.
+    """
+    __slots__ = ('_days', '_counts', '_totalCounts')
+
+    def __init__(self, entries=()):
+        """Initialize the arrays.
+
+        Optional arguments:
+            entries -- iterable of (date, count, totalCount) tuples.
+        """
+        self._days = array('l')
+        self._counts = array('q')
+        self._totalCounts = array('q')
+        for entry in entries:
+            self.add(*entry)
+
+    def __bool__(self):
+        return len(self._days) > 0
+
+    def __iter__(self):
+        return self.get_range()
+
+    def __len__(self):
+        return len(self._days)
+
+    def add(self, dateIso, count, totalCount):
+        """Set the word counts of a day.
+
+        Positional arguments:
+            dateIso: str -- date, formatted acc. to ISO 8601.
+            count: int or str -- number of words in "normal" sections.
+            totalCount: int or str -- number of words in "normal" and "unused" sections.
+
+        Replace the word counts if the day is already logged.
+        Raise ValueError if the date or a word count is invalid.
+        """
+        self._add_day(date.fromisoformat(dateIso).toordinal(), int(count), int(totalCount))
+
+    def compact(self):
+        """Remove the entries whose word counts are the same as the previous entry's."""
+        days = array('l')
+        counts = array('q')
+        totalCounts = array('q')
+        for i in self._get_changes():
+            days.append(self._days[i])
+            counts.append(self._counts[i])
+            totalCounts.append(self._totalCounts[i])
+        self._days = days
+        self._counts = counts
+        self._totalCounts = totalCounts
+
+    def compacted(self):
+        """Return an iterator over the entries whose word counts differ from the previous entry's."""
+        for i in self._get_changes():
+            yield self._get_entry(i)
+
+    def get_arrays(self):
+        """Return a (days, counts, totalCounts) tuple of arrays.
+
+        The days are date ordinals. The arrays are not copied,
+        so the caller must not modify them.
+        """
+        return self._days, self._counts, self._totalCounts
+
+    def get_range(self, startIso=None, endIso=None):
+        """Return an iterator over the entries of a date range.
+
+        Optional arguments:
+            startIso: str -- first date, formatted acc. to ISO 8601.
+            endIso: str -- last date, formatted acc. to ISO 8601.
+
+        If a date is None, the range is open at that side.
+        """
+        if startIso is None:
+            start = 0
+        else:
+            start = bisect_left(self._days, date.fromisoformat(startIso).toordinal())
+        if endIso is None:
+            end = len(self._days)
+        else:
+            end = bisect_right(self._days, date.fromisoformat(endIso).toordinal())
+        for i in range(start, end):
+            yield self._get_entry(i)
+
+    def latest(self):
+        """Return the latest (date, count, totalCount) tuple, or None if the log is empty."""
+        if not self._days:
+            return None
+
+        return self._get_entry(-1)
+
+    def update(self, wcLog):
+        """Add all entries of another WordCountLog instance, replacing the entries of the same day."""
+        for i in range(len(wcLog._days)):
+            self._add_day(wcLog._days[i], wcLog._counts[i], wcLog._totalCounts[i])
+
+    def _add_day(self, day, count, totalCount):
+        """Set the word counts of the day given as ordinal."""
+        if not self._days or day > self._days[-1]:
+            self._days.append(day)
+            self._counts.append(count)
+            self._totalCounts.append(totalCount)
+            return
+
+        i = bisect_left(self._days, day)
+        if self._days[i] == day:
+            self._counts[i] = count
+            self._totalCounts[i] = totalCount
+        else:
+            self._days.insert(i, day)
+            self._counts.insert(i, count)
+            self._totalCounts.insert(i, totalCount)
+
+    def _get_changes(self):
+        """Return an iterator over the indices of the entries with changed word counts."""
+        lastCount = None
+        lastTotalCount = None
+        for i in range(len(self._days)):
+            if self._counts[i] == lastCount and self._totalCounts[i] == lastTotalCount:
+                continue
+
+            lastCount = self._counts[i]
+            lastTotalCount = self._totalCounts[i]
+            yield i
+
+    def _get_entry(self, i):
+        return date.fromordinal(self._days[i]).isoformat(), self._counts[i], self._totalCounts[i]
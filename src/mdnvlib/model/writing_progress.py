@@ -0,0 +1,140 @@
+"""Provide a class for writing progress statistics.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnvlib
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from array import array
+from datetime import date
+from math import ceil
+
+
+class WritingProgress:
+    """Writing progress statistics of a word count log.
+
+    Public instance variables:
+        days: array of int -- ordinals of the logged days.
+        counts: array of int -- word counts of the logged days.
+        words: array of int -- words written since the previous logged day.
+        weeks: dict -- key: (ISO year, ISO week), value: words written in that week.
+        currentStreak: int -- consecutive writing days up to the latest logged day.
+        longestStreak: int -- maximum number of consecutive writing days.
+        wordTarget: int -- the novel's word target, or None.
+        wordCountStart: int -- the novel's word count at the start, or None.
+
+    Public methods:
+        get_daily_words() -- return a list of (date, words) tuples.
+        get_delta() -- return the words written since the start.
+        get_projected_completion(window=30) -- return the date when the word target will be reached.
+        get_rolling_averages(window=7) -- return a list of (date, average words per day) tuples.
+        get_weekly_words() -- return a list of (ISO year, ISO week, words) tuples.
+
+    The counts are the words of the "normal" sections.
+    The days without log entry count as days without writing.
+    The statistics are computed in one pass over the log arrays.
+    """
+
+    def __init__(self, wcLog, wordTarget=None, wordCountStart=None):
+        """Compute the statistics.
+
+        Positional arguments:
+            wcLog: WordCountLog -- the daily word count log.
+
+        Optional arguments:
+            wordTarget: int -- the novel's word target.
+            wordCountStart: int -- the novel's word count at the start.
+        """
+        self.wordTarget = wordTarget
+        self.wordCountStart = wordCountStart
+        self.days, self.counts, __ = wcLog.get_arrays()
+        self.words = array('q')
+        self.weeks = {}
+        self.currentStreak = 0
+        self.longestStreak = 0
+        previousDay = None
+        previousCount = None
+        for day, count in zip(self.days, self.counts):
+            if previousCount is None:
+                words = 0
+            else:
+                words = count - previousCount
+            self.words.append(words)
+            week = date.fromordinal(day).isocalendar()[:2]
+            self.weeks[week] = self.weeks.get(week, 0) + words
+            if words > 0:
+                if previousDay is not None and day == previousDay + 1:
+                    self.currentStreak += 1
+                else:
+                    self.currentStreak = 1
+                if self.currentStreak > self.longestStreak:
+                    self.longestStreak = self.currentStreak
+            else:
+                self.currentStreak = 0
+            previousDay = day
+            previousCount = count
+
+    def get_daily_words(self):
+        """Return a list of (date, words) tuples for the logged days."""
+        return [(date.fromordinal(day).isoformat(), words) for day, words in zip(self.days, self.words)]
+
+    def get_delta(self):
+        """Return the words written since the start, or None if unknown."""
+        if not self.counts or self.wordCountStart is None:
+            return None
+
+        return self.counts[-1] - self.wordCountStart
+
+    def get_projected_completion(self, window=30):
+        """Return the ISO-formatted date when the word target will be reached, or None.
+
+        Optional arguments:
+            window: int -- number of days for the average writing rate.
+
+        Return None if there is no word target, if the words
+        have not increased within the window, or if the projected
+        date is out of range.
+        Raise ValueError if window is less than 1.
+        """
+        averages = self.get_rolling_averages(window)
+        if not averages or not self.wordTarget:
+            return None
+
+        remaining = self.wordTarget - self.counts[-1]
+        if remaining <= 0:
+            return date.fromordinal(self.days[-1]).isoformat()
+
+        __, rate = averages[-1]
+        if rate <= 0:
+            return None
+
+        day = self.days[-1] + ceil(remaining / rate)
+        if day > date.max.toordinal():
+            return None
+
+        return date.fromordinal(day).isoformat()
+
+    def get_rolling_averages(self, window=7):
+        """Return a list of (date, average words per day) tuples for the logged days.
+
+        Optional arguments:
+            window: int -- number of days to average, ending with the logged day.
+
+        Raise ValueError if window is less than 1.
+        """
+        if window < 1:
+            raise ValueError(f'Invalid window: {window}')
+
+        averages = []
+        first = 0
+        total = 0
+        for last in range(len(self.days)):
+            total += self.words[last]
+            while self.days[first] <= self.days[last] - window:
+                total -= self.words[first]
+                first += 1
+            averages.append((date.fromordinal(self.days[last]).isoformat(), total / window))
+        return averages
+
+    def get_weekly_words(self):
+        """Return a list of (ISO year, ISO week, words) tuples for the weeks with log entries."""
+        return [(year, week, self.weeks[(year, week)]) for year, week in self.weeks]
@@ -56,24 +56,118 @@ class Error(Exception):
     pass
 
 
-#--- Initialize localization.
-locale.setlocale(locale.LC_TIME, "")
+#--- Localization.
+# The locale settings and the translations are loaded on first use.
+# In headless mode, e.g. for batch processing, they are not loaded at all.
+# Headless mode can be set with the MDNVLIB_HEADLESS environment variable,
+# or with set_headless(). Either way, it is passed on to worker processes.
 LOCALE_PATH = f'{os.path.dirname(sys.argv[0])}/locale/'
-try:
-    CURRENT_LANGUAGE = locale.getlocale()[0][:2]
-except:
-    # Fallback for old Windows versions.
-    CURRENT_LANGUAGE = locale.getdefaultlocale()[0][:2]
-try:
-    t = gettext.translation('mdnovel', LOCALE_PATH, languages=[CURRENT_LANGUAGE])
-    _ = t.gettext
-except:
-
-    def _(message):
-        return message
-
-WEEKDAYS = day_name
-MONTHS = month_name
+CURRENT_LANGUAGE = None
+_headless = bool(os.environ.get('MDNVLIB_HEADLESS'))
+_translate = None
+_localeIsSet = False
+
+
+def is_headless():
+    """Return True if the localization is skipped."""
+    return _headless
+
+
+def set_headless():
+    """Skip the localization; keep messages untranslated and the "C" locale."""
+    global _headless
+    _headless = True
+
+
+def init_translation():
+    """Load the translations for the current language, if not done yet."""
+    global _translate
+    global CURRENT_LANGUAGE
+    if _translate is not None:
+        return
+
+    if _headless:
+        _translate = str
+        return
+
+    try:
+        CURRENT_LANGUAGE = locale.getlocale()[0][:2]
+    except:
+        # Fallback for old Windows versions.
+        CURRENT_LANGUAGE = locale.getdefaultlocale()[0][:2]
+    try:
+        t = gettext.translation('mdnovel', LOCALE_PATH, languages=[CURRENT_LANGUAGE])
+        _translate = t.gettext
+    except:
+        _translate = str
+
+
+def init_locale():
+    """Set the locale for date representation, if not done yet."""
+    global _localeIsSet
+    if _localeIsSet:
+        return
+
+    _localeIsSet = True
+    if not _headless:
+        locale.setlocale(locale.LC_TIME, "")
+
+
+def _(message):
+    """Return message, translated into the current language."""
+    if _translate is None:
+        init_translation()
+    return _translate(message)
+
+
+class LazyTranslation:
+    """Class attribute holding a message, or a list of messages, translated on access.
+    
+    This keeps importing a module with translated class attributes
+    from loading the translations.
+    """
+
+    def __init__(self, messages):
+        """Store the untranslated messages.
+        
+        Positional arguments:
+            messages: str, or list of str or None -- message(s) to be translated.
+        """
+        self._messages = messages
+
+    def __get__(self, instance, owner):
+        if isinstance(self._messages, str):
+            return _(self._messages)
+
+        return [_(message) if message is not None else None for message in self._messages]
+
+
+def get_locale_date(dateObj):
+    """Return a string with the preferred date representation for the current locale.
+    
+    Positional arguments:
+        dateObj: datetime.date -- date to format.
+    """
+    init_locale()
+    return dateObj.strftime('%x')
+
+
+class _LocaleNames:
+    """Sequence of localized names, like calendar.day_name, set up on first access."""
+
+    def __init__(self, names):
+        self._names = names
+
+    def __getitem__(self, i):
+        init_locale()
+        return self._names[i]
+
+    def __len__(self):
+        return len(self._names)
+
+
+WEEKDAYS = _LocaleNames(day_name)
+MONTHS = _LocaleNames(month_name)
 
 
 def norm_path(path):
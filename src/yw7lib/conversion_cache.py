@@ -0,0 +1,140 @@
+"""Provide a class for an on-disk cache of section content conversions.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+from hashlib import sha256
+import sqlite3
+
+
+class ConversionCache:
+    """Content-addressed cache for converted section contents.
+
+    The cache is a SQLite database that maps a hash of the source text
+    plus the conversion direction to the converted text and its word count.
+    When the database grows beyond maxSize bytes of converted text, the
+    least recently used entries are evicted on closing.
+
+    Public methods:
+        close() -- save the cache, evicting the least recently used entries.
+        get(direction, text) -- return a (converted text, word count) tuple, or None.
+        put(direction, text, converted, wordCount) -- add a conversion to the cache.
+    """
+    FILE_NAME = '.mdnov_yw7_cache.db'
+    CACHE_VERSION = 2
+    # Increment this, if the conversion algorithms change.
+    # The entries of a cache with another version are discarded.
+    MAX_SIZE = 64 * 1024 * 1024
+
+    def __init__(self, cachePath, maxSize=None):
+        """Open the cache database; create it, if necessary.
+
+        Positional arguments:
+            cachePath: str -- path to the database file.
+
+        Optional arguments:
+            maxSize: int -- maximum number of bytes of converted text to keep.
+
+        Raise sqlite3.Error if the database cannot be opened.
+        """
+        if maxSize is None:
+            maxSize = self.MAX_SIZE
+        self._maxSize = maxSize
+        self._connection = sqlite3.connect(cachePath)
+        version = self._connection.execute('PRAGMA user_version').fetchone()[0]
+        if version != self.CACHE_VERSION:
+            self._connection.execute('DROP TABLE IF EXISTS conversions')
+            self._connection.execute(f'PRAGMA user_version = {self.CACHE_VERSION}')
+        self._connection.execute(
+            '''CREATE TABLE IF NOT EXISTS conversions (
+                direction TEXT NOT NULL,
+                hash BLOB NOT NULL,
+                converted TEXT,
+                wordCount INTEGER,
+                size INTEGER NOT NULL,
+                used INTEGER NOT NULL,
+                PRIMARY KEY (direction, hash)
+            )'''
+            )
+        self._clock = self._connection.execute('SELECT MAX(used) FROM conversions').fetchone()[0] or 0
+        # Logical time for the LRU eviction; advanced once per session.
+        self._clock += 1
+        self._usedKeys = []
+        # Keys of the entries hit in this session, to be stamped on closing.
+
+    def close(self):
+        """Save the cache, evicting the least recently used entries.
+
+        The database is closed even if saving fails.
+        Raise sqlite3.Error if the cache cannot be saved.
+        """
+        if self._connection is None:
+            return
+
+        try:
+            self._connection.executemany(
+                'UPDATE conversions SET used = ? WHERE direction = ? AND hash = ?',
+                [(self._clock, direction, key) for direction, key in self._usedKeys]
+                )
+            self._evict()
+            self._connection.commit()
+        finally:
+            self._connection.close()
+            self._connection = None
+
+    def get(self, direction, text):
+        """Return a (converted text, word count) tuple, or None, if not cached.
+
+        Positional arguments:
+            direction: str -- conversion identifier, e.g. 'from_yw'.
+            text: str -- source text.
+        """
+        key = self._get_key(text)
+        row = self._connection.execute(
+            'SELECT converted, wordCount FROM conversions WHERE direction = ? AND hash = ?',
+            (direction, key)
+            ).fetchone()
+        if row is None:
+            return None
+
+        self._usedKeys.append((direction, key))
+        return row
+
+    def put(self, direction, text, converted, wordCount=None):
+        """Add a conversion to the cache.
+
+        Positional arguments:
+            direction: str -- conversion identifier, e.g. 'from_yw'.
+            text: str -- source text.
+            converted: str -- converted text.
+
+        Optional arguments:
+            wordCount: int -- number of words of the converted text, if applicable.
+        """
+        if converted is None:
+            size = 0
+        else:
+            size = len(converted.encode('utf-8'))
+        self._connection.execute(
+            'INSERT OR REPLACE INTO conversions VALUES (?, ?, ?, ?, ?, ?)',
+            (direction, self._get_key(text), converted, wordCount, size, self._clock)
+            )
+
+    def _evict(self):
+        """Delete the least recently used entries exceeding the maximum size."""
+        totalSize = 0
+        expired = []
+        for direction, key, size in self._connection.execute(
+            'SELECT direction, hash, size FROM conversions ORDER BY used DESC'
+            ):
+            totalSize += size
+            if totalSize > self._maxSize:
+                expired.append((direction, key))
+        self._connection.executemany(
+            'DELETE FROM conversions WHERE direction = ? AND hash = ?',
+            expired
+            )
+
+    def _get_key(self, text):
+        return sha256(text.encode('utf-8')).digest()
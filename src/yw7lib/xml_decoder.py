@@ -0,0 +1,66 @@
+"""Helper module for decoding xml documents.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import codecs
+import re
+
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+    )
+# The UTF-32 LE BOM starts with the UTF-16 LE BOM, so it must be checked first.
+
+XML_DECLARATION = re.compile(br'<\?xml[^>]*?encoding\s*=\s*["\']([A-Za-z0-9._-]+)["\']')
+
+
+def get_xml_encoding(xmlData):
+    """Return the name of the codec for decoding an xml document.
+
+    Positional arguments:
+        xmlData: bytes -- xml document, or at least its first 100 bytes.
+
+    Check for a byte order mark first, then for the null bytes of
+    UTF-16 encoded ASCII, and then for the xml declaration.
+    Default to UTF-8.
+    The byte patterns take precedence over the xml declaration, because
+    yWriter for iOS writes UTF-16 files with a UTF-8 declaration.
+    """
+    for bom, encoding in BOMS:
+        if xmlData.startswith(bom):
+            return encoding
+
+    if xmlData.startswith(b'<\x00'):
+        return 'utf-16-le'
+
+    if xmlData.startswith(b'\x00<'):
+        return 'utf-16-be'
+
+    match = XML_DECLARATION.match(xmlData[:100])
+    if match is not None:
+        encoding = match.group(1).decode('ascii')
+        if not encoding.lower().startswith(('utf-16', 'utf-32')):
+            # A wide encoding would have been recognized by the byte patterns.
+            return encoding
+
+    return 'utf-8'
+
+
+def decode_xml(xmlData):
+    """Return the xml document as a string.
+
+    Positional arguments:
+        xmlData: bytes or str -- xml document; a string is returned as it is.
+
+    Raise ValueError if the document cannot be decoded,
+    or LookupError if the declared encoding is unknown.
+    """
+    if isinstance(xmlData, str):
+        return xmlData
+
+    return xmlData.decode(get_xml_encoding(xmlData))
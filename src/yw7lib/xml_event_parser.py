@@ -0,0 +1,93 @@
+"""Provide a class for reading yw7 xml without building an element tree.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+from xml.parsers import expat
+
+from yw7lib.xml_fields import get_children
+
+
+class XmlRecord:
+    """Lightweight xml element replacement, holding tag, text, and children.
+
+    Iterating over a record yields its child records, like ElementTree elements do.
+    """
+    __slots__ = ('tag', 'text', 'children')
+
+    def __init__(self, tag):
+        self.tag = tag
+        self.text = None
+        self.children = []
+
+    def __iter__(self):
+        return iter(self.children)
+
+
+class XmlEventParser:
+    """Event-driven parser passing the yw7 entities to handlers one by one.
+
+    An entity is an xml element whose tag has a handler, e.g. "SCENE".
+    While the parser is inside an entity, it collects the entity's
+    descendants as XmlRecord instances. At the entity's end tag, it
+    calls the handler with the entity's children by tag, as returned
+    by xml_fields.get_children(), and discards the records.
+    Outside of entities, nothing is kept in memory.
+
+    Public methods:
+        parse(xmlText) -- parse an xml string, calling the handlers.
+    """
+
+    def __init__(self, handlers):
+        """Set up the expat parser.
+
+        Positional arguments:
+            handlers: dict -- functions taking a children dictionary, by entity tag.
+        """
+        self._handlers = handlers
+        self._stack = []
+        # records of the open elements within the current entity
+        self._textParts = []
+        # character data of the innermost open element
+        self._parser = expat.ParserCreate()
+        self._parser.buffer_text = True
+        self._parser.StartElementHandler = self._start_element
+        self._parser.EndElementHandler = self._end_element
+        self._parser.CharacterDataHandler = self._character_data
+
+    def parse(self, xmlText):
+        """Parse an xml string, calling the handlers.
+
+        Positional arguments:
+            xmlText: str -- xml document.
+
+        Raise xml.parsers.expat.ExpatError in case of error.
+        """
+        self._parser.Parse(xmlText, True)
+
+    def _character_data(self, data):
+        if self._stack:
+            self._textParts.append(data)
+
+    def _end_element(self, tag):
+        if not self._stack:
+            return
+
+        record = self._stack.pop()
+        if self._textParts:
+            record.text = ''.join(self._textParts)
+            self._textParts = []
+        if self._stack:
+            self._stack[-1].children.append(record)
+        else:
+            self._handlers[tag](get_children(record))
+
+    def _start_element(self, tag, attributes):
+        if not self._stack and tag not in self._handlers:
+            return
+
+        if self._stack and self._textParts:
+            # This is leading whitespace of a parent element; it is not needed.
+            self._textParts = []
+        self._stack.append(XmlRecord(tag))
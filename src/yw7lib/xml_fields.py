@@ -0,0 +1,94 @@
+"""Helper module for reading yw7 xml elements by field tables.
+
+A field table is a sequence of (tag, attribute, convert) tuples.
+If the xml element has a child with the tag, the child's text is
+converted and assigned to the attribute of the target element.
+If convert is None, the text is assigned unchanged.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+from mdnvlib.novx_globals import string_to_list
+
+
+def get_children(xmlElement):
+    """Return a dictionary with the xml element's children by tag.
+
+    Positional arguments:
+        xmlElement -- xml element whose children are to be looked up.
+
+    Like find(), keep the first child if a tag occurs more than once.
+    Building the dictionary takes a single pass,
+    whereas each call of find() scans the children.
+    """
+    children = {}
+    for xmlChild in xmlElement:
+        children.setdefault(xmlChild.tag, xmlChild)
+    return children
+
+
+def get_custom_fields(children, fieldNames, skipEmpty=False):
+    """Return a dictionary with the texts of the custom fields.
+
+    Positional arguments:
+        children: dict -- xml child elements by tag, as returned by get_children().
+        fieldNames: list of str -- names of the custom fields to read.
+
+    Optional arguments:
+        skipEmpty: bool -- if True, omit fields without text.
+    """
+    kwVarYw7 = {}
+    if 'Fields' not in children:
+        return kwVarYw7
+
+    fields = get_children(children['Fields'])
+    for fieldName in fieldNames:
+        xmlField = fields.get(fieldName, None)
+        if xmlField is None:
+            continue
+
+        if skipEmpty and not xmlField.text:
+            continue
+
+        kwVarYw7[fieldName] = xmlField.text
+    return kwVarYw7
+
+
+def read_fields(element, children, fieldTable):
+    """Set the element's attributes according to a field table.
+
+    Positional arguments:
+        element -- target element, e.g. a Section instance.
+        children: dict -- xml child elements by tag, as returned by get_children().
+        fieldTable -- sequence of (tag, attribute, convert) tuples.
+
+    If the conversion fails with ValueError or TypeError, the attribute remains unchanged.
+    """
+    for tag, attribute, convert in fieldTable:
+        xmlField = children.get(tag, None)
+        if xmlField is None:
+            continue
+
+        value = xmlField.text
+        if convert is not None:
+            try:
+                value = convert(value)
+            except (ValueError, TypeError):
+                continue
+
+        setattr(element, attribute, value)
+
+
+def to_tags(text):
+    """Return a list of tags with leading and trailing spaces removed.
+
+    Positional arguments:
+        text: str -- semicolon-separated tags.
+
+    Raise TypeError if text is None, so the tags remain unchanged.
+    """
+    if text is None:
+        raise TypeError
+
+    return [tag.strip() for tag in string_to_list(text)]
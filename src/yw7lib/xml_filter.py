@@ -4,9 +4,21 @@ Copyright (c) 2024 Peter Triesberger
 For further information see https://github.com/peter88213/mdnovel
 License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
 """
-import re
+ILLEGAL_CHARACTERS = tuple(chr(i) for i in range(0x20) if chr(i) not in '\t\n\r')
+# Control characters not allowed in xml 1.0 documents
+_DELETION_TABLE = dict.fromkeys(ord(c) for c in ILLEGAL_CHARACTERS)
 
 
 def strip_illegal_characters(text):
-    return re.sub('[\x00-\x08|\x0b-\x0c|\x0e-\x1f]', '', text)
+    """Return text without the control characters that are illegal in xml.
 
+    Positional arguments:
+        text: str -- xml document.
+
+    Return text unchanged, without copying, if it is clean.
+    """
+    for character in ILLEGAL_CHARACTERS:
+        if character in text:
+            return text.translate(_DELETION_TABLE)
+
+    return text
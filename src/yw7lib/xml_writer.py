@@ -0,0 +1,97 @@
+"""Helper module for serializing yw7 xml element trees.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+PARAGRAPH_LEVEL = 5
+# Do not indent the children of elements below this level,
+# so that inline elements within paragraphs are kept as they are.
+
+_END_TAG = object()
+# Stack marker for closing an element
+
+
+def serialize(root, cdataTags=(), indentation=True):
+    """Return an xml string representing the element tree.
+
+    Positional arguments:
+        root -- root element of an xml element tree.
+
+    Optional arguments:
+        cdataTags -- collection of the tags whose content is wrapped in a CDATA section.
+        indentation: bool -- if True, indent the elements by two spaces per level.
+
+    The output is like that of ElementTree.write() without xml declaration,
+    with the indentation computed on the fly, so the tree is not modified.
+    The text is xml-escaped, also within the CDATA sections.
+    The tree is traversed iteratively, so its depth is not limited by recursion.
+    Element attributes are not supported, because yw7 files have none.
+    """
+    parts = []
+    write = parts.append
+    stack = [(root, 0, False, indentation)]
+    # (element, level, is last child, is indented)
+    while stack:
+        entry = stack.pop()
+        if entry[0] is _END_TAG:
+            __, element, level, isLast, isIndented = entry
+            if element.tag in cdataTags:
+                write(']]>')
+            write(f'</{element.tag}>')
+            tail = _get_tail(element, level, isLast, isIndented)
+            if tail:
+                write(_escape(tail))
+            continue
+
+        element, level, isLast, isIndented = entry
+        children = list(element)
+        text = element.text
+        if isIndented and children and (not text or not text.strip()):
+            text = f'\n{(level + 1) * "  "}'
+        if text or children:
+            write(f'<{element.tag}>')
+            if element.tag in cdataTags:
+                write('<![CDATA[')
+            if text:
+                write(_escape(text))
+            stack.append((_END_TAG, element, level, isLast, isIndented))
+            childIsIndented = isIndented and level < PARAGRAPH_LEVEL
+            lastIndex = len(children) - 1
+            for i in range(lastIndex, -1, -1):
+                stack.append((children[i], level + 1, i == lastIndex, childIsIndented))
+        else:
+            write(f'<{element.tag} />')
+            tail = _get_tail(element, level, isLast, isIndented)
+            if tail:
+                write(_escape(tail))
+    return ''.join(parts)
+
+
+def _escape(text):
+    """Return text with the characters escaped that ElementTree.write() escapes."""
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    return text
+
+
+def _get_tail(element, level, isLast, isIndented):
+    """Return the element's tail, indented if applicable."""
+    tail = element.tail
+    if not isIndented:
+        return tail
+
+    if tail and tail.strip():
+        return tail
+
+    if isLast:
+        return f'\n{(level - 1) * "  "}'
+
+    if level or len(element):
+        return f'\n{level * "  "}'
+
+    return tail
@@ -9,17 +9,20 @@ License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
 from datetime import datetime
 from html import unescape
 import os
-import re
+import sqlite3
 
+from mdnvlib.file.compression import COMPRESSION_ERRORS
+from mdnvlib.file.compression import open_file
 from mdnvlib.file.file import File
 from mdnvlib.model.basic_element import BasicElement
 from mdnvlib.model.chapter import Chapter
 from mdnvlib.model.character import Character
-from mdnvlib.model.id_generator import create_id
+from mdnvlib.model.id_generator import IdAllocator
 from mdnvlib.model.plot_line import PlotLine
 from mdnvlib.model.plot_point import PlotPoint
 from mdnvlib.model.section import Section
 from mdnvlib.model.world_element import WorldElement
+from mdnvlib.model.word_count_log import WordCountLog
 from mdnvlib.novx_globals import CHAPTER_PREFIX
 from mdnvlib.novx_globals import CHARACTER_PREFIX
 from mdnvlib.novx_globals import CH_ROOT
@@ -29,6 +32,7 @@ from mdnvlib.novx_globals import ITEM_PREFIX
 from mdnvlib.novx_globals import IT_ROOT
 from mdnvlib.novx_globals import LC_ROOT
 from mdnvlib.novx_globals import LOCATION_PREFIX
+from mdnvlib.novx_globals import LazyTranslation
 from mdnvlib.novx_globals import PLOT_LINE_PREFIX
 from mdnvlib.novx_globals import PLOT_POINT_PREFIX
 from mdnvlib.novx_globals import PL_ROOT
@@ -40,13 +44,24 @@ from mdnvlib.novx_globals import list_to_string
 from mdnvlib.novx_globals import norm_path
 from mdnvlib.novx_globals import string_to_list
 import xml.etree.ElementTree as ET
+from xml.parsers.expat import ExpatError
+from mdnvlib.file.worker_pool import map_in_batches
+from yw7lib.conversion_cache import ConversionCache
+from yw7lib.xml_decoder import decode_xml
+from yw7lib.xml_event_parser import XmlEventParser
+from yw7lib.xml_fields import get_children
+from yw7lib.xml_fields import get_custom_fields
+from yw7lib.xml_fields import read_fields
+from yw7lib.xml_fields import to_tags
 from yw7lib.xml_filter import strip_illegal_characters
-from yw7lib.xml_indent import indent
+from yw7lib.xml_writer import serialize
+from yw7lib.yw7_markup import from_yw_counting
+from yw7lib.yw7_markup import to_yw
 
 
 class Yw7File(File):
     """yWriter 7 project file representation."""
-    DESCRIPTION = _('yWriter 7 project')
+    DESCRIPTION = LazyTranslation('yWriter 7 project')
     EXTENSION = '.yw7'
 
     PRJ_KWVAR_YW7 = [
@@ -103,6 +118,57 @@ class Yw7File(File):
         ]
     # list of the names of the item keyword variables
 
+    _PROJECT_FIELDS = (
+        ('Title', 'title', None),
+        ('AuthorName', 'authorName', None),
+        ('Desc', 'desc', None),
+        ('WordCountStart', 'wordCountStart', int),
+        ('WordTarget', 'wordTarget', int),
+        )
+    _CHAPTER_FIELDS = (
+        ('Title', 'title', None),
+        ('Desc', 'desc', None),
+        )
+    _SCENE_FIELDS = (
+        ('Title', 'title', None),
+        ('Desc', 'desc', None),
+        ('Goal', 'goal', None),
+        ('Conflict', 'conflict', None),
+        ('Outcome', 'outcome', None),
+        ('Status', 'status', int),
+        ('Notes', 'notes', None),
+        ('Tags', 'tags', to_tags),
+        ('LastsDays', 'lastsDays', None),
+        ('LastsHours', 'lastsHours', None),
+        ('LastsMinutes', 'lastsMinutes', None),
+        # ('ImageFile', 'image', None),
+        )
+    _CHARACTER_FIELDS = (
+        ('Title', 'title', None),
+        ('Desc', 'desc', None),
+        ('AKA', 'aka', None),
+        ('Tags', 'tags', to_tags),
+        ('Notes', 'notes', None),
+        ('Bio', 'bio', None),
+        ('Goals', 'goals', None),
+        ('FullName', 'fullName', None),
+        # ('ImageFile', 'image', None),
+        )
+    _WORLD_ELEMENT_FIELDS = (
+        ('Title', 'title', None),
+        ('Desc', 'desc', None),
+        ('AKA', 'aka', None),
+        ('Tags', 'tags', to_tags),
+        # ('ImageFile', 'image', None),
+        )
+    _PROJECT_NOTE_FIELDS = (
+        ('Title', 'title', None),
+        ('Desc', 'desc', None),
+        )
+    # Field tables for reading: (xml tag, attribute, conversion function)
+    # The readers assign the texts of the xml elements' children found
+    # to the attributes; see xml_fields.read_fields().
+
     _CDATA_TAGS = [
         'Title',
         'AuthorName',
@@ -149,14 +215,24 @@ class Yw7File(File):
             filePath: str -- path to the yw7 file.
             
         Optional arguments:
-            kwargs -- keyword arguments (not used here).            
+            workers: int -- maximum number of worker processes for the section content conversion.
+                            Applies to reading and writing.
+            cache: bool -- if True, keep the section content conversions in a 
+                           ConversionCache database next to the project file.
+            eventParser: bool -- if True, read the file with an event-driven parser
+                                 instead of building an element tree.
+            compact: bool -- if True, write the file without indentation.
         
         Extends the superclass constructor.
         """
         super().__init__(filePath)
         self.tree = None
         # xml element tree of the yWriter project
-        self.wcLog = {}
+        self.wcLog = WordCountLog()
+        self.workers = kwargs.get('workers', 1)
+        self.useCache = kwargs.get('cache', False)
+        self.useEventParser = kwargs.get('eventParser', False)
+        self.compact = kwargs.get('compact', False)
         self._ywApIds = None
 
     def is_locked(self):
@@ -176,45 +252,41 @@ class Yw7File(File):
         if self.is_locked():
             raise Error(f'{_("yWriter seems to be open. Please close first")}.')
 
+        try:
+            with open_file(self.filePath, 'rb') as f:
+                xmlData = f.read()
+        except COMPRESSION_ERRORS as ex:
+            raise Error(f'{_("Can not process file")} - {str(ex)}')
+
+        self.read_data(xmlData)
+
+    def read_data(self, xmlData):
+        """Get the instance variables from the content of a yWriter xml file.
+        
+        Positional arguments:
+            xmlData: bytes or str -- the file content.
+        
+        Detect the encoding and decode the bytes in a single pass.
+        Raise the "Error" exception in case of error. 
+        """
         self._noteCounter = 0
         self._noteNumber = 0
         try:
-            try:
-                with open(self.filePath, 'r', encoding='utf-8') as f:
-                    xmlText = f.read()
-            except:
-                # yw7 file may be UTF-16 encoded, with a wrong XML header (yWriter for iOS)
-                with open(self.filePath, 'r', encoding='utf-16') as f:
-                    xmlText = f.read()
-        except:
-            try:
-                self.tree = ET.parse(self.filePath)
-            except Exception as ex:
-                raise Error(f'{_("Can not process file")} - {str(ex)}')
+            xmlText = decode_xml(xmlData)
+        except (ValueError, LookupError) as ex:
+            raise Error(f'{_("Can not process file")} - {str(ex)}')
 
         xmlText = strip_illegal_characters(xmlText)
-        root = ET.fromstring(xmlText)
-        del xmlText
-        # saving memory
-
-        self._ywApIds = []
-        self.wcLog = {}
-        self._read_project(root)
-        self._read_locations(root)
-        self._read_items(root)
-        self._read_characters(root)
-        self._read_chapters(root)
-        self._read_scenes(root)
-        self._read_project_notes(root)
-
-        #--- Read the word count log.
-        xmlWclog = root.find('WCLog')
-        if xmlWclog is not None:
-            for xmlWc in xmlWclog.iterfind('WC'):
-                wcDate = xmlWc.find('Date').text
-                wcCount = xmlWc.find('Count').text
-                wcTotalCount = xmlWc.find('TotalCount').text
-                self.wcLog[wcDate] = [wcCount, wcTotalCount]
+        self._ywApIds = set()
+        self.wcLog = WordCountLog()
+        self.readErrors = []
+        for treeRoot in (CH_ROOT, PL_ROOT, CR_ROOT, LC_ROOT, IT_ROOT):
+            self.novel.tree.delete_children(treeRoot)
+            # This is necessary for re-reading.
+        if self.useEventParser:
+            self._read_events(xmlText)
+        else:
+            self._read_tree(xmlText)
 
         #--- Initialize empty scene character/location/item lists.
         # This helps deleting orphaned XML list items when saving the file.
@@ -244,7 +316,13 @@ class Yw7File(File):
         self._noteNumber = 0
         self._build_element_tree()
         self._write_element_tree(self)
-        self._postprocess_xml_file(self.filePath)
+
+    def write_data(self):
+        """Return the content of a yWriter xml file as bytes, without writing the file."""
+        self._noteCounter = 0
+        self._noteNumber = 0
+        self._build_element_tree()
+        return self._get_xml_text(self).encode('utf-8')
 
     def _build_element_tree(self):
         """Modify the yWriter project attributes of an existing xml element tree."""
@@ -314,7 +392,7 @@ class Yw7File(File):
                 ET.SubElement(xmlScene, 'SceneContent')
                 return
 
-            ET.SubElement(xmlScene, 'SceneContent').text = self._to_yw(prjScn.sectionContent)
+            ET.SubElement(xmlScene, 'SceneContent').text = ywContents[scId]
             if prjScn.notes:
                 ET.SubElement(xmlScene, 'Notes').text = prjScn.notes
             if scTags:
@@ -560,6 +638,15 @@ class Yw7File(File):
         #--- Process scenes.
         xmlSceneFields = {}
         scIds = list(self.novel.sections)
+
+        # Convert all section contents in a batch, using worker processes, if requested.
+        ywContents = dict(zip(
+            scIds,
+            self._convert_contents(
+                [self.novel.sections[scId].sectionContent for scId in scIds],
+                'to_yw',
+                ),
+            ))
         for scId in scIds:
             xmlScene = ET.SubElement(xmlScenes, 'SCENE')
             ET.SubElement(xmlScene, 'ID').text = scId[2:]
@@ -567,12 +654,14 @@ class Yw7File(File):
             build_scene_subtree(xmlScene, self.novel.sections[scId])
 
         #--- Process plot points.
-        newScIds = {}
+        newScIds = dict(zip(
+            self.novel.plotPoints,
+            IdAllocator(scIds).new_ids(SECTION_PREFIX, len(self.novel.plotPoints)),
+            ))
         # new scene IDs by plot point ID
         for ppId in self.novel.plotPoints:
-            scId = create_id(scIds, prefix=SECTION_PREFIX)
+            scId = newScIds[ppId]
             scIds.append(scId)
-            newScIds[ppId] = scId
             xmlScene = ET.SubElement(xmlScenes, 'SCENE')
             ET.SubElement(xmlScene, 'ID').text = scId[2:]
             xmlSceneFields[scId] = ET.SubElement(xmlScene, 'Fields')
@@ -591,15 +680,14 @@ class Yw7File(File):
                     ET.SubElement(xmlScnList, 'ScID').text = scId[2:]
 
         #--- Process plot lines.
-        chId = create_id(chIds, prefix=CHAPTER_PREFIX)
-        chIds.append(chId)
+        plIds = self.novel.tree.get_children(PL_ROOT)
+        newChIds = IdAllocator(chIds).new_ids(CHAPTER_PREFIX, len(plIds) + 1)
+        chId = newChIds.pop(0)
         xmlChapter = ET.SubElement(xmlChapters, 'CHAPTER')
         ET.SubElement(xmlChapter, 'ID').text = chId[2:]
         arcPart = Chapter(title=_('Plot lines'), chLevel=1)
         build_chapter_subtree(xmlChapter, arcPart, chType=2)
-        for plId in self.novel.tree.get_children(PL_ROOT):
-            chId = create_id(chIds, prefix=CHAPTER_PREFIX)
-            chIds.append(chId)
+        for plId, chId in zip(plIds, newChIds):
             xmlChapter = ET.SubElement(xmlChapters, 'CHAPTER')
             ET.SubElement(xmlChapter, 'ID').text = chId[2:]
             build_chapter_subtree(xmlChapter, self.novel.plotLines[plId], plId=plId)
@@ -644,339 +732,258 @@ class Yw7File(File):
         #--- Build the word count log.
         if self.wcLog:
             xmlWcLog = ET.SubElement(root, 'WCLog')
-            wcLastCount = None
-            wcLastTotalCount = None
-            for wc in self.wcLog:
-                if self.novel.saveWordCount:
-                    # Discard entries with unchanged word count.
-                    if self.wcLog[wc][0] == wcLastCount and self.wcLog[wc][1] == wcLastTotalCount:
-                        continue
-
-                    wcLastCount = self.wcLog[wc][0]
-                    wcLastTotalCount = self.wcLog[wc][1]
+            if self.novel.saveWordCount:
+                # Discard entries with unchanged word count.
+                entries = self.wcLog.compacted()
+            else:
+                entries = self.wcLog
+            for wcDate, count, totalCount in entries:
                 xmlWc = ET.SubElement(xmlWcLog, 'WC')
-                ET.SubElement(xmlWc, 'Date').text = wc
-                ET.SubElement(xmlWc, 'Count').text = self.wcLog[wc][0]
-                ET.SubElement(xmlWc, 'TotalCount').text = self.wcLog[wc][1]
+                ET.SubElement(xmlWc, 'Date').text = wcDate
+                ET.SubElement(xmlWc, 'Count').text = str(count)
+                ET.SubElement(xmlWc, 'TotalCount').text = str(totalCount)
 
-        #--- Prepare the XML tree for saving.
-        indent(root)
         self.tree = ET.ElementTree(root)
 
-    def _from_yw(self, text, quick=False):
-        """Return text, converted from yw7 markup to Markdown.
+    def _convert_contents(self, texts, direction):
+        """Return a list with the converted section contents.
         
         Positional arguments:
-            text -- string to convert.
+            texts: list of str -- section contents to convert.
+            direction: str -- 'from_yw' or 'to_yw'.
         
-        Optional arguments:
-            quick -- bool: if True, apply a conversion mode for one-liners without formatting. 
+        For 'from_yw', the list elements are (Markdown text, word count) tuples.
+        For 'to_yw', the list elements are yw7 markup strings.
+        Take unchanged conversions from the cache, if any, and 
+        distribute the remaining conversions to the worker processes.
+        If the cache database fails, convert without the cache.
         """
-        if quick:
-            # Just clean up a one-liner without sophisticated formatting.
-            if text is None:
-                return ''
-            else:
-                return text
-
-        MD_REPLACEMENTS = [
-            ('\n', '\n\n'),
-            ('[i] ', ' [i]'),
-            ('[b] ', ' [b]'),
-            ('[s] ', ' [s]'),
-            ('[i]', '*'),
-            ('[/i]', '*'),
-            ('[b]', '**'),
-            ('[/b]', '**'),
-            ('/*', '<!---'),
-            ('*/', '--->'),
-            ('  ', ' '),
-        ]
+        if direction == 'from_yw':
+            function = from_yw_counting
+        else:
+            function = to_yw
+        cache = self._open_cache()
+        if cache is None:
+            return map_in_batches(function, texts, workers=self.workers)
+
+        try:
+            results = [None] * len(texts)
+            try:
+                misses = []
+                for i, text in enumerate(texts):
+                    cached = None
+                    if text:
+                        cached = cache.get(direction, text)
+                    if cached is None:
+                        misses.append(i)
+                    elif direction == 'from_yw':
+                        results[i] = cached
+                    else:
+                        results[i] = cached[0]
+            except sqlite3.Error:
+                # Converting without cache is slower, but still correct.
+                misses = list(range(len(texts)))
+                self._close_cache(cache)
+                cache = None
+            convertedTexts = map_in_batches(function, [texts[i] for i in misses], workers=self.workers)
+            for i, result in zip(misses, convertedTexts):
+                results[i] = result
+            if cache is not None:
+                try:
+                    for i in misses:
+                        if not texts[i]:
+                            continue
+
+                        if direction == 'from_yw':
+                            cache.put(direction, texts[i], *results[i])
+                        else:
+                            cache.put(direction, texts[i], results[i])
+                except sqlite3.Error:
+                    pass
+        finally:
+            if cache is not None:
+                self._close_cache(cache)
+        return results
+
+    def _close_cache(self, cache):
+        """Close the cache, ignoring database errors."""
+        try:
+            cache.close()
+        except sqlite3.Error:
+            pass
+
+    def _open_cache(self):
+        """Return a ConversionCache instance, if requested and possible. Otherwise return None."""
+        if not self.useCache:
+            return None
+
+        cachePath = os.path.join(os.path.dirname(os.path.abspath(self.filePath)), ConversionCache.FILE_NAME)
         try:
-            for yw, md in MD_REPLACEMENTS:
-                text = text.replace(yw, md)
-            text = re.sub(r'\[\/*[h|c|r|s|u]\d*\]', '', text)
-            # Remove highlighting, alignment, and underline tags
-        except AttributeError:
-            text = ''
-        return text
-
-    def _postprocess_xml_file(self, filePath):
-        """Postprocess an xml file created by ElementTree.
+            return ConversionCache(cachePath)
+
+        except sqlite3.Error:
+            # Converting without cache is slower, but still correct.
+            return None
+
+    def _postprocess_xml_text(self, text):
+        """Return the serialized xml text, prepared for yWriter.
         
         Positional argument:
-            filePath: str -- path to xml file.
+            text: str -- xml text with header and CDATA tags.
         
-        Read the xml file, put a header on top, insert the missing CDATA tags,
-        and replace xml entities by plain text (unescape). Overwrite the .yw7 xml file.
-        Raise the "Error" exception in case of error. 
-        
-        Note: The path is given as an argument rather than using self.filePath. 
-        So this routine can be used for yWriter-generated xml files other than .yw7 as well. 
+        Remove line breaks around the CDATA sections,
+        and replace xml entities by plain text (unescape).
         """
-        with open(filePath, 'r', encoding='utf-8') as f:
-            text = f.read()
-        lines = text.split('\n')
-        newlines = ['<?xml version="1.0" encoding="utf-8"?>']
-        for line in lines:
-            for tag in self._CDATA_TAGS:
-                line = re.sub(fr'\<{tag}\>', f'<{tag}><![CDATA[', line)
-                line = re.sub(fr'\<\/{tag}\>', f']]></{tag}>', line)
-            newlines.append(line)
-        text = '\n'.join(newlines)
         text = text.replace('[CDATA[ \n', '[CDATA[')
         text = text.replace('\n]]', ']]')
         if not self.novel.chapters:
             text = text.replace('<CHAPTERS />', '<CHAPTERS></CHAPTERS>')
             # otherwise, yWriter fails to parse the file if there are no chapters.
-        text = unescape(text)
-        try:
-            with open(filePath, 'w', encoding='utf-8') as f:
-                f.write(text)
-        except:
-            raise Error(f'{_("Cannot write file")}: "{norm_path(filePath)}".')
-
-    def _read_locations(self, root):
-        """Read locations from the xml element tree."""
-        self.novel.tree.delete_children(LC_ROOT)
-        # This is necessary for re-reading.
-        for xmlLocation in root.find('LOCATIONS'):
-            lcId = f"{LOCATION_PREFIX}{xmlLocation.find('ID').text}"
-            self.novel.tree.append(LC_ROOT, lcId)
-            self.novel.locations[lcId] = WorldElement()
-
-            if xmlLocation.find('Title') is not None:
-                self.novel.locations[lcId].title = xmlLocation.find('Title').text
-
-            # if xmlLocation.find('ImageFile') is not None:
-            #    self.novel.locations[lcId].image = xmlLocation.find('ImageFile').text
-
-            if xmlLocation.find('Desc') is not None:
-                self.novel.locations[lcId].desc = xmlLocation.find('Desc').text
-
-            if xmlLocation.find('AKA') is not None:
-                self.novel.locations[lcId].aka = xmlLocation.find('AKA').text
-
-            if xmlLocation.find('Tags') is not None:
-                if xmlLocation.find('Tags').text is not None:
-                    tags = string_to_list(xmlLocation.find('Tags').text)
-                    self.novel.locations[lcId].tags = self._strip_spaces(tags)
-
-    def _read_items(self, root):
-        """Read items from the xml element tree."""
-        self.novel.tree.delete_children(IT_ROOT)
-        # This is necessary for re-reading.
-        for xmlItem in root.find('ITEMS'):
-            itId = f"{ITEM_PREFIX}{xmlItem.find('ID').text}"
-            self.novel.tree.append(IT_ROOT, itId)
-            self.novel.items[itId] = WorldElement()
-
-            if xmlItem.find('Title') is not None:
-                self.novel.items[itId].title = xmlItem.find('Title').text
-
-            # if xmlItem.find('ImageFile') is not None:
-            #    self.novel.items[itId].image = xmlItem.find('ImageFile').text
+        return unescape(text)
 
-            if xmlItem.find('Desc') is not None:
-                self.novel.items[itId].desc = xmlItem.find('Desc').text
-
-            if xmlItem.find('AKA') is not None:
-                self.novel.items[itId].aka = xmlItem.find('AKA').text
-
-            if xmlItem.find('Tags') is not None:
-                if xmlItem.find('Tags').text is not None:
-                    tags = string_to_list(xmlItem.find('Tags').text)
-                    self.novel.items[itId].tags = self._strip_spaces(tags)
-
-    def _read_chapters(self, root):
-        """Read attributes at chapter level from the xml element tree."""
-        self.novel.tree.delete_children(CH_ROOT)
-        self.novel.tree.delete_children(PL_ROOT)
-        # This is necessary for re-reading.
-        for xmlChapter in root.find('CHAPTERS'):
-            prjChapter = Chapter()
-
-            if xmlChapter.find('Title') is not None:
-                prjChapter.title = xmlChapter.find('Title').text
-
-            if xmlChapter.find('Desc') is not None:
-                prjChapter.desc = xmlChapter.find('Desc').text
-
-            if xmlChapter.find('SectionStart') is not None:
-                prjChapter.chLevel = 1
-            else:
-                prjChapter.chLevel = 2
-
-            # This is how yWriter 7.1.3.0 reads the chapter type:
-            #
-            # Type   |<Unused>|<Type>|<ChapterType>|chType
-            # -------+--------+------+--------------------
-            # Normal | N/A    | N/A  | N/A         | 0
-            # Normal | N/A    | 0    | N/A         | 0
-            # Notes  | x      | 1    | N/A         | 1
-            # Unused | -1     | 0    | N/A         | 1
-            # Normal | N/A    | x    | 0           | 0
-            # Notes  | x      | x    | 1           | 1
-            # Todo   | x      | x    | 2           | 1
-            # Unused | -1     | x    | x           | 1
-
-            prjChapter.chType = 0
-            if xmlChapter.find('Unused') is not None:
-                yUnused = True
-            else:
-                yUnused = False
-            if xmlChapter.find('ChapterType') is not None:
-                # The file may be created with yWriter version 7.0.7.2+
-                yChapterType = xmlChapter.find('ChapterType').text
-                if yChapterType == '2':
-                    prjChapter.chType = 1
-                elif yChapterType == '1':
+    def _read_events(self, xmlText):
+        """Read the project from an xml string, using an event-driven parser.
+        
+        Positional arguments:
+            xmlText: str -- yw7 xml document.
+        
+        Build no element tree; pass the project's elements one by one
+        to the same readers as _read_tree() does.
+        Keep only the scenes' children until the chapters are read.
+        Raise the "Error" exception in case of error. 
+        """
+        xmlScenes = []
+        parser = XmlEventParser({
+            'PROJECT': self._read_project,
+            'LOCATION': self._read_location,
+            'ITEM': self._read_item,
+            'CHARACTER': self._read_character,
+            'SCENE': xmlScenes.append,
+            'CHAPTER': self._read_chapter,
+            'PROJECTNOTE': self._read_project_note,
+            'WC': self._read_word_count,
+            })
+        try:
+            parser.parse(xmlText)
+        except ExpatError as ex:
+            raise Error(f'{_("Can not process file")} - {str(ex)}')
+
+        self._read_scenes(xmlScenes)
+
+    def _read_location(self, children):
+        """Read a location from the children of its xml element."""
+        lcId = f"{LOCATION_PREFIX}{children['ID'].text}"
+        self.novel.tree.append(LC_ROOT, lcId)
+        self.novel.locations[lcId] = WorldElement()
+        read_fields(self.novel.locations[lcId], children, self._WORLD_ELEMENT_FIELDS)
+
+    def _read_item(self, children):
+        """Read an item from the children of its xml element."""
+        itId = f"{ITEM_PREFIX}{children['ID'].text}"
+        self.novel.tree.append(IT_ROOT, itId)
+        self.novel.items[itId] = WorldElement()
+        read_fields(self.novel.items[itId], children, self._WORLD_ELEMENT_FIELDS)
+
+    def _read_chapter(self, children):
+        """Read a chapter or a plot line from the children of its xml element."""
+        prjChapter = Chapter()
+        read_fields(prjChapter, children, self._CHAPTER_FIELDS)
+
+        if 'SectionStart' in children:
+            prjChapter.chLevel = 1
+        else:
+            prjChapter.chLevel = 2
+
+        # This is how yWriter 7.1.3.0 reads the chapter type:
+        #
+        # Type   |<Unused>|<Type>|<ChapterType>|chType
+        # -------+--------+------+--------------------
+        # Normal | N/A    | N/A  | N/A         | 0
+        # Normal | N/A    | 0    | N/A         | 0
+        # Notes  | x      | 1    | N/A         | 1
+        # Unused | -1     | 0    | N/A         | 1
+        # Normal | N/A    | x    | 0           | 0
+        # Notes  | x      | x    | 1           | 1
+        # Todo   | x      | x    | 2           | 1
+        # Unused | -1     | x    | x           | 1
+
+        prjChapter.chType = 0
+        yUnused = 'Unused' in children
+        if 'ChapterType' in children:
+            # The file may be created with yWriter version 7.0.7.2+
+            yChapterType = children['ChapterType'].text
+            if yChapterType == '2':
+                prjChapter.chType = 1
+            elif yChapterType == '1':
+                prjChapter.chType = 1
+            elif yUnused:
+                prjChapter.chType = 1
+        else:
+            # The file may be created with a yWriter version prior to 7.0.7.2
+            if 'Type' in children:
+                yType = children['Type'].text
+                if yType == '1':
                     prjChapter.chType = 1
                 elif yUnused:
                     prjChapter.chType = 1
-            else:
-                # The file may be created with a yWriter version prior to 7.0.7.2
-                if xmlChapter.find('Type') is not None:
-                    yType = xmlChapter.find('Type').text
-                    if yType == '1':
-                        prjChapter.chType = 1
-                    elif yUnused:
-                        prjChapter.chType = 1
-
-            #--- Read chapter fields.
-            kwVarYw7 = {}
-            for xmlChapterFields in xmlChapter.iterfind('Fields'):
-                prjChapter.isTrash = False
-                if xmlChapterFields.find('Field_IsTrash') is not None:
-                    if xmlChapterFields.find('Field_IsTrash').text == '1':
-                        prjChapter.isTrash = True
-
-                #--- Read chapter custom fields.
-                for fieldName in self.CHP_KWVAR_YW7:
-                    xmlField = xmlChapterFields.find(fieldName)
-                    if xmlField  is not None:
-                        kwVarYw7[fieldName] = xmlField .text
-            prjChapter.noNumber = kwVarYw7.get('Field_NoNumber', False) == '1'
-            shortName = kwVarYw7.get('Field_ArcDefinition', '')
-
-            # This is for projects written with novelibre v4.3:
-            field = kwVarYw7.get('Field_Arc_Definition', None)
-            if field is not None:
-                shortName = field
-
-            #--- Read chapter's scene list.
-            scenes = []
-            if xmlChapter.find('Scenes') is not None:
-                for scn in xmlChapter.find('Scenes').iterfind('ScID'):
-                    scId = scn.text
-                    scenes.append(scId)
-
-            if shortName:
-                plId = f"{PLOT_LINE_PREFIX}{xmlChapter.find('ID').text}"
-                self.novel.plotLines[plId] = PlotLine()
-                self.novel.plotLines[plId].title = prjChapter.title
-                self.novel.plotLines[plId].desc = prjChapter.desc
-                self.novel.plotLines[plId].shortName = shortName
-                self.novel.tree.append(PL_ROOT, plId)
-                for scId in scenes:
-                    self.novel.tree.append(plId, f'{PLOT_POINT_PREFIX}{scId}')
-                    self._ywApIds.append(scId)
-                    # this is necessary for turning yWriter scenes into mdnovel turning points
-            else:
-                chId = f"{CHAPTER_PREFIX}{xmlChapter.find('ID').text}"
-                self.novel.chapters[chId] = prjChapter
-                self.novel.tree.append(CH_ROOT, chId)
-                for scId in scenes:
-                    self.novel.tree.append(chId, f'{SECTION_PREFIX}{scId}')
-
-    def _read_characters(self, root):
-        """Read characters from the xml element tree."""
-        self.novel.tree.delete_children(CR_ROOT)
-        # This is necessary for re-reading.
-        for xmlCharacter in root.find('CHARACTERS'):
-            crId = f"{CHARACTER_PREFIX}{xmlCharacter.find('ID').text}"
-            self.novel.tree.append(CR_ROOT, crId)
-            self.novel.characters[crId] = Character()
-
-            if xmlCharacter.find('Title') is not None:
-                self.novel.characters[crId].title = xmlCharacter.find('Title').text
-
-            # if xmlCharacter.find('ImageFile') is not None:
-            #    self.novel.characters[crId].image = xmlCharacter.find('ImageFile').text
-            # TODO: read link
-
-            if xmlCharacter.find('Desc') is not None:
-                self.novel.characters[crId].desc = xmlCharacter.find('Desc').text
 
-            if xmlCharacter.find('AKA') is not None:
-                self.novel.characters[crId].aka = xmlCharacter.find('AKA').text
-
-            if xmlCharacter.find('Tags') is not None:
-                if xmlCharacter.find('Tags').text is not None:
-                    tags = string_to_list(xmlCharacter.find('Tags').text)
-                    self.novel.characters[crId].tags = self._strip_spaces(tags)
-
-            if xmlCharacter.find('Notes') is not None:
-                self.novel.characters[crId].notes = xmlCharacter.find('Notes').text
-
-            if xmlCharacter.find('Bio') is not None:
-                self.novel.characters[crId].bio = xmlCharacter.find('Bio').text
-
-            if xmlCharacter.find('Goals') is not None:
-                self.novel.characters[crId].goals = xmlCharacter.find('Goals').text
-
-            if xmlCharacter.find('FullName') is not None:
-                self.novel.characters[crId].fullName = xmlCharacter.find('FullName').text
-
-            if xmlCharacter.find('Major') is not None:
-                self.novel.characters[crId].isMajor = True
-            else:
-                self.novel.characters[crId].isMajor = False
-                #--- Read scene custom fields.
-
-            kwVarYw7 = {}
-            xmlCharacterFields = xmlCharacter.find('Fields')
-            if xmlCharacterFields is not None:
-                for fieldName in self.CRT_KWVAR_YW7:
-                    xmlField = xmlCharacterFields.find(fieldName)
-                    if xmlField  is not None:
-                        kwVarYw7[fieldName] = xmlField.text
-            self.novel.characters[crId].birthDate = kwVarYw7.get('Field_BirthDate', '')
-            self.novel.characters[crId].deathDate = kwVarYw7.get('Field_DeathDate', '')
-
-    def _read_project(self, root):
-        """Read attributes at project level from the xml element tree."""
-        xmlProject = root.find('PROJECT')
-
-        if xmlProject.find('Title') is not None:
-            self.novel.title = xmlProject.find('Title').text
-
-        if xmlProject.find('AuthorName') is not None:
-            self.novel.authorName = xmlProject.find('AuthorName').text
-
-        if xmlProject.find('Desc') is not None:
-            self.novel.desc = xmlProject.find('Desc').text
-
-        #--- Read word target data.
-        if xmlProject.find('WordCountStart') is not None:
-            try:
-                self.novel.wordCountStart = int(xmlProject.find('WordCountStart').text)
-            except:
-                pass
-        if xmlProject.find('WordTarget') is not None:
-            try:
-                self.novel.wordTarget = int(xmlProject.find('WordTarget').text)
-            except:
-                pass
+        #--- Read chapter fields.
+        kwVarYw7 = get_custom_fields(children, self.CHP_KWVAR_YW7 + ['Field_IsTrash'])
+        if 'Fields' in children:
+            prjChapter.isTrash = kwVarYw7.get('Field_IsTrash', None) == '1'
+        prjChapter.noNumber = kwVarYw7.get('Field_NoNumber', False) == '1'
+        shortName = kwVarYw7.get('Field_ArcDefinition', '')
+
+        # This is for projects written with novelibre v4.3:
+        field = kwVarYw7.get('Field_Arc_Definition', None)
+        if field is not None:
+            shortName = field
+
+        #--- Read chapter's scene list.
+        scenes = []
+        if 'Scenes' in children:
+            for scn in children['Scenes']:
+                if scn.tag == 'ScID':
+                    scenes.append(scn.text)
+
+        if shortName:
+            plId = f"{PLOT_LINE_PREFIX}{children['ID'].text}"
+            self.novel.plotLines[plId] = PlotLine()
+            self.novel.plotLines[plId].title = prjChapter.title
+            self.novel.plotLines[plId].desc = prjChapter.desc
+            self.novel.plotLines[plId].shortName = shortName
+            self.novel.tree.append(PL_ROOT, plId)
+            for scId in scenes:
+                self.novel.tree.append(plId, f'{PLOT_POINT_PREFIX}{scId}')
+                self._ywApIds.add(scId)
+                # this is necessary for turning yWriter scenes into mdnovel turning points
+        else:
+            chId = f"{CHAPTER_PREFIX}{children['ID'].text}"
+            self.novel.chapters[chId] = prjChapter
+            self.novel.tree.append(CH_ROOT, chId)
+            for scId in scenes:
+                self.novel.tree.append(chId, f'{SECTION_PREFIX}{scId}')
+
+    def _read_character(self, children):
+        """Read a character from the children of its xml element."""
+        crId = f"{CHARACTER_PREFIX}{children['ID'].text}"
+        self.novel.tree.append(CR_ROOT, crId)
+        self.novel.characters[crId] = Character()
+        read_fields(self.novel.characters[crId], children, self._CHARACTER_FIELDS)
+        # TODO: read link
+        self.novel.characters[crId].isMajor = 'Major' in children
+
+        #--- Read character custom fields.
+        kwVarYw7 = get_custom_fields(children, self.CRT_KWVAR_YW7)
+        self.novel.characters[crId].birthDate = kwVarYw7.get('Field_BirthDate', '')
+        self.novel.characters[crId].deathDate = kwVarYw7.get('Field_DeathDate', '')
+
+    def _read_project(self, children):
+        """Read attributes at project level from the children of the xml element."""
+        read_fields(self.novel, children, self._PROJECT_FIELDS)
 
         #--- Read project custom fields.
-        kwVarYw7 = {}
-        for xmlProjectFields in xmlProject.iterfind('Fields'):
-            for fieldName in self.PRJ_KWVAR_YW7:
-                xmlField = xmlProjectFields.find(fieldName)
-                if xmlField  is not None:
-                    if xmlField.text:
-                        kwVarYw7[fieldName] = xmlField.text
+        kwVarYw7 = get_custom_fields(children, self.PRJ_KWVAR_YW7, skipEmpty=True)
         try:
             self.novel.workPhase = int(kwVarYw7.get('Field_WorkPhase', None))
         except:
@@ -997,37 +1004,50 @@ class Yw7File(File):
         self.novel.customChrGoals = kwVarYw7.get('Field_CustomChrGoals', '')
         self.novel.saveWordCount = kwVarYw7.get('Field_SaveWordCount', False) == '1'
 
-    def _read_project_notes(self, root):
-        """Read project notes from the xml element tree.
+    def _read_project_note(self, children):
+        """Read a project note from the children of its xml element."""
+        if 'ID' in children:
+            pnId = f"{PRJ_NOTE_PREFIX}{children['ID'].text}"
+            self.novel.tree.append(PN_ROOT, pnId)
+            self.novel.projectNotes[pnId] = BasicElement()
+            read_fields(self.novel.projectNotes[pnId], children, self._PROJECT_NOTE_FIELDS)
+
+    def _read_scenes(self, xmlScenes):
+        """ Read attributes at scene level from the children of the xml elements.
         
-        If any, create "Notes" scenes in the "Project notes" chapter.
+        Positional arguments:
+            xmlScenes: list of dict -- children by tag for each scene in document order.
+        
+        Convert the scene contents and count the words in a batch first,
+        distributing the work to several processes, if requested.
+        Then build the sections one by one in document order,
+        using lookup tables for the plot lines and the world elements.
+        The chapters must be read before.
         """
-        if root.find('PROJECTNOTES') is not None:
-            for xmlProjectnote in root.find('PROJECTNOTES'):
-                if xmlProjectnote.find('ID') is not None:
-                    pnId = f"{PRJ_NOTE_PREFIX}{xmlProjectnote.find('ID').text}"
-                    self.novel.tree.append(PN_ROOT, pnId)
-                    self.novel.projectNotes[pnId] = BasicElement()
-                    if xmlProjectnote.find('Title') is not None:
-                        self.novel.projectNotes[pnId].title = xmlProjectnote.find('Title').text
-                    if xmlProjectnote.find('Desc') is not None:
-                        self.novel.projectNotes[pnId].desc = xmlProjectnote.find('Desc').text
-
-    def _read_scenes(self, root):
-        """ Read attributes at scene level from the xml element tree."""
-        for xmlScene in root.find('SCENES'):
-            prjScn = Section()
-
-            if xmlScene.find('Title') is not None:
-                prjScn.title = xmlScene.find('Title').text
-
-            if xmlScene.find('Desc') is not None:
-                prjScn.desc = xmlScene.find('Desc').text
+        sceneContents = []
+        for children in xmlScenes:
+            if 'SceneContent' in children:
+                sceneContents.append(children['SceneContent'].text)
+            else:
+                sceneContents.append(None)
+        convertedContents = self._convert_contents(sceneContents, 'from_yw')
+        del sceneContents
+
+        # Lookup tables for the associations, to be built only once.
+        crIds = set(self.novel.tree.get_children(CR_ROOT))
+        lcIds = set(self.novel.tree.get_children(LC_ROOT))
+        itIds = set(self.novel.tree.get_children(IT_ROOT))
+        plIdsByShortName = {}
+        arcSections = {}
+        for plId in self.novel.plotLines:
+            plIdsByShortName.setdefault(self.novel.plotLines[plId].shortName, plId)
+            arcSections[plId] = []
 
-            if xmlScene.find('SceneContent') is not None:
-                sceneContent = xmlScene.find('SceneContent').text
-                if sceneContent is not None:
-                    prjScn.sectionContent = self._from_yw(sceneContent)
+        for children, (sectionContent, wordCount) in zip(xmlScenes, convertedContents):
+            prjScn = Section()
+            read_fields(prjScn, children, self._SCENE_FIELDS)
+            if sectionContent is not None:
+                prjScn.set_counted_content(sectionContent, wordCount)
 
             #--- Read scene type.
 
@@ -1043,49 +1063,23 @@ class Yw7File(File):
             # Normal | N/A    | 0              | 0
 
             prjScn.scType = 0
-            kwVarYw7 = {}
-            for xmlSceneFields in xmlScene.iterfind('Fields'):
-                # Read scene type, if any.
-                if xmlSceneFields.find('Field_SceneType') is not None:
-                    if xmlSceneFields.find('Field_SceneType').text == '1':
-                        prjScn.scType = 1
-                    elif xmlSceneFields.find('Field_SceneType').text == '2':
-                        prjScn.scType = 1
-
-                #--- Read scene custom fields.
-                for fieldName in self.SCN_KWVAR_YW7:
-                    xmlField = xmlSceneFields.find(fieldName)
-                    if xmlField  is not None:
-                        kwVarYw7[fieldName] = xmlField.text
-
-            ywScnArcs = string_to_list(kwVarYw7.get('Field_SceneArcs', ''))
-            for shortName in ywScnArcs:
-                for plId in self.novel.plotLines:
-                    if self.novel.plotLines[plId].shortName == shortName:
-                        if prjScn.scType == 0:
-                            arcSections = self.novel.plotLines[plId].sections
-                            if not arcSections:
-                                arcSections = [f"{SECTION_PREFIX}{xmlScene.find('ID').text}"]
-                            else:
-                                arcSections.append(f"{SECTION_PREFIX}{xmlScene.find('ID').text}")
-                            self.novel.plotLines[plId].sections = arcSections
-                        break
+            kwVarYw7 = get_custom_fields(children, self.SCN_KWVAR_YW7 + ['Field_SceneType'])
+            if kwVarYw7.get('Field_SceneType', None) in ('1', '2'):
+                prjScn.scType = 1
+
+            ywScId = children['ID'].text
+            if prjScn.scType == 0:
+                for shortName in string_to_list(kwVarYw7.get('Field_SceneArcs', '')):
+                    plId = plIdsByShortName.get(shortName, None)
+                    if plId is not None:
+                        arcSections[plId].append(f"{SECTION_PREFIX}{ywScId}")
 
             ywScnAssocs = string_to_list(kwVarYw7.get('Field_SceneAssoc', ''))
             prjScn.plotPoints = [f'{PLOT_POINT_PREFIX}{plotPoint}' for plotPoint in ywScnAssocs]
 
-            if xmlScene.find('Goal') is not None:
-                prjScn.goal = xmlScene.find('Goal').text
-
-            if xmlScene.find('Conflict') is not None:
-                prjScn.conflict = xmlScene.find('Conflict').text
-
-            if xmlScene.find('Outcome') is not None:
-                prjScn.outcome = xmlScene.find('Outcome').text
-
             if kwVarYw7.get('Field_CustomAR', None) is not None:
                 prjScn.scene = 3
-            elif xmlScene.find('ReactionScene') is not None:
+            elif 'ReactionScene' in children:
                 prjScn.scene = 2
             elif prjScn.goal or prjScn.conflict or prjScn.outcome:
                 prjScn.scene = 1
@@ -1093,29 +1087,15 @@ class Yw7File(File):
                 prjScn.scene = 0
 
             # Unused.
-            if xmlScene.find('Unused') is not None:
+            if 'Unused' in children:
                 if prjScn.scType == 0:
                     prjScn.scType = 1
 
-            if xmlScene.find('Status') is not None:
-                prjScn.status = int(xmlScene.find('Status').text)
-
-            if xmlScene.find('Notes') is not None:
-                prjScn.notes = xmlScene.find('Notes').text
-
-            if xmlScene.find('Tags') is not None:
-                if xmlScene.find('Tags').text is not None:
-                    tags = string_to_list(xmlScene.find('Tags').text)
-                    prjScn.tags = self._strip_spaces(tags)
-
-            if xmlScene.find('AppendToPrev') is not None:
-                prjScn.appendToPrev = True
-            else:
-                prjScn.appendToPrev = False
+            prjScn.appendToPrev = 'AppendToPrev' in children
 
             #--- Scene start.
-            if xmlScene.find('SpecificDateTime') is not None:
-                dateTimeStr = xmlScene.find('SpecificDateTime').text
+            if 'SpecificDateTime' in children:
+                dateTimeStr = children['SpecificDateTime'].text
 
                 # Check SpecificDateTime for ISO compliance.
                 try:
@@ -1128,8 +1108,8 @@ class Yw7File(File):
                     prjScn.date = startDateTime[0]
                     prjScn.time = startDateTime[1]
             else:
-                if xmlScene.find('Day') is not None:
-                    day = xmlScene.find('Day').text
+                if 'Day' in children:
+                    day = children['Day'].text
 
                     # Check if Day represents an integer.
                     try:
@@ -1139,60 +1119,55 @@ class Yw7File(File):
                     prjScn.day = day
 
                 hasUnspecificTime = False
-                if xmlScene.find('Hour') is not None:
-                    hour = xmlScene.find('Hour').text.zfill(2)
+                if 'Hour' in children:
+                    hour = children['Hour'].text.zfill(2)
                     hasUnspecificTime = True
                 else:
                     hour = '00'
-                if xmlScene.find('Minute') is not None:
-                    minute = xmlScene.find('Minute').text.zfill(2)
+                if 'Minute' in children:
+                    minute = children['Minute'].text.zfill(2)
                     hasUnspecificTime = True
                 else:
                     minute = '00'
                 if hasUnspecificTime:
                     prjScn.time = f'{hour}:{minute}:00'
 
-            #--- Scene duration.
-            if xmlScene.find('LastsDays') is not None:
-                prjScn.lastsDays = xmlScene.find('LastsDays').text
-
-            if xmlScene.find('LastsHours') is not None:
-                prjScn.lastsHours = xmlScene.find('LastsHours').text
-
-            if xmlScene.find('LastsMinutes') is not None:
-                prjScn.lastsMinutes = xmlScene.find('LastsMinutes').text
-
-            # if xmlScene.find('ImageFile') is not None:
-            #    prjScn.image = xmlScene.find('ImageFile').text
-
             #--- Characters associated with the scene.
             scCharacters = []
-            if xmlScene.find('Characters') is not None:
-                for character in xmlScene.find('Characters').iter('CharID'):
+            if 'Characters' in children:
+                for character in children['Characters']:
+                    if character.tag != 'CharID':
+                        continue
+
                     crId = f"{CHARACTER_PREFIX}{character.text}"
-                    if crId in self.novel.tree.get_children(CR_ROOT):
+                    if crId in crIds:
                         scCharacters.append(crId)
             prjScn.characters = scCharacters
 
             #--- Locations associated with the scene.
             scLocations = []
-            if xmlScene.find('Locations') is not None:
-                for location in xmlScene.find('Locations').iter('LocID'):
+            if 'Locations' in children:
+                for location in children['Locations']:
+                    if location.tag != 'LocID':
+                        continue
+
                     lcId = f"{LOCATION_PREFIX}{location.text}"
-                    if lcId in self.novel.tree.get_children(LC_ROOT):
+                    if lcId in lcIds:
                         scLocations.append(lcId)
             prjScn.locations = scLocations
 
             #--- Items associated with the scene.
             scItems = []
-            if xmlScene.find('Items') is not None:
-                for item in xmlScene.find('Items').iter('ItemID'):
+            if 'Items' in children:
+                for item in children['Items']:
+                    if item.tag != 'ItemID':
+                        continue
+
                     itId = f"{ITEM_PREFIX}{item.text}"
-                    if itId in self.novel.tree.get_children(IT_ROOT):
+                    if itId in itIds:
                         scItems.append(itId)
             prjScn.items = scItems
 
-            ywScId = xmlScene.find('ID').text
             if ywScId in self._ywApIds:
                 # it's a plot point
                 ppId = f"{PLOT_POINT_PREFIX}{ywScId}"
@@ -1210,61 +1185,65 @@ class Yw7File(File):
                 scId = f"{SECTION_PREFIX}{ywScId}"
                 self.novel.sections[scId] = prjScn
 
-    def _strip_spaces(self, lines):
-        """Local helper method.
-
-        Positional argument:
-            lines -- list of strings
-
-        Return lines with leading and trailing spaces removed.
-        """
-        stripped = []
-        for line in lines:
-            stripped.append(line.strip())
-        return stripped
+        #--- Assign the sections collected for the plot lines at once.
+        for plId in arcSections:
+            if arcSections[plId]:
+                self.novel.plotLines[plId].sections = arcSections[plId]
 
-    def _to_yw(self, text):
-        """Convert Markdown to yWriter 7 markup.
+    def _read_tree(self, xmlText):
+        """Read the project from an xml string, using an element tree.
         
         Positional arguments:
-            text -- string to convert.
+            xmlText: str -- yw7 xml document.
         
-        Return a yw7 markup string.
+        Raise the "Error" exception in case of error. 
         """
-        if not text:
-            return ''
-
-        while '\n\n' in text:
-            text = text.replace('\n\n', '@%&').strip()
-        while '***' in text:
-            text = text.replace('***', '§%§')
-        text = re.sub(r'([^\*])\*\*(.+?)\*\*', '\\1[b]\\2[/b]', text)
-        text = re.sub(r'([^\*])\*(.+?)\*', '\\1[i]\\2[/i]', text)
-        while '§%§' in text:
-            text = text.replace('§%§', '***')
-        newlines = []
-        for line in text.split('@%&'):
-            newlines.append(line)
-        text = '\n'.join(newlines)
-        text = re.sub(r'\*\*(.+?)\*\*', '[b]\\1[/b]', text)
-        text = re.sub(r'\*([^ ].+?[^ ])\*', '[i]\\1[/i]', text)
-        MD_REPLACEMENTS = [
-            ('\n\n', '\n'),
-            ('<!---', '/*'),
-            ('--->', '*/'),
-        ]
         try:
-            for md, yw in MD_REPLACEMENTS:
-                text = text.replace(md, yw)
-        except AttributeError:
-            text = ''
-        return text
+            root = ET.fromstring(xmlText)
+        except ET.ParseError as ex:
+            raise Error(f'{_("Can not process file")} - {str(ex)}')
+
+        self._read_project(get_children(root.find('PROJECT')))
+        for xmlLocation in root.find('LOCATIONS'):
+            self._read_location(get_children(xmlLocation))
+        for xmlItem in root.find('ITEMS'):
+            self._read_item(get_children(xmlItem))
+        for xmlCharacter in root.find('CHARACTERS'):
+            self._read_character(get_children(xmlCharacter))
+        for xmlChapter in root.find('CHAPTERS'):
+            self._read_chapter(get_children(xmlChapter))
+        self._read_scenes([get_children(xmlScene) for xmlScene in root.find('SCENES')])
+        xmlProjectnotes = root.find('PROJECTNOTES')
+        if xmlProjectnotes is not None:
+            for xmlProjectnote in xmlProjectnotes:
+                self._read_project_note(get_children(xmlProjectnote))
+        xmlWclog = root.find('WCLog')
+        if xmlWclog is not None:
+            for xmlWc in xmlWclog.iterfind('WC'):
+                self._read_word_count(get_children(xmlWc))
+
+    def _read_word_count(self, children):
+        """Read a word count log entry from the children of its xml element."""
+        try:
+            self.wcLog.add(children['Date'].text, children['Count'].text, children['TotalCount'].text)
+        except (KeyError, TypeError, ValueError):
+            self.readErrors.append(_('Invalid word count log entry'))
+
+    def _get_xml_text(self, ywProject):
+        """Return the postprocessed xml text of the element tree.
+        
+        Serialize the tree with the CDATA sections and, unless in compact mode, 
+        with indentation.
+        """
+        xmlText = serialize(ywProject.tree.getroot(), cdataTags=frozenset(self._CDATA_TAGS), indentation=not self.compact)
+        return self._postprocess_xml_text(f'<?xml version="1.0" encoding="utf-8"?>\n{xmlText}')
 
     def _write_element_tree(self, ywProject):
         """Write back the xml element tree to a .yw7 xml file located at filePath.
         
         Raise the "Error" exception in case of error. 
         """
+        xmlText = self._get_xml_text(ywProject)
         backedUp = False
         if os.path.isfile(ywProject.filePath):
             try:
@@ -1274,9 +1253,9 @@ class Yw7File(File):
             else:
                 backedUp = True
         try:
-            ywProject.tree.write(ywProject.filePath, xml_declaration=False, encoding='utf-8')
+            with open_file(ywProject.filePath, 'w', encoding='utf-8') as f:
+                f.write(xmlText)
         except:
             if backedUp:
                 os.replace(f'{ywProject.filePath}.bak', ywProject.filePath)
             raise Error(f'{_("Cannot write file")}: "{norm_path(ywProject.filePath)}".')
-
@@ -0,0 +1,90 @@
+"""Helper module for converting between yw7 markup and Markdown.
+
+The functions are defined at module level, so they can be
+passed to worker processes.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import re
+
+from mdnvlib.model.section import get_word_count
+
+
+def from_yw(text):
+    """Return text, converted from yw7 markup to Markdown.
+
+    Positional arguments:
+        text -- string to convert.
+    """
+    MD_REPLACEMENTS = [
+        ('\n', '\n\n'),
+        ('[i] ', ' [i]'),
+        ('[b] ', ' [b]'),
+        ('[s] ', ' [s]'),
+        ('[i]', '*'),
+        ('[/i]', '*'),
+        ('[b]', '**'),
+        ('[/b]', '**'),
+        ('/*', '<!---'),
+        ('*/', '--->'),
+        ('  ', ' '),
+    ]
+    try:
+        for yw, md in MD_REPLACEMENTS:
+            text = text.replace(yw, md)
+        text = re.sub(r'\[\/*[h|c|r|s|u]\d*\]', '', text)
+        # Remove highlighting, alignment, and underline tags
+    except AttributeError:
+        text = ''
+    return text
+
+
+def from_yw_counting(text):
+    """Return a (Markdown text, word count) tuple for yw7 section content.
+
+    Positional arguments:
+        text -- string to convert. If None, return (None, 0).
+    """
+    if text is None:
+        return None, 0
+
+    text = from_yw(text)
+    return text, get_word_count(text)
+
+
+def to_yw(text):
+    """Return text, converted from Markdown to yWriter 7 markup.
+
+    Positional arguments:
+        text -- string to convert.
+    """
+    if not text:
+        return ''
+
+    while '\n\n' in text:
+        text = text.replace('\n\n', '@%&').strip()
+    while '***' in text:
+        text = text.replace('***', '§%§')
+    text = re.sub(r'([^\*])\*\*(.+?)\*\*', '\\1[b]\\2[/b]', text)
+    text = re.sub(r'([^\*])\*(.+?)\*', '\\1[i]\\2[/i]', text)
+    while '§%§' in text:
+        text = text.replace('§%§', '***')
+    newlines = []
+    for line in text.split('@%&'):
+        newlines.append(line)
+    text = '\n'.join(newlines)
+    text = re.sub(r'\*\*(.+?)\*\*', '[b]\\1[/b]', text)
+    text = re.sub(r'\*([^ ].+?[^ ])\*', '[i]\\1[/i]', text)
+    MD_REPLACEMENTS = [
+        ('\n\n', '\n'),
+        ('<!---', '/*'),
+        ('--->', '*/'),
+    ]
+    try:
+        for md, yw in MD_REPLACEMENTS:
+            text = text.replace(md, yw)
+    except AttributeError:
+        text = ''
+    return text
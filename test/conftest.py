@@ -0,0 +1,41 @@
+"""Make the packages in src importable for the tests, and provide shared fixtures.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from mdnov_yw7_ import Yw7Converter
+from mdnvlib.converter.ui_cmd import UiCmd
+
+
+class UiRecorder(UiCmd):
+    """Command line UI that keeps the messages instead of printing them."""
+
+    def __init__(self, title):
+        super().__init__(title)
+        self.messages = []
+
+    def ask_yes_no(self, text):
+        return True
+
+    def set_info_how(self, message):
+        self.messages.append(message)
+
+    def set_info_what(self, message):
+        self.messages.append(message)
+
+
+@pytest.fixture
+def converter(request):
+    """Provide a Yw7Converter instance with a UiRecorder as self.converter of the test class."""
+    converter = Yw7Converter()
+    converter.ui = UiRecorder('')
+    request.cls.converter = converter
+    return converter
@@ -0,0 +1,69 @@
+"""Regression tests for the character age matrix.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import unittest
+
+from mdnvlib.model.age_matrix import AgeMatrix
+from mdnvlib.model.character import Character
+from mdnvlib.model.novel import Novel
+from mdnvlib.model.nv_tree import NvTree
+from mdnvlib.model.section import Section
+
+
+def make_section(**kwargs):
+    """Return a section with the properties given as keyword arguments."""
+    section = Section(scType=0)
+    for key, value in kwargs.items():
+        setattr(section, key, value)
+    return section
+
+
+class AgeMatrixTest(unittest.TestCase):
+
+    def setUp(self):
+        self.novel = Novel(tree=NvTree())
+        self.novel.referenceDate = '2000-01-01'
+        self.novel.characters = {
+            'cr1': Character(birthDate='1980-06-15'),
+            'cr2': Character(birthDate='1950-01-01', deathDate='1990-01-01'),
+            'cr3': Character(),
+            }
+        self.novel.sections = {
+            'sc1': make_section(date='2000-06-14'),
+            'sc2': make_section(day='366'),
+            'sc3': make_section(),
+            }
+
+    def test_get_age(self):
+        ages = AgeMatrix(self.novel)
+        self.assertEqual(ages.get_age('cr1', 'sc1'), 19)
+        self.assertEqual(ages.get_age('cr1', 'sc2'), 20)
+        self.assertEqual(ages.get_age('cr2', 'sc1'), -10)
+        self.assertIsNone(ages.get_age('cr3', 'sc1'))
+        self.assertIsNone(ages.get_age('cr1', 'sc3'))
+        self.assertIsNone(ages.get_age('cr9', 'sc1'))
+
+    def test_get_character_ages(self):
+        ages = AgeMatrix(self.novel)
+        self.assertEqual(ages.get_character_ages('cr1'), {'sc1': 19, 'sc2': 20})
+        self.assertEqual(ages.get_character_ages('cr9'), {})
+
+    def test_get_section_ages(self):
+        ages = AgeMatrix(self.novel)
+        self.assertEqual(ages.get_section_ages('sc1'), {'cr1': 19, 'cr2': -10, 'cr3': None})
+        self.assertEqual(ages.get_section_ages('sc3'), {'cr1': None, 'cr2': None, 'cr3': None})
+
+    def test_days_out_of_range(self):
+        self.novel.sections['sc4'] = make_section(day='99999999')
+        self.novel.sections['sc5'] = make_section(day='-800000')
+        ages = AgeMatrix(self.novel)
+        self.assertIsNone(ages.get_age('cr1', 'sc4'))
+        self.assertIsNone(ages.get_age('cr1', 'sc5'))
+        self.assertEqual(ages.get_age('cr1', 'sc1'), 19)
+
+
+if __name__ == '__main__':
+    unittest.main()
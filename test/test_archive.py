@@ -0,0 +1,90 @@
+"""Regression tests for converting the project files inside zip archives.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import os
+import tempfile
+import unittest
+import zipfile
+
+import pytest
+
+from mdnov_yw7_ import convert_data
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+README = b'Not a project file.\n'
+
+
+def read_data_file(fileName):
+    with open(os.path.join(DATA_PATH, fileName), 'rb') as f:
+        return f.read()
+
+
+@pytest.mark.usefixtures('converter')
+class ArchiveTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tempDir = tempfile.TemporaryDirectory()
+        self.sourcePath = os.path.join(self._tempDir.name, 'projects.zip')
+        self.targetPath = os.path.join(self._tempDir.name, 'projects_converted.zip')
+
+    def tearDown(self):
+        self._tempDir.cleanup()
+
+    def write_archive(self, members):
+        with zipfile.ZipFile(self.sourcePath, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for name, data in members:
+                archive.writestr(name, data)
+
+    def test_convert_archive(self):
+        yw7Data = read_data_file('normal.yw7')
+        mdnovData = read_data_file('normal.mdnov')
+        self.write_archive((
+            ('yw7/normal.yw7', yw7Data),
+            ('mdnov/normal.mdnov', mdnovData),
+            ('readme.txt', README),
+            ))
+        self.converter.run_archive(self.sourcePath)
+        self.assertEqual(f'File written: "{self.targetPath}".', self.converter.ui.messages[-1])
+        with zipfile.ZipFile(self.targetPath) as archive:
+            self.assertEqual(
+                ['yw7/normal.mdnov', 'mdnov/normal.yw7', 'readme.txt'],
+                archive.namelist()
+                )
+            self.assertEqual(convert_data(yw7Data, '.yw7')[0], archive.read('yw7/normal.mdnov'))
+            self.assertEqual(convert_data(mdnovData, '.mdnov')[0], archive.read('mdnov/normal.yw7'))
+            self.assertEqual(README, archive.read('readme.txt'))
+
+    def test_up_to_date(self):
+        self.write_archive((('normal.yw7', read_data_file('normal.yw7')),))
+        self.converter.run_archive(self.sourcePath)
+        self.converter.run_archive(self.sourcePath)
+        self.assertTrue(self.converter.ui.messages[-1].startswith('File is up to date'))
+
+    def test_no_project(self):
+        self.write_archive((('readme.txt', README),))
+        self.converter.run_archive(self.sourcePath)
+        self.assertTrue(self.converter.ui.messages[-1].startswith('!No .yw7 or .mdnov file found'))
+        self.assertFalse(os.path.isfile(self.targetPath))
+
+    def test_bad_archive(self):
+        with open(self.sourcePath, 'wb') as f:
+            f.write(b'This is not a zip archive.')
+        self.converter.run_archive(self.sourcePath)
+        self.assertTrue(self.converter.ui.messages[-1].startswith('!Cannot convert archive'))
+        self.assertFalse(os.path.isfile(self.targetPath))
+
+    def test_bad_member(self):
+        self.write_archive((
+            ('normal.yw7', read_data_file('normal.yw7')),
+            ('broken.yw7', b'<YWRITER7><PROJECT>'),
+            ))
+        self.converter.run_archive(self.sourcePath)
+        self.assertTrue(self.converter.ui.messages[-1].startswith('!Cannot convert archive'))
+        self.assertFalse(os.path.isfile(self.targetPath))
+
+
+if __name__ == '__main__':
+    unittest.main()
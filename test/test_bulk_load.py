@@ -0,0 +1,92 @@
+"""Regression tests for loading many novel elements at once.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from mdnvlib.mdnov.mdnov_file import MdnovFile
+from mdnvlib.model.bulk_load import BulkLoad
+from mdnvlib.model.chapter import Chapter
+from mdnvlib.model.novel import Novel
+from mdnvlib.model.nv_tree import NvTree
+from mdnvlib.model.section import Section
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+class CallbackCounter:
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+
+
+class BulkLoadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.counter = CallbackCounter()
+        self.bulkLoad = BulkLoad(on_element_change=self.counter)
+
+    def test_callback_fires_once_on_commit(self):
+        chapter = self.bulkLoad.create(Chapter, title='Chapter')
+        sections = [self.bulkLoad.create(Section, title=f'Section {i}') for i in range(3)]
+        chapter.title = 'Changed'
+        for i, section in enumerate(sections):
+            section.title = f'Changed {i}'
+            section.desc = 'Description'
+            self.bulkLoad.set_section_content(section, f'<p>Content {i} words</p>')
+        self.assertEqual(0, self.counter.calls)
+        self.assertIsNone(sections[0].sectionContent)
+        self.bulkLoad.commit()
+        self.assertEqual(1, self.counter.calls)
+        self.assertEqual('<p>Content 0 words</p>', sections[0].sectionContent)
+        self.assertEqual(3, sections[0].wordCount)
+
+    def test_callback_is_assigned_on_commit(self):
+        section = self.bulkLoad.create(Section)
+        self.bulkLoad.commit()
+        section.title = 'Changed'
+        self.assertEqual(2, self.counter.calls)
+
+    def test_empty_load(self):
+        self.bulkLoad.commit()
+        self.assertEqual(0, self.counter.calls)
+
+    def test_setters_still_validate(self):
+        section = self.bulkLoad.create(Section)
+        with self.assertRaises(AssertionError):
+            section.title = 1
+
+
+class MdnovCallbackTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tempDir = tempfile.TemporaryDirectory()
+        self.filePath = os.path.join(self._tempDir.name, 'normal.mdnov')
+        shutil.copyfile(os.path.join(DATA_PATH, 'normal.mdnov'), self.filePath)
+
+    def tearDown(self):
+        self._tempDir.cleanup()
+
+    def test_read_fires_callback_once(self):
+        for snapshot in (False, True, True):
+            # The second read with snapshot is from the snapshot.
+            with self.subTest(snapshot=snapshot):
+                counter = CallbackCounter()
+                source = MdnovFile(self.filePath, snapshot=snapshot)
+                source.novel = Novel(tree=NvTree())
+                source.on_element_change = counter
+                source.read()
+                self.assertEqual(1, counter.calls)
+                self.assertIs(counter, source.novel.sections['sc1'].on_element_change)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Regression tests for reading and writing compressed project files.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import pytest
+
+from mdnvlib.file.compression import COMPRESSORS
+from mdnvlib.file.compression import get_compression
+from mdnvlib.file.compression import open_file
+from mdnvlib.file.compression import strip_compression
+from mdnvlib.mdnov.mdnov_file import MdnovFile
+from mdnvlib.model.novel import Novel
+from mdnvlib.model.nv_tree import NvTree
+from mdnvlib.novx_globals import Error
+from yw7lib.yw7_file import Yw7File
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+class CompressionHelperTest(unittest.TestCase):
+
+    def test_get_compression(self):
+        self.assertEqual('.gz', get_compression('novel.mdnov.gz'))
+        self.assertEqual('.xz', get_compression('novel.yw7.XZ'))
+        self.assertEqual('', get_compression('novel.mdnov'))
+
+    def test_strip_compression(self):
+        self.assertEqual('novel.mdnov', strip_compression('novel.mdnov.gz'))
+        self.assertEqual('novel.yw7', strip_compression('novel.yw7'))
+
+
+@pytest.mark.usefixtures('converter')
+class CompressedFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tempDir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._tempDir.cleanup()
+
+    def copy_data_file(self, fileName, directory, compression=''):
+        """Return the path to a copy of a test data file, compressed if required."""
+        os.makedirs(directory, exist_ok=True)
+        filePath = os.path.join(directory, f'{fileName}{compression}')
+        with open(os.path.join(DATA_PATH, fileName), 'rb') as source:
+            with open_file(filePath, 'wb') as target:
+                shutil.copyfileobj(source, target)
+        return filePath
+
+    def convert(self, fileName, targetName, compression):
+        """Return the target file content converted from a copy of a test data file."""
+        directory = os.path.join(self._tempDir.name, f'{fileName}{compression}')
+        self.converter.run(self.copy_data_file(fileName, directory, compression))
+        with open_file(os.path.join(directory, f'{targetName}{compression}'), 'rb') as f:
+            return f.read()
+
+    def test_convert_compressed(self):
+        for fileName, targetName in (('normal.mdnov', 'normal.yw7'), ('normal.yw7', 'normal.mdnov')):
+            expected = self.convert(fileName, targetName, '')
+            for compression in COMPRESSORS:
+                with self.subTest(fileName=fileName, compression=compression):
+                    self.assertEqual(expected, self.convert(fileName, targetName, compression))
+
+    def test_read_corrupt_file(self):
+        for fileClass, extension in ((MdnovFile, '.mdnov'), (Yw7File, '.yw7')):
+            for compression in COMPRESSORS:
+                with self.subTest(extension=extension, compression=compression):
+                    filePath = os.path.join(self._tempDir.name, f'corrupt{extension}{compression}')
+                    with open(filePath, 'wb') as f:
+                        f.write(b'This is not compressed.')
+                    source = fileClass(filePath)
+                    source.novel = Novel(tree=NvTree())
+                    with self.assertRaises(Error):
+                        source.read()
+
+    def test_read_truncated_file(self):
+        filePath = self.copy_data_file('normal.mdnov', self._tempDir.name, '.xz')
+        with open(filePath, 'rb') as f:
+            data = f.read()
+        with open(filePath, 'wb') as f:
+            f.write(data[:len(data) // 2])
+        source = MdnovFile(filePath)
+        source.novel = Novel(tree=NvTree())
+        with self.assertRaises(Error):
+            source.read()
+
+    def test_convert_corrupt_file(self):
+        filePath = os.path.join(self._tempDir.name, 'corrupt.mdnov.gz')
+        with open(filePath, 'wb') as f:
+            f.write(b'This is not compressed.')
+        self.converter.run(filePath)
+        self.assertTrue(self.converter.ui.messages[-1].startswith('!'))
+        self.assertFalse(os.path.isfile(os.path.join(self._tempDir.name, 'corrupt.yw7.gz')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+"""Regression tests for the section content conversion cache.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from mdnvlib.mdnov.mdnov_file import MdnovFile
+from mdnvlib.model.novel import Novel
+from mdnvlib.model.nv_tree import NvTree
+from yw7lib.conversion_cache import ConversionCache
+from yw7lib.yw7_file import Yw7File
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+class FailingCache:
+    """Cache whose database fails on every access, e.g. when locked or full."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.closed = False
+
+    def get(self, direction, text):
+        self._fail('get')
+        return None
+
+    def put(self, direction, text, converted, wordCount=None):
+        self._fail('put')
+
+    def close(self):
+        self.closed = True
+        self._fail('close')
+
+    def _fail(self, method):
+        if method in self.failures:
+            raise sqlite3.OperationalError('database is locked')
+
+
+class Yw7FileWithFailingCache(Yw7File):
+
+    def __init__(self, filePath, failures, **kwargs):
+        super().__init__(filePath, **kwargs)
+        self.cache = FailingCache(failures)
+
+    def _open_cache(self):
+        return self.cache
+
+
+def convert_yw7(yw7File):
+    """Return the mdnov file content converted from a Yw7File instance."""
+    yw7File.novel = Novel(tree=NvTree())
+    yw7File.read()
+    target = MdnovFile('novel.mdnov')
+    target.novel = yw7File.novel
+    target.wcLog = yw7File.wcLog
+    return target.write_data()
+
+
+class ConversionCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tempDir = tempfile.TemporaryDirectory()
+        self._cachePath = os.path.join(self._tempDir.name, ConversionCache.FILE_NAME)
+
+    def tearDown(self):
+        self._tempDir.cleanup()
+
+    def test_get_put(self):
+        cache = ConversionCache(self._cachePath)
+        self.assertIsNone(cache.get('from_yw', 'text'))
+        cache.put('from_yw', 'text', 'converted', 1)
+        self.assertEqual(tuple(cache.get('from_yw', 'text')), ('converted', 1))
+        self.assertIsNone(cache.get('to_yw', 'text'))
+        cache.close()
+        cache = ConversionCache(self._cachePath)
+        self.assertEqual(tuple(cache.get('from_yw', 'text')), ('converted', 1))
+        cache.close()
+
+    def test_evict_by_bytes(self):
+        # Ten characters, but twenty bytes in UTF-8.
+        cache = ConversionCache(self._cachePath, maxSize=30)
+        cache.put('to_yw', 'a', 'ääääääääää')
+        cache.put('to_yw', 'b', 'öööööööööö')
+        cache.close()
+        cache = ConversionCache(self._cachePath, maxSize=30)
+        cached = [cache.get('to_yw', text) for text in ('a', 'b')]
+        cache.close()
+        self.assertEqual(len([row for row in cached if row is not None]), 1)
+
+
+
+class UnusableCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tempDir = tempfile.TemporaryDirectory()
+        self.filePath = os.path.join(self._tempDir.name, 'normal.yw7')
+        shutil.copyfile(os.path.join(DATA_PATH, 'normal.yw7'), self.filePath)
+        self.expected = convert_yw7(Yw7File(self.filePath))
+
+    def tearDown(self):
+        self._tempDir.cleanup()
+
+    def test_failing_cache(self):
+        for failures in (('get',), ('put',), ('close',), ('get', 'put', 'close')):
+            with self.subTest(failures=failures):
+                yw7File = Yw7FileWithFailingCache(self.filePath, failures, cache=True)
+                self.assertEqual(self.expected, convert_yw7(yw7File))
+                self.assertTrue(yw7File.cache.closed)
+
+    def test_corrupt_cache_file(self):
+        with open(os.path.join(self._tempDir.name, ConversionCache.FILE_NAME), 'wb') as f:
+            f.write(b'This is not a database.' * 100)
+        self.assertEqual(self.expected, convert_yw7(Yw7File(self.filePath, cache=True)))
+
+
+if __name__ == '__main__':
+    unittest.main()
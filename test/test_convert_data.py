@@ -0,0 +1,100 @@
+"""Regression tests for the in-memory conversion and the stdin/stdout mode.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from mdnov_yw7_ import convert_data
+from mdnvlib.novx_globals import Error
+
+TEST_PATH = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(TEST_PATH, 'data')
+SCRIPT_PATH = os.path.join(os.path.dirname(TEST_PATH), 'src', 'mdnov_yw7_.py')
+
+
+def read_data_file(fileName):
+    with open(os.path.join(DATA_PATH, fileName), 'rb') as f:
+        return f.read()
+
+
+class ConvertDataTest(unittest.TestCase):
+
+    def test_bytes(self):
+        for fileName, sourceFormat in (('normal.yw7', '.yw7'), ('normal.mdnov', '.mdnov')):
+            with self.subTest(fileName=fileName):
+                targetData, readErrors = convert_data(read_data_file(fileName), sourceFormat)
+                self.assertIsInstance(targetData, bytes)
+                self.assertEqual([], readErrors)
+
+    def test_str(self):
+        for fileName, sourceFormat in (('normal.yw7', '.yw7'), ('normal.mdnov', '.mdnov')):
+            with self.subTest(fileName=fileName):
+                data = read_data_file(fileName)
+                targetData, __ = convert_data(data.decode('utf-8'), sourceFormat)
+                self.assertIsInstance(targetData, str)
+                self.assertEqual(convert_data(data, sourceFormat)[0].decode('utf-8'), targetData)
+
+    def test_line_breaks(self):
+        data = read_data_file('normal.mdnov')
+        self.assertIn(b'\r\n', data)
+        self.assertEqual(
+            convert_data(data, '.mdnov')[0],
+            convert_data(data.replace(b'\r\n', b'\n'), '.mdnov')[0]
+            )
+
+    def test_unsupported_format(self):
+        with self.assertRaises(Error):
+            convert_data(read_data_file('normal.yw7'), '.novx')
+
+    def test_invalid_data(self):
+        with self.assertRaises(Error):
+            convert_data(b'\xff\xfe', '.mdnov')
+        with self.assertRaises(Error):
+            convert_data(b'<YWRITER7><PROJECT>', '.yw7')
+
+
+class StdinModeTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tempDir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._tempDir.cleanup()
+
+    def run_script(self, data, *args):
+        return subprocess.run(
+            [sys.executable, SCRIPT_PATH, *args],
+            input=data,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=self._tempDir.name,
+            )
+
+    def test_convert_stdin(self):
+        data = read_data_file('normal.yw7')
+        result = self.run_script(data, '--from', 'yw7', '-')
+        self.assertEqual(0, result.returncode)
+        self.assertEqual(convert_data(data, '.yw7')[0], result.stdout)
+        self.assertEqual([], os.listdir(self._tempDir.name))
+
+    def test_missing_format(self):
+        result = self.run_script(read_data_file('normal.yw7'), '-')
+        self.assertNotEqual(0, result.returncode)
+        self.assertEqual(b'', result.stdout)
+        self.assertIn(b'FAIL', result.stderr)
+
+    def test_invalid_data(self):
+        result = self.run_script(b'<YWRITER7><PROJECT>', '--from', 'yw7', '-')
+        self.assertNotEqual(0, result.returncode)
+        self.assertEqual(b'', result.stdout)
+        self.assertIn(b'FAIL', result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
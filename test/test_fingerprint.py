@@ -0,0 +1,152 @@
+"""Regression tests for skipping conversions of unchanged files.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pytest
+
+from mdnvlib.converter.fingerprint import get_fingerprint_path
+from mdnvlib.converter.fingerprint import is_up_to_date
+from mdnvlib.converter.fingerprint import save_fingerprint
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SETTINGS = '1.0'
+
+
+def append_to_file(filePath, data):
+    with open(filePath, 'ab') as f:
+        f.write(data)
+
+
+class FingerprintTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tempDir = tempfile.TemporaryDirectory()
+        self.sourcePath = os.path.join(self._tempDir.name, 'source.txt')
+        self.targetPath = os.path.join(self._tempDir.name, 'target.txt')
+        with open(self.sourcePath, 'wb') as f:
+            f.write(b'source')
+        with open(self.targetPath, 'wb') as f:
+            f.write(b'target')
+        save_fingerprint(self.sourcePath, self.targetPath, SETTINGS)
+
+    def tearDown(self):
+        self._tempDir.cleanup()
+
+    def test_unchanged(self):
+        self.assertTrue(is_up_to_date(self.sourcePath, self.targetPath, SETTINGS))
+
+    def test_modified_source(self):
+        append_to_file(self.sourcePath, b'!')
+        self.assertFalse(is_up_to_date(self.sourcePath, self.targetPath, SETTINGS))
+
+    def test_source_modified_in_place(self):
+        # Same size, other content.
+        with open(self.sourcePath, 'wb') as f:
+            f.write(b'SOURCE')
+        self.assertFalse(is_up_to_date(self.sourcePath, self.targetPath, SETTINGS))
+
+    def test_modified_target(self):
+        append_to_file(self.targetPath, b'!')
+        self.assertFalse(is_up_to_date(self.sourcePath, self.targetPath, SETTINGS))
+
+    def test_touched_target(self):
+        targetStat = os.stat(self.targetPath)
+        os.utime(self.targetPath, (targetStat.st_atime, targetStat.st_mtime + 10))
+        self.assertFalse(is_up_to_date(self.sourcePath, self.targetPath, SETTINGS))
+
+    def test_changed_settings(self):
+        self.assertFalse(is_up_to_date(self.sourcePath, self.targetPath, '1.1'))
+
+    def test_missing_files(self):
+        for filePath in (get_fingerprint_path(self.targetPath), self.targetPath, self.sourcePath):
+            with self.subTest(filePath=filePath):
+                os.remove(filePath)
+                self.assertFalse(is_up_to_date(self.sourcePath, self.targetPath, SETTINGS))
+
+    def test_corrupt_fingerprint(self):
+        for data in (b'', b'{"settings": ', b'[]', b'{}', b'{"settings": "1.0"}', b'\xff\xfe'):
+            with self.subTest(data=data):
+                with open(get_fingerprint_path(self.targetPath), 'wb') as f:
+                    f.write(data)
+                self.assertFalse(is_up_to_date(self.sourcePath, self.targetPath, SETTINGS))
+
+
+@pytest.mark.usefixtures('converter')
+class SkipConversionTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tempDir = tempfile.TemporaryDirectory()
+        self.sourcePath = os.path.join(self._tempDir.name, 'normal.yw7')
+        self.targetPath = os.path.join(self._tempDir.name, 'normal.mdnov')
+        shutil.copyfile(os.path.join(DATA_PATH, 'normal.yw7'), self.sourcePath)
+        self.converter.run(self.sourcePath)
+
+    def tearDown(self):
+        self._tempDir.cleanup()
+
+    def assert_skipped(self, **kwargs):
+        self.converter.run(self.sourcePath, **kwargs)
+        self.assertTrue(self.converter.ui.messages[-1].startswith('File is up to date'))
+
+    def assert_converted(self, **kwargs):
+        self.converter.run(self.sourcePath, **kwargs)
+        self.assertTrue(self.converter.ui.messages[-1].startswith('File written'))
+
+    def test_unchanged(self):
+        self.assert_skipped()
+
+    def test_modified_source(self):
+        with open(self.sourcePath, 'rb') as f:
+            data = f.read()
+        with open(self.sourcePath, 'wb') as f:
+            f.write(data.replace(b'Meet Hal', b'Meet Jock'))
+        self.assert_converted()
+        with open(self.targetPath, 'rb') as f:
+            self.assertIn(b'Meet Jock', f.read())
+        self.assert_skipped()
+
+    def test_modified_target(self):
+        append_to_file(self.targetPath, b'\n')
+        self.assert_converted()
+        self.assert_skipped()
+
+    def test_changed_version(self):
+        with mock.patch('mdnov_yw7_.CONVERTER_VERSION', 'other version'):
+            self.assert_converted()
+            self.assert_skipped()
+
+    def test_changed_compact_option(self):
+        yw7Path = os.path.join(self._tempDir.name, 'normal.yw7')
+        self.sourcePath = self.targetPath
+        os.remove(yw7Path)
+        self.assert_converted()
+        self.assert_skipped()
+        self.assert_converted(compact=True)
+        self.assert_skipped(compact=True)
+        self.assert_converted()
+
+    def test_force(self):
+        self.assert_converted(force=True)
+
+    def test_corrupt_fingerprint(self):
+        with open(get_fingerprint_path(self.targetPath), 'wb') as f:
+            f.write(b'{"settings": ')
+        self.assert_converted()
+        self.assert_skipped()
+
+    def test_missing_fingerprint(self):
+        os.remove(get_fingerprint_path(self.targetPath))
+        self.assert_converted()
+        self.assert_skipped()
+
+
+if __name__ == '__main__':
+    unittest.main()
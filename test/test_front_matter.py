@@ -0,0 +1,59 @@
+"""Regression tests for the front matter parser.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import unittest
+
+from mdnvlib.model.front_matter import parse_front_matter
+
+
+class FrontMatterTest(unittest.TestCase):
+
+    def test_parse(self):
+        record = parse_front_matter([
+            'Title: A: B',
+            '  type :  1  ',
+            'no entry',
+            'Empty:',
+            ])
+        self.assertEqual(record, {'Title': 'A: B', 'type': '1', 'Empty': ''})
+        self.assertEqual(record.errors, [])
+
+    def test_valid_values(self):
+        record = parse_front_matter([
+            'Date: 2024-02-29',
+            'Time: 12:30',
+            'Day: -3',
+            'Characters: cr1;cr2',
+            ])
+        self.assertEqual(record.get_date('Date'), '2024-02-29')
+        self.assertEqual(record.get_time('Time'), '12:30:00')
+        self.assertEqual(record.get_int_string('Day'), '-3')
+        self.assertEqual(record.get_list('Characters'), ['cr1', 'cr2'])
+        self.assertEqual(record.errors, [])
+
+    def test_missing_values(self):
+        record = parse_front_matter([])
+        self.assertIsNone(record.get_date('Date'))
+        self.assertIsNone(record.get_time('Time'))
+        self.assertIsNone(record.get_int_string('Day'))
+        self.assertEqual(record.get_list('Characters'), [])
+        self.assertEqual(record.errors, [])
+
+    def test_invalid_values(self):
+        record = parse_front_matter([
+            'Date: 2023-02-29',
+            'Time: 25:00',
+            'Day: one',
+            ])
+        self.assertIsNone(record.get_date('Date'))
+        self.assertIsNone(record.get_time('Time'))
+        self.assertIsNone(record.get_int_string('Day'))
+        self.assertEqual(len(record.errors), 3)
+        self.assertIn('2023-02-29', record.errors[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+"""Regression tests for the ID allocation.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import unittest
+
+from mdnvlib.model.id_generator import IdAllocator
+from mdnvlib.model.id_generator import create_id
+
+
+class IdAllocatorTest(unittest.TestCase):
+
+    def test_new_id_empty(self):
+        allocator = IdAllocator([])
+        self.assertEqual(allocator.new_id('sc'), 'sc1')
+        self.assertEqual(allocator.new_id('sc'), 'sc2')
+        self.assertEqual(allocator.new_id('ch'), 'ch1')
+
+    def test_new_ids_above_high_water_mark(self):
+        allocator = IdAllocator({'sc1': None, 'sc7': None, 'ch3': None})
+        self.assertEqual(allocator.new_ids('sc', 3), ['sc8', 'sc9', 'sc10'])
+        self.assertEqual(allocator.new_id('ch'), 'ch4')
+
+    def test_add(self):
+        elements = ['sc1']
+        allocator = IdAllocator(elements)
+        self.assertEqual(allocator.new_id('sc'), 'sc2')
+        elements.append('sc20')
+        allocator.add('sc20')
+        self.assertEqual(allocator.new_id('sc'), 'sc21')
+
+    def test_foreign_ids_are_ignored(self):
+        allocator = IdAllocator(['sc', 'scx', 'sc²', 'sc-4', 'ch9', 'sc2'])
+        self.assertEqual(allocator.new_id('sc'), 'sc3')
+
+    def test_new_ids_are_unused(self):
+        elements = ['sc1', 'sc3']
+        self.assertNotIn(IdAllocator(elements).new_id('sc'), elements)
+        self.assertNotIn(create_id(elements, 'sc'), elements)
+
+
+if __name__ == '__main__':
+    unittest.main()
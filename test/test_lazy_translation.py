@@ -0,0 +1,55 @@
+"""Regression tests for loading the translations on first use.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import os
+import subprocess
+import sys
+import unittest
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+
+def run_script(script):
+    """Run a Python script in a fresh interpreter and return its output."""
+    env = os.environ.copy()
+    env.pop('MDNVLIB_HEADLESS', None)
+    env['PYTHONPATH'] = SRC_PATH
+    return subprocess.run(
+        [sys.executable, '-c', script],
+        env=env,
+        stdout=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+        ).stdout.strip()
+
+
+class LazyTranslationTest(unittest.TestCase):
+
+    def test_import_does_not_load_translations(self):
+        output = run_script(
+            'import mdnov_yw7_\n'
+            'import mdnvlib.model.character\n'
+            'import mdnvlib.model.section\n'
+            'import mdnvlib.novx_globals as g\n'
+            'print(g._translate is None, g._localeIsSet)\n'
+            )
+        self.assertEqual(output, 'True False')
+
+    def test_set_headless_after_import(self):
+        output = run_script(
+            'from mdnvlib.model.character import Character\n'
+            'from mdnvlib.model.section import Section\n'
+            'from yw7lib.yw7_file import Yw7File\n'
+            'import mdnvlib.novx_globals as g\n'
+            'g.set_headless()\n'
+            'print(Character.MAJOR_MARKER, Section.STATUS[5], Yw7File.DESCRIPTION, sep="|")\n'
+            'print(g._translate is str)\n'
+            )
+        self.assertEqual(output, 'Major Character|Done|yWriter 7 project\nTrue')
+
+
+if __name__ == '__main__':
+    unittest.main()
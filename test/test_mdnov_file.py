@@ -0,0 +1,86 @@
+"""Regression tests for reading mdnov files.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import unittest
+
+from mdnvlib.mdnov.mdnov_file import MdnovFile
+from mdnvlib.model.novel import Novel
+from mdnvlib.model.nv_tree import NvTree
+
+PLOT_LINE_NOTES = '''@@book
+
+---
+Title: Test
+---
+
+%%
+
+@@ac1
+
+---
+Title: Main plot
+ShortName: A
+Sections: sc1
+---
+
+%%
+
+@@ch1
+
+---
+Title: Chapter
+---
+
+%%
+
+@@sc1
+
+---
+Title: Section
+---
+
+%%Plotline:
+
+ac1
+
+%%Plotline note:
+
+Valid note
+
+%%Plotline:
+
+ac1
+
+%%Content:
+
+Section content
+
+%%Plotline note:
+
+Dangling note
+
+%%
+'''
+
+
+def read_mdnov(text):
+    """Return the MdnovFile instance after reading text."""
+    source = MdnovFile('novel.mdnov')
+    source.novel = Novel(tree=NvTree())
+    source.read_data(text)
+    return source
+
+
+class MdnovFileTest(unittest.TestCase):
+
+    def test_plot_line_notes(self):
+        section = read_mdnov(PLOT_LINE_NOTES).novel.sections['sc1']
+        self.assertEqual(section.sectionContent, 'Section content\n')
+        self.assertEqual(section.plotlineNotes, {'ac1': 'Valid note'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""Regression tests for the snapshots of parsed mdnov files.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from mdnvlib.mdnov.mdnov_file import MdnovFile
+from mdnvlib.mdnov.mdnov_snapshot import _HEADER
+from mdnvlib.mdnov.mdnov_snapshot import get_snapshot_path
+from mdnvlib.model.novel import Novel
+from mdnvlib.model.nv_tree import NvTree
+from mdnvlib.novx_globals import CH_ROOT
+from yw7lib.yw7_file import Yw7File
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def read_mdnov(filePath):
+    """Return the MdnovFile instance after reading filePath, using a snapshot."""
+    source = MdnovFile(filePath, snapshot=True)
+    source.novel = Novel(tree=NvTree())
+    source.read()
+    return source
+
+
+def to_yw7(source):
+    """Return the yw7 file content converted from a read MdnovFile instance."""
+    target = Yw7File('novel.yw7')
+    target.novel = source.novel
+    target.wcLog = source.wcLog
+    return target.write_data()
+
+
+class Payload:
+    """Object that creates a directory when being unpickled."""
+
+    def __init__(self, dirPath):
+        self.dirPath = dirPath
+
+    def __reduce__(self):
+        return (os.mkdir, (self.dirPath,))
+
+
+class MdnovSnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tempDir = tempfile.TemporaryDirectory()
+        self.filePath = os.path.join(self._tempDir.name, 'normal.mdnov')
+        shutil.copyfile(os.path.join(DATA_PATH, 'normal.mdnov'), self.filePath)
+
+    def tearDown(self):
+        self._tempDir.cleanup()
+
+    def test_reload_from_snapshot(self):
+        parsed = read_mdnov(self.filePath)
+        snapshotPath = get_snapshot_path(self.filePath)
+        self.assertTrue(os.path.isfile(snapshotPath))
+        with open(snapshotPath, 'rb') as f:
+            f.seek(_HEADER.size)
+            self.assertEqual(f.read(1), b'{')
+        reloaded = read_mdnov(self.filePath)
+        self.assertEqual(list(parsed.novel.sections), list(reloaded.novel.sections))
+        self.assertEqual(parsed.novel.tree.get_children(CH_ROOT), reloaded.novel.tree.get_children(CH_ROOT))
+        self.assertEqual(list(parsed.wcLog), list(reloaded.wcLog))
+        self.assertEqual(to_yw7(parsed), to_yw7(reloaded))
+
+    def test_reload_into_held_novel(self):
+        parsed = read_mdnov(self.filePath)
+        tree = NvTree()
+        novel = Novel(tree=tree)
+        source = MdnovFile(self.filePath, snapshot=True)
+        source.novel = novel
+        source.read()
+        self.assertIs(novel, source.novel)
+        self.assertIs(tree, novel.tree)
+        self.assertEqual(len(parsed.novel.sections), len(novel.sections))
+        self.assertEqual(parsed.novel.title, novel.title)
+        self.assertEqual(parsed.novel.tree.get_children(CH_ROOT), tree.get_children(CH_ROOT))
+        self.assertEqual(to_yw7(parsed), to_yw7(source))
+
+    def test_stale_snapshot(self):
+        read_mdnov(self.filePath)
+        with open(self.filePath, 'a', encoding='utf-8') as f:
+            f.write('\n@@ch999\n\n---\nTitle: Appended\n---\n\n%%\n')
+        self.assertIn('ch999', read_mdnov(self.filePath).novel.chapters)
+
+    def test_pickled_snapshot_is_not_loaded(self):
+        executedPath = os.path.join(self._tempDir.name, 'executed')
+        read_mdnov(self.filePath)
+        snapshotPath = get_snapshot_path(self.filePath)
+        with open(snapshotPath, 'rb') as f:
+            header = f.read(_HEADER.size)
+        with open(snapshotPath, 'wb') as f:
+            f.write(header)
+            f.write(pickle.dumps(Payload(executedPath), protocol=4))
+        source = read_mdnov(self.filePath)
+        self.assertFalse(os.path.exists(executedPath))
+        self.assertTrue(source.novel.sections)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Regression tests for the bulk conversion between section dates and days.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import unittest
+
+from mdnvlib.model.novel import Novel
+from mdnvlib.model.nv_tree import NvTree
+from mdnvlib.model.section import Section
+
+REFERENCE_DATE = '2024-03-01'
+
+
+def make_section(**kwargs):
+    """Return a section with the properties given as keyword arguments."""
+    section = Section(scType=0)
+    for key, value in kwargs.items():
+        setattr(section, key, value)
+    return section
+
+
+class NovelDatesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.novel = Novel(tree=NvTree())
+        self.novel.referenceDate = REFERENCE_DATE
+
+    def test_round_trip(self):
+        self.novel.sections = {
+            'sc1': make_section(date='2024-03-01'),
+            'sc2': make_section(date='2024-02-28'),
+            'sc3': make_section(date='2025-03-01'),
+            'sc4': make_section(date='2024-02-28'),
+            'sc5': make_section(),
+            }
+        self.assertEqual([], self.novel.convert_dates_to_days())
+        self.assertEqual(
+            ['0', '-2', '365', '-2', None],
+            [section.day for section in self.novel.sections.values()]
+            )
+        self.assertTrue(all(section.date is None for section in self.novel.sections.values()))
+        self.assertEqual([], self.novel.convert_days_to_dates())
+        self.assertEqual(
+            ['2024-03-01', '2024-02-28', '2025-03-01', '2024-02-28', None],
+            [section.date for section in self.novel.sections.values()]
+            )
+        self.assertTrue(all(section.day is None for section in self.novel.sections.values()))
+
+    def test_sections_with_both_are_skipped(self):
+        self.novel.sections = {'sc1': make_section(date='2024-03-05', day='1')}
+        self.assertEqual([], self.novel.convert_dates_to_days())
+        self.assertEqual([], self.novel.convert_days_to_dates())
+        self.assertEqual(('2024-03-05', '1'), (self.novel.sections['sc1'].date, self.novel.sections['sc1'].day))
+
+    def test_days_out_of_range(self):
+        self.novel.sections = {
+            'sc1': make_section(day='1'),
+            'sc2': make_section(day='4000000'),
+            'sc3': make_section(day='-800000'),
+            'sc4': make_section(day='one'),
+            'sc5': make_section(day='4000000'),
+            }
+        self.assertEqual(['sc2', 'sc3', 'sc4', 'sc5'], self.novel.convert_days_to_dates())
+        self.assertEqual('2024-03-02', self.novel.sections['sc1'].date)
+        for scId in ('sc2', 'sc3', 'sc4', 'sc5'):
+            self.assertIsNone(self.novel.sections[scId].date)
+        self.assertEqual('4000000', self.novel.sections['sc2'].day)
+
+    def test_invalid_dates(self):
+        self.novel.sections = {
+            'sc1': make_section(date='0001-01-01'),
+            'sc2': make_section(),
+            }
+        self.novel.sections['sc2']._date = '2024-02-30'
+        self.assertEqual(['sc2'], self.novel.convert_dates_to_days())
+        self.assertEqual(str(1 - self.novel._get_reference_day()), self.novel.sections['sc1'].day)
+        self.assertEqual('2024-02-30', self.novel.sections['sc2'].date)
+        self.assertIsNone(self.novel.sections['sc2'].day)
+
+    def test_missing_reference_date(self):
+        self.novel.referenceDate = None
+        self.novel.sections = {
+            'sc1': make_section(date='2024-03-01'),
+            'sc2': make_section(day='1'),
+            }
+        with self.assertRaises(ValueError):
+            self.novel.convert_dates_to_days()
+        with self.assertRaises(ValueError):
+            self.novel.convert_days_to_dates()
+        self.assertEqual('2024-03-01', self.novel.sections['sc1'].date)
+        self.assertEqual('1', self.novel.sections['sc2'].day)
+
+    def test_invalid_reference_date(self):
+        self.novel._referenceDate = '2024-13-01'
+        self.novel.sections = {'sc1': make_section(date='2024-03-01')}
+        with self.assertRaises(ValueError):
+            self.novel.convert_dates_to_days()
+        self.assertEqual('2024-03-01', self.novel.sections['sc1'].date)
+
+
+if __name__ == '__main__':
+    unittest.main()
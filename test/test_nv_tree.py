@@ -0,0 +1,69 @@
+"""Regression tests for the project tree navigation and reordering.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import unittest
+
+from mdnvlib.model.nv_tree import NvTree
+from mdnvlib.novx_globals import CH_ROOT
+
+
+class NvTreeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = NvTree()
+        for chId in ('ch1', 'ch2'):
+            self.tree.append(CH_ROOT, chId)
+        for scId in ('sc1', 'sc2', 'sc3'):
+            self.tree.append('ch1', scId)
+
+    def test_navigation(self):
+        self.assertEqual(self.tree.parent('sc2'), 'ch1')
+        self.assertEqual(self.tree.parent('ch1'), CH_ROOT)
+        self.assertEqual(self.tree.index('sc3'), 2)
+        self.assertEqual(self.tree.next('sc1'), 'sc2')
+        self.assertEqual(self.tree.next('sc3'), '')
+        self.assertEqual(self.tree.prev('sc2'), 'sc1')
+        self.assertEqual(self.tree.prev('sc1'), '')
+
+    def test_unknown_item(self):
+        self.assertEqual(self.tree.parent('sc9'), '')
+        self.assertEqual(self.tree.next('sc9'), '')
+        self.assertEqual(self.tree.prev('sc9'), '')
+        with self.assertRaises(KeyError):
+            self.tree.index('sc9')
+
+    def test_move_within_parent(self):
+        self.tree.move('sc3', 'ch1', 0)
+        self.assertEqual(self.tree.get_children('ch1'), ['sc3', 'sc1', 'sc2'])
+        self.assertEqual(self.tree.index('sc1'), 1)
+        self.assertEqual(self.tree.next('sc3'), 'sc1')
+
+    def test_move_to_other_parent(self):
+        self.tree.move('sc1', 'ch2', 99)
+        self.tree.move('sc2', 'ch2', -1)
+        self.assertEqual(self.tree.get_children('ch1'), ['sc3'])
+        self.assertEqual(self.tree.get_children('ch2'), ['sc2', 'sc1'])
+        self.assertEqual(self.tree.parent('sc1'), 'ch2')
+        self.assertEqual(self.tree.index('sc3'), 0)
+        self.assertEqual(self.tree.index('sc1'), 1)
+
+    def test_move_under_descendant(self):
+        with self.assertRaises(ValueError):
+            self.tree.move('ch1', 'ch1', 0)
+
+    def test_delete(self):
+        self.tree.delete('sc2')
+        self.assertEqual(self.tree.get_children('ch1'), ['sc1', 'sc3'])
+        self.assertEqual(self.tree.index('sc3'), 1)
+        with self.assertRaises(KeyError):
+            self.tree.index('sc2')
+        self.tree.delete('ch1')
+        self.assertEqual(self.tree.parent('sc1'), '')
+        self.assertEqual(self.tree.get_children(CH_ROOT), ['ch2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""Regression tests for the synchronization of the SQLite project store.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from mdnvlib.db.project_store import ProjectStore
+from mdnvlib.db.project_store import get_project_key
+from mdnvlib.mdnov.mdnov_file import MdnovFile
+from mdnvlib.model.novel import Novel
+from mdnvlib.model.nv_tree import NvTree
+from mdnvlib.novx_globals import CH_ROOT
+from mdnvlib.novx_globals import Error
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SECTION_ID = 'sc1'
+SECTION_TITLE = 'Meet Hal, threatened by Vurdi'
+
+
+def read_mdnov(filePath):
+    """Return the novel read from filePath."""
+    source = MdnovFile(filePath)
+    source.novel = Novel(tree=NvTree())
+    source.read()
+    return source.novel
+
+
+class ProjectStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tempDir = tempfile.TemporaryDirectory()
+        self.filePath = os.path.join(self._tempDir.name, 'normal.mdnov')
+        shutil.copyfile(os.path.join(DATA_PATH, 'normal.mdnov'), self.filePath)
+        self.store = ProjectStore(os.path.join(self._tempDir.name, 'projects.db'))
+
+    def tearDown(self):
+        self.store.close()
+        self._tempDir.cleanup()
+
+    def edit_file(self, newTitle):
+        """Change the section title in the mdnov file, like an external editor."""
+        with open(self.filePath, 'rb') as f:
+            data = f.read()
+        with open(self.filePath, 'wb') as f:
+            f.write(data.replace(SECTION_TITLE.encode('utf-8'), newTitle.encode('utf-8')))
+
+    def edit_database(self, newTitle):
+        section = self.store.get_element(self.filePath, SECTION_ID)
+        section.title = newTitle
+        self.store.set_element(self.filePath, SECTION_ID, section)
+
+    def test_import(self):
+        novel = read_mdnov(self.filePath)
+        self.assertGreater(self.store.import_file(self.filePath), len(novel.sections))
+        self.assertEqual(novel.tree.get_children(CH_ROOT), self.store.get_children(self.filePath, CH_ROOT))
+        self.assertEqual(SECTION_TITLE, self.store.get_element(self.filePath, SECTION_ID).title)
+
+    def test_reimport_unchanged_file(self):
+        self.store.import_file(self.filePath)
+        self.assertEqual(0, self.store.import_file(self.filePath))
+
+    def test_reimport_changed_file(self):
+        self.store.import_file(self.filePath)
+        self.edit_file('Edited externally')
+        self.assertEqual(1, self.store.import_file(self.filePath))
+        self.assertEqual('Edited externally', self.store.get_element(self.filePath, SECTION_ID).title)
+
+    def test_export_unchanged(self):
+        self.store.import_file(self.filePath)
+        self.assertFalse(self.store.export_file(self.filePath))
+
+    def test_export_database_edit(self):
+        self.store.import_file(self.filePath)
+        self.edit_database('Edited in the database')
+        self.assertTrue(self.store.export_file(self.filePath))
+        self.assertEqual('Edited in the database', read_mdnov(self.filePath).sections[SECTION_ID].title)
+        self.assertFalse(self.store.export_file(self.filePath))
+        self.assertEqual(0, self.store.import_file(self.filePath))
+
+    def test_export_after_external_edit(self):
+        self.store.import_file(self.filePath)
+        self.edit_file('Edited externally')
+        self.assertFalse(self.store.export_file(self.filePath))
+        self.assertEqual('Edited externally', read_mdnov(self.filePath).sections[SECTION_ID].title)
+        self.assertEqual('Edited externally', self.store.get_element(self.filePath, SECTION_ID).title)
+
+    def test_import_keeps_database_edit(self):
+        self.store.import_file(self.filePath)
+        self.edit_database('Edited in the database')
+        self.assertEqual(0, self.store.import_file(self.filePath))
+        self.assertEqual('Edited in the database', self.store.get_element(self.filePath, SECTION_ID).title)
+
+    def test_conflict(self):
+        self.store.import_file(self.filePath)
+        self.edit_database('Edited in the database')
+        self.edit_file('Edited externally')
+        with self.assertRaises(Error):
+            self.store.export_file(self.filePath)
+        with self.assertRaises(Error):
+            self.store.import_file(self.filePath)
+        self.assertEqual('Edited externally', read_mdnov(self.filePath).sections[SECTION_ID].title)
+        self.assertEqual('Edited in the database', self.store.get_element(self.filePath, SECTION_ID).title)
+
+    def test_paths_of_the_same_file(self):
+        self.store.import_file(self.filePath)
+        linkPath = os.path.join(self._tempDir.name, 'link.mdnov')
+        os.symlink(self.filePath, linkPath)
+        os.mkdir(os.path.join(self._tempDir.name, 'sub'))
+        otherPaths = (
+            os.path.join(self._tempDir.name, '.', 'normal.mdnov'),
+            os.path.join(self._tempDir.name, 'sub', '..', 'normal.mdnov'),
+            os.path.relpath(self.filePath),
+            linkPath,
+            )
+        for filePath in otherPaths:
+            with self.subTest(filePath=filePath):
+                self.assertEqual(0, self.store.import_file(filePath))
+                self.assertEqual(SECTION_TITLE, self.store.get_element(filePath, SECTION_ID).title)
+        self.assertEqual(
+            [(get_project_key(self.filePath), SECTION_ID)],
+            self.store.find_references('lc2', linkPath)[:1]
+            )
+
+    def test_conflict_across_paths(self):
+        self.store.import_file(self.filePath)
+        linkPath = os.path.join(self._tempDir.name, 'link.mdnov')
+        os.symlink(self.filePath, linkPath)
+        self.edit_database('Edited in the database')
+        self.edit_file('Edited externally')
+        with self.assertRaises(Error):
+            self.store.export_file(linkPath)
+        with self.assertRaises(Error):
+            self.store.import_file(linkPath)
+
+
+if __name__ == '__main__':
+    unittest.main()
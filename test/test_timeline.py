@@ -0,0 +1,77 @@
+"""Regression tests for the chronological section index.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import unittest
+
+from mdnvlib.model.novel import Novel
+from mdnvlib.model.nv_tree import NvTree
+from mdnvlib.model.section import Section
+from mdnvlib.model.timeline import Timeline
+
+
+def make_section(scType=0, **kwargs):
+    """Return a section with the properties given as keyword arguments."""
+    section = Section(scType=scType)
+    for key, value in kwargs.items():
+        setattr(section, key, value)
+    return section
+
+
+class TimelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.novel = Novel(tree=NvTree())
+        self.novel.referenceDate = '2024-03-01'
+        self.novel.sections = {
+            'sc1': make_section(date='2024-03-01', time='08:00', lastsHours='2'),
+            'sc2': make_section(date='2024-03-01', time='09:00', lastsHours='2'),
+            'sc3': make_section(day='2', time='12:00', lastsMinutes='30'),
+            'sc4': make_section(date='2024-02-28', lastsDays='1'),
+            'sc5': make_section(),
+            'sc6': make_section(scType=1, date='2024-03-01'),
+            }
+
+    def test_chronological(self):
+        timeline = Timeline(self.novel)
+        self.assertEqual(timeline.get_chronological(), ['sc4', 'sc1', 'sc2', 'sc3'])
+        self.assertEqual(timeline.unresolved, ['sc5'])
+
+    def test_span(self):
+        timeline = Timeline(self.novel)
+        self.assertEqual(timeline.get_span('sc3'), ('2024-03-03T12:00:00', '2024-03-03T12:30:00'))
+        self.assertIsNone(timeline.get_span('sc5'))
+
+    def test_overlapping(self):
+        timeline = Timeline(self.novel)
+        self.assertEqual(timeline.get_overlapping('2024-03-01T09:30', '2024-03-01T09:45'), ['sc1', 'sc2'])
+        self.assertEqual(timeline.get_overlapping('2024-03-02', '2024-03-02T23:59'), [])
+        self.assertEqual(timeline.get_overlapping('2024-01-01', '2024-12-31'), ['sc4', 'sc1', 'sc2', 'sc3'])
+
+    def test_gaps(self):
+        timeline = Timeline(self.novel)
+        self.assertEqual(timeline.get_gaps(), [
+            ('2024-02-29T00:00:00', '2024-03-01T08:00:00'),
+            ('2024-03-01T11:00:00', '2024-03-03T12:00:00'),
+            ])
+        self.assertEqual(timeline.get_gaps(startIso='2024-03-02'), [
+            ('2024-03-01T11:00:00', '2024-03-03T12:00:00'),
+            ])
+
+    def test_days_out_of_range(self):
+        self.novel.sections['sc7'] = make_section(day='99999999')
+        self.novel.sections['sc8'] = make_section(day='-800000')
+        self.novel.sections['sc9'] = make_section(date='9999-12-31', lastsDays='2')
+        timeline = Timeline(self.novel)
+        self.assertEqual(timeline.unresolved, ['sc5', 'sc7', 'sc8', 'sc9'])
+        self.assertEqual(len(timeline.get_gaps()), 2)
+
+    def test_without_reference_date(self):
+        self.novel.referenceDate = None
+        self.assertEqual(Timeline(self.novel).unresolved, ['sc3', 'sc5'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""Regression tests for the daily word count log.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import unittest
+
+from mdnvlib.model.word_count_log import WordCountLog
+
+
+class WordCountLogTest(unittest.TestCase):
+
+    def test_empty(self):
+        wcLog = WordCountLog()
+        self.assertFalse(wcLog)
+        self.assertEqual(len(wcLog), 0)
+        self.assertIsNone(wcLog.latest())
+        self.assertEqual(list(wcLog), [])
+
+    def test_sorted_by_date(self):
+        wcLog = WordCountLog([
+            ('2024-03-02', 200, 210),
+            ('2024-03-01', '100', '110'),
+            ('2024-03-03', 300, 310),
+            ])
+        self.assertEqual(list(wcLog), [
+            ('2024-03-01', 100, 110),
+            ('2024-03-02', 200, 210),
+            ('2024-03-03', 300, 310),
+            ])
+        self.assertEqual(wcLog.latest(), ('2024-03-03', 300, 310))
+
+    def test_replace_day(self):
+        wcLog = WordCountLog([('2024-03-01', 100, 110), ('2024-03-02', 200, 210)])
+        wcLog.add('2024-03-01', 150, 160)
+        self.assertEqual(len(wcLog), 2)
+        self.assertEqual(list(wcLog)[0], ('2024-03-01', 150, 160))
+
+    def test_invalid_entries(self):
+        wcLog = WordCountLog()
+        with self.assertRaises(ValueError):
+            wcLog.add('2024-02-30', 1, 1)
+        with self.assertRaises(ValueError):
+            wcLog.add('2024-03-01', 'many', 1)
+        self.assertFalse(wcLog)
+
+    def test_get_range(self):
+        wcLog = WordCountLog([(f'2024-03-0{day}', day, day) for day in range(1, 8)])
+        self.assertEqual([entry[1] for entry in wcLog.get_range('2024-03-03', '2024-03-05')], [3, 4, 5])
+        self.assertEqual([entry[1] for entry in wcLog.get_range(endIso='2024-03-02')], [1, 2])
+        self.assertEqual([entry[1] for entry in wcLog.get_range(startIso='2024-03-07')], [7])
+
+    def test_compact(self):
+        wcLog = WordCountLog([
+            ('2024-03-01', 100, 110),
+            ('2024-03-02', 100, 110),
+            ('2024-03-03', 100, 120),
+            ('2024-03-04', 100, 120),
+            ])
+        expected = [('2024-03-01', 100, 110), ('2024-03-03', 100, 120)]
+        self.assertEqual(list(wcLog.compacted()), expected)
+        self.assertEqual(len(wcLog), 4)
+        wcLog.compact()
+        self.assertEqual(list(wcLog), expected)
+
+    def test_update(self):
+        wcLog = WordCountLog([('2024-03-01', 100, 110), ('2024-03-03', 300, 310)])
+        wcLog.update(WordCountLog([('2024-03-02', 200, 210), ('2024-03-03', 333, 343)]))
+        self.assertEqual(list(wcLog), [
+            ('2024-03-01', 100, 110),
+            ('2024-03-02', 200, 210),
+            ('2024-03-03', 333, 343),
+            ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Regression tests for distributing the section content conversion to worker processes.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import unittest
+from unittest import mock
+
+from mdnvlib.file import worker_pool
+from mdnvlib.file.worker_pool import MIN_PARALLEL_ITEMS
+from mdnvlib.file.worker_pool import map_in_batches
+import mdnvlib.novx_globals as novx_globals
+from yw7lib.yw7_markup import from_yw_counting
+from yw7lib.yw7_markup import to_yw
+
+ITEMS = list(range(MIN_PARALLEL_ITEMS * 3 + 1))
+
+
+def get_process_item(item):
+    """Return the item with the ID of the processing process."""
+    return item, os.getpid()
+
+
+def crash_in_worker(item):
+    """Return the doubled item in the calling process, but let a worker process die."""
+    if multiprocessing.current_process().name != 'MainProcess':
+        os._exit(1)
+    return item * 2
+
+
+def get_headless(item):
+    return novx_globals.is_headless()
+
+
+def spawning_executor(**kwargs):
+    """Return a process pool whose workers do not inherit the calling process's memory."""
+    return ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'), **kwargs)
+
+
+def failing_executor(**kwargs):
+    raise AssertionError('No process pool expected.')
+
+
+class MapInBatchesTest(unittest.TestCase):
+
+    def test_order_and_parity(self):
+        serial = map_in_batches(get_process_item, ITEMS, workers=1)
+        self.assertEqual({os.getpid()}, {pid for __, pid in serial})
+        for workers, batchSize in ((2, None), (4, None), (4, 1), (3, 1000)):
+            with self.subTest(workers=workers, batchSize=batchSize):
+                parallel = map_in_batches(get_process_item, ITEMS, workers=workers, batchSize=batchSize)
+                self.assertEqual(ITEMS, [item for item, __ in parallel])
+        parallel = map_in_batches(get_process_item, ITEMS, workers=4)
+        self.assertNotIn(os.getpid(), {pid for __, pid in parallel})
+
+    def test_conversion_parity(self):
+        texts = [f'Line {i}\n[i]italic[/i] and [b]bold[/b] {"word " * i}' for i in range(MIN_PARALLEL_ITEMS * 2)]
+        self.assertEqual(
+            map_in_batches(from_yw_counting, texts, workers=1),
+            map_in_batches(from_yw_counting, texts, workers=4)
+            )
+        markdown = [text for text, __ in map_in_batches(from_yw_counting, texts, workers=1)]
+        self.assertEqual(
+            map_in_batches(to_yw, markdown, workers=1),
+            map_in_batches(to_yw, markdown, workers=4)
+            )
+
+    def test_serial_below_minimum(self):
+        items = ITEMS[:MIN_PARALLEL_ITEMS - 1]
+        with mock.patch.object(worker_pool, 'ProcessPoolExecutor', failing_executor):
+            for workers in (None, 0, 1, 4):
+                with self.subTest(workers=workers):
+                    self.assertEqual(
+                        [(item, os.getpid()) for item in items],
+                        map_in_batches(get_process_item, items, workers=workers)
+                        )
+
+    def test_broken_pool(self):
+        self.assertEqual(
+            [item * 2 for item in ITEMS],
+            map_in_batches(crash_in_worker, ITEMS, workers=2)
+            )
+
+    def test_headless_is_passed_on(self):
+        environment = {key: value for key, value in os.environ.items() if key != 'MDNVLIB_HEADLESS'}
+        with mock.patch.dict(os.environ, environment, clear=True):
+            with mock.patch.object(worker_pool, 'ProcessPoolExecutor', spawning_executor):
+                with mock.patch.object(novx_globals, '_headless', False):
+                    self.assertEqual({False}, set(map_in_batches(get_headless, ITEMS, workers=2)))
+                    novx_globals.set_headless()
+                    self.assertEqual({True}, set(map_in_batches(get_headless, ITEMS, workers=2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""Regression tests for the writing progress statistics.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import unittest
+
+from mdnvlib.model.word_count_log import WordCountLog
+from mdnvlib.model.writing_progress import WritingProgress
+
+
+class WritingProgressTest(unittest.TestCase):
+
+    def setUp(self):
+        self.wcLog = WordCountLog([
+            ('2024-03-01', 1000, 1000),
+            ('2024-03-02', 1100, 1100),
+            ('2024-03-03', 1300, 1300),
+            ('2024-03-05', 1300, 1300),
+            ('2024-03-06', 1700, 1700),
+            ])
+
+    def test_statistics(self):
+        progress = WritingProgress(self.wcLog, wordCountStart=500)
+        self.assertEqual(list(progress.words), [0, 100, 200, 0, 400])
+        self.assertEqual(progress.get_delta(), 1200)
+        self.assertEqual(progress.currentStreak, 1)
+        self.assertEqual(progress.longestStreak, 2)
+        self.assertEqual(progress.get_daily_words()[2], ('2024-03-03', 200))
+
+    def test_rolling_averages(self):
+        averages = WritingProgress(self.wcLog).get_rolling_averages(2)
+        self.assertEqual([average for __, average in averages], [0, 50, 150, 0, 200])
+
+    def test_invalid_window(self):
+        progress = WritingProgress(self.wcLog, wordTarget=5000)
+        for window in (0, -1):
+            with self.assertRaises(ValueError):
+                progress.get_rolling_averages(window)
+            with self.assertRaises(ValueError):
+                progress.get_projected_completion(window)
+
+    def test_projected_completion(self):
+        self.assertEqual(WritingProgress(self.wcLog, wordTarget=1900).get_projected_completion(2), '2024-03-07')
+        self.assertEqual(WritingProgress(self.wcLog, wordTarget=1500).get_projected_completion(), '2024-03-06')
+        self.assertIsNone(WritingProgress(self.wcLog).get_projected_completion())
+
+    def test_projected_completion_out_of_range(self):
+        wcLog = WordCountLog([('2024-03-01', 0, 0), ('2024-03-02', 1, 1)])
+        self.assertIsNone(WritingProgress(wcLog, wordTarget=10 ** 12).get_projected_completion())
+
+    def test_empty_log(self):
+        progress = WritingProgress(WordCountLog(), wordTarget=1000, wordCountStart=0)
+        self.assertEqual(progress.get_rolling_averages(), [])
+        self.assertIsNone(progress.get_projected_completion())
+        self.assertIsNone(progress.get_delta())
+        self.assertEqual(progress.get_weekly_words(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
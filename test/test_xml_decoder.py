@@ -0,0 +1,99 @@
+"""Regression tests for decoding yw7 xml documents.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import codecs
+import os
+import unittest
+
+from mdnvlib.model.novel import Novel
+from mdnvlib.model.nv_tree import NvTree
+from mdnvlib.novx_globals import Error
+from yw7lib.xml_decoder import decode_xml
+from yw7lib.xml_decoder import get_xml_encoding
+from yw7lib.yw7_file import Yw7File
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+DOCUMENT = '<?xml version="1.0" encoding="{}"?>\n<YWRITER7><PROJECT><Title>Ärger 🐉</Title></PROJECT></YWRITER7>'
+
+
+class DecodeXmlTest(unittest.TestCase):
+
+    def test_utf8(self):
+        document = DOCUMENT.format('utf-8')
+        self.assertEqual('utf-8', get_xml_encoding(document.encode('utf-8')))
+        self.assertEqual(document, decode_xml(document.encode('utf-8')))
+
+    def test_utf8_bom(self):
+        document = DOCUMENT.format('utf-8')
+        self.assertEqual(document, decode_xml(codecs.BOM_UTF8 + document.encode('utf-8')))
+
+    def test_utf16_bom(self):
+        document = DOCUMENT.format('utf-16')
+        for bom, codec in ((codecs.BOM_UTF16_LE, 'utf-16-le'), (codecs.BOM_UTF16_BE, 'utf-16-be')):
+            with self.subTest(codec=codec):
+                self.assertEqual(document, decode_xml(bom + document.encode(codec)))
+
+    def test_utf16_without_bom(self):
+        document = DOCUMENT.format('utf-16')
+        for codec in ('utf-16-le', 'utf-16-be'):
+            with self.subTest(codec=codec):
+                self.assertEqual(document, decode_xml(document.encode(codec)))
+
+    def test_utf16_with_utf8_declaration(self):
+        # yWriter for iOS writes UTF-16 files declared as UTF-8.
+        document = DOCUMENT.format('utf-8')
+        self.assertEqual(document, decode_xml(codecs.BOM_UTF16_LE + document.encode('utf-16-le')))
+        self.assertEqual(document, decode_xml(document.encode('utf-16-le')))
+
+    def test_utf8_with_utf16_declaration(self):
+        document = DOCUMENT.format('UTF-16')
+        self.assertEqual(document, decode_xml(document.encode('utf-8')))
+
+    def test_declared_encoding(self):
+        document = DOCUMENT.format('iso-8859-1').replace(' 🐉', '')
+        self.assertEqual('iso-8859-1', get_xml_encoding(document.encode('iso-8859-1')))
+        self.assertEqual(document, decode_xml(document.encode('iso-8859-1')))
+
+    def test_string(self):
+        document = DOCUMENT.format('utf-8')
+        self.assertIs(document, decode_xml(document))
+
+    def test_undecodable(self):
+        with self.assertRaises(ValueError):
+            decode_xml(DOCUMENT.format('utf-8').encode('iso-8859-1', errors='replace'))
+        with self.assertRaises(LookupError):
+            decode_xml(DOCUMENT.format('no-such-codec').encode('utf-8'))
+
+
+class Yw7DecodingTest(unittest.TestCase):
+
+    def read_yw7(self, xmlData):
+        yw7File = Yw7File('novel.yw7')
+        yw7File.novel = Novel(tree=NvTree())
+        yw7File.read_data(xmlData)
+        return yw7File.novel
+
+    def test_utf16_file(self):
+        with open(os.path.join(DATA_PATH, 'normal.yw7'), 'rb') as f:
+            xmlData = f.read()
+        expected = self.read_yw7(xmlData)
+        novel = self.read_yw7(codecs.BOM_UTF16_LE + xmlData.decode('utf-8').encode('utf-16-le'))
+        self.assertEqual(expected.title, novel.title)
+        self.assertEqual(list(expected.sections), list(novel.sections))
+
+    def test_undecodable(self):
+        for xmlData in (
+            DOCUMENT.format('utf-8').encode('iso-8859-1', errors='replace'),
+            DOCUMENT.format('no-such-codec').encode('utf-8'),
+            codecs.BOM_UTF16_LE + b'<\x00Y',
+        ):
+            with self.subTest(xmlData=xmlData[:20]):
+                with self.assertRaises(Error):
+                    self.read_yw7(xmlData)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+"""Regression tests for removing illegal xml characters.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import unittest
+
+from yw7lib.xml_filter import strip_illegal_characters
+
+
+class StripIllegalCharactersTest(unittest.TestCase):
+
+    def test_control_characters_are_removed(self):
+        controls = ''.join(chr(i) for i in range(0x20) if chr(i) not in '\t\n\r')
+        self.assertEqual('<p>ab</p>', strip_illegal_characters(f'<p>a{controls}b</p>'))
+        self.assertEqual('ab', strip_illegal_characters('a\x00\x08\x0b\x0c\x1fb'))
+
+    def test_legal_characters_are_kept(self):
+        text = '<p>a|b\tc\nd\re ä�\U0001f409 ~\x7f</p>'
+        self.assertIs(text, strip_illegal_characters(text))
+
+    def test_mixed(self):
+        self.assertEqual(
+            'a|b\tc\n\U0001f409d',
+            strip_illegal_characters('a|\x01b\tc\n\x1b\U0001f409d\x02')
+            )
+
+    def test_empty(self):
+        self.assertEqual('', strip_illegal_characters(''))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""Regression tests for the yw7 xml serializer and the compact yw7 output.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+from mdnvlib.mdnov.mdnov_file import MdnovFile
+from mdnvlib.model.novel import Novel
+from mdnvlib.model.nv_tree import NvTree
+from yw7lib.xml_writer import serialize
+from yw7lib.yw7_file import Yw7File
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+CDATA_TAGS = frozenset(('SceneContent',))
+SOURCE = (
+    '<YWRITER7>'
+    '<PROJECT><Title>A &amp; B &lt;c&gt; "q"</Title><Desc /></PROJECT>'
+    '<SCENES><SCENE>'
+    '<ID>1</ID>'
+    '<SceneContent>x &amp; &lt;y&gt;</SceneContent>'
+    '<A><B><C><D><E>t<F>u</F>v</E></D></C></B></A>'
+    '</SCENE></SCENES>'
+    '</YWRITER7>'
+    )
+INDENTED = (
+    '<YWRITER7>\n'
+    '  <PROJECT>\n'
+    '    <Title>A &amp; B &lt;c&gt; "q"</Title>\n'
+    '    <Desc />\n'
+    '  </PROJECT>\n'
+    '  <SCENES>\n'
+    '    <SCENE>\n'
+    '      <ID>1</ID>\n'
+    '      <SceneContent><![CDATA[x &amp; &lt;y&gt;]]></SceneContent>\n'
+    '      <A>\n'
+    '        <B>\n'
+    '          <C>\n'
+    # The children of elements below the paragraph level are not indented.
+    '            <D><E>t<F>u</F>v</E></D></C>\n'
+    '        </B>\n'
+    '      </A>\n'
+    '    </SCENE>\n'
+    '  </SCENES>\n'
+    '</YWRITER7>\n'
+    )
+COMPACT = (
+    '<YWRITER7>'
+    '<PROJECT><Title>A &amp; B &lt;c&gt; "q"</Title><Desc /></PROJECT>'
+    '<SCENES><SCENE>'
+    '<ID>1</ID>'
+    '<SceneContent><![CDATA[x &amp; &lt;y&gt;]]></SceneContent>'
+    '<A><B><C><D><E>t<F>u</F>v</E></D></C></B></A>'
+    '</SCENE></SCENES>'
+    '</YWRITER7>'
+    )
+
+
+class SerializeTest(unittest.TestCase):
+
+    def test_indented(self):
+        self.assertEqual(INDENTED, serialize(ET.fromstring(SOURCE), cdataTags=CDATA_TAGS))
+
+    def test_compact(self):
+        self.assertEqual(COMPACT, serialize(ET.fromstring(SOURCE), cdataTags=CDATA_TAGS, indentation=False))
+
+    def test_tree_is_not_modified(self):
+        root = ET.fromstring(SOURCE)
+        serialize(root, cdataTags=CDATA_TAGS)
+        self.assertEqual(SOURCE, ET.tostring(root, encoding='unicode'))
+
+    def test_existing_whitespace(self):
+        root = ET.fromstring('<R><P>a<I>b</I> c</P>\n\n<Q /></R>')
+        self.assertEqual('<R>\n  <P>a<I>b</I> c</P>\n  <Q />\n</R>\n', serialize(root))
+
+    def test_deep_tree(self):
+        root = ET.Element('R')
+        element = root
+        for __ in range(5000):
+            element = ET.SubElement(element, 'E')
+        element.text = 'x'
+        xmlText = serialize(root, indentation=False)
+        self.assertEqual(f'<R>{"<E>" * 5000}x{"</E>" * 5000}</R>', xmlText)
+
+
+class CompactYw7Test(unittest.TestCase):
+
+    def setUp(self):
+        self._tempDir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._tempDir.cleanup()
+
+    def test_round_trip(self):
+        source = MdnovFile(os.path.join(DATA_PATH, 'normal.mdnov'))
+        source.novel = Novel(tree=NvTree())
+        source.read()
+        yw7Texts = []
+        mdnovTexts = []
+        for compact in (False, True):
+            target = Yw7File(os.path.join(self._tempDir.name, f'{compact}.yw7'), compact=compact)
+            target.novel = source.novel
+            target.wcLog = source.wcLog
+            target.write()
+            with open(target.filePath, encoding='utf-8') as f:
+                yw7Texts.append(f.read())
+            reloaded = Yw7File(target.filePath)
+            reloaded.novel = Novel(tree=NvTree())
+            reloaded.read()
+            mdnov = MdnovFile('novel.mdnov')
+            mdnov.novel = reloaded.novel
+            mdnov.wcLog = reloaded.wcLog
+            mdnovTexts.append(mdnov.write_data())
+        indented, compacted = yw7Texts
+        self.assertLess(len(compacted), len(indented))
+        self.assertNotIn('>\n  <', compacted)
+        self.assertEqual(mdnovTexts[0], mdnovTexts[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Regression tests for the event-driven yw7 reader.
+
+Copyright (c) 2024 Peter Triesberger
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU LGPLv3 (https://www.gnu.org/licenses/lgpl-3.0.en.html)
+"""
+import os
+import unittest
+
+from mdnvlib.mdnov.mdnov_file import MdnovFile
+from mdnvlib.model.novel import Novel
+from mdnvlib.model.nv_tree import NvTree
+from mdnvlib.novx_globals import CH_ROOT
+from yw7lib.yw7_file import Yw7File
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SAMPLES = ('normal.yw7', 'output.yw7')
+
+
+def read_yw7(filePath, eventParser):
+    """Return the Yw7File instance after reading filePath."""
+    source = Yw7File(filePath, eventParser=eventParser)
+    source.novel = Novel(tree=NvTree())
+    source.read()
+    return source
+
+
+def to_mdnov(source):
+    """Return the mdnov file content converted from a read Yw7File instance."""
+    target = MdnovFile('novel.mdnov')
+    target.novel = source.novel
+    target.wcLog = source.wcLog
+    return target.write_data()
+
+
+class EventParserTest(unittest.TestCase):
+
+    def test_same_model(self):
+        for sample in SAMPLES:
+            with self.subTest(sample=sample):
+                treeSource = read_yw7(os.path.join(DATA_PATH, sample), False)
+                eventSource = read_yw7(os.path.join(DATA_PATH, sample), True)
+                for collection in ('chapters', 'sections', 'characters', 'locations', 'items', 'plotLines', 'plotPoints', 'projectNotes'):
+                    self.assertEqual(
+                        list(getattr(treeSource.novel, collection)),
+                        list(getattr(eventSource.novel, collection)),
+                        )
+                self.assertEqual(treeSource.novel.tree.get_children(CH_ROOT), eventSource.novel.tree.get_children(CH_ROOT))
+                self.assertEqual(list(treeSource.wcLog), list(eventSource.wcLog))
+                self.assertEqual(treeSource.readErrors, eventSource.readErrors)
+
+    def test_same_output(self):
+        for sample in SAMPLES:
+            with self.subTest(sample=sample):
+                treeSource = read_yw7(os.path.join(DATA_PATH, sample), False)
+                eventSource = read_yw7(os.path.join(DATA_PATH, sample), True)
+                self.assertEqual(to_mdnov(treeSource), to_mdnov(eventSource))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Measure how the yw7 reading time scales with the number of scenes.
+
+Generate synthetic yw7 projects of increasing size in a temporary
+directory, read each of them, and print the time per scene.
+With linear scaling, the time per scene remains about constant.
+
+One tenth of the scenes are plot points in plot line chapters,
+and every seventh normal scene is associated with all plot lines.
+
+usage: yw7_read_benchmark.py [-e] [sizes ...]
+
+For further information see https://github.com/peter88213/mdnov_yw7
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+import os
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../src'))
+from mdnvlib.model.novel import Novel
+from mdnvlib.model.nv_tree import NvTree
+from yw7lib.yw7_file import Yw7File
+
+SIZES = (1250, 2500, 5000, 10000)
+PLOT_LINES = 5
+SCENES_PER_CHAPTER = 10
+CONTENT = 'Lorem ipsum [i]dolor[/i] sit amet, [b]consectetur[/b] adipiscing elit.\n' * 3
+
+
+def write_project(filePath, scenes):
+    """Write a synthetic yw7 project with the given number of scenes."""
+    plotPoints = scenes // 10
+    normalScenes = scenes - plotPoints
+    lines = [
+        '<?xml version="1.0" encoding="utf-8"?>',
+        '<YWRITER7>',
+        '<PROJECT><Ver>7</Ver><Title>Benchmark</Title></PROJECT>',
+        '<LOCATIONS><LOCATION><ID>1</ID><Title>Location</Title></LOCATION></LOCATIONS>',
+        '<ITEMS><ITEM><ID>1</ID><Title>Item</Title></ITEM></ITEMS>',
+        '<CHARACTERS>',
+        ]
+    for crId in range(1, 51):
+        lines.append(f'<CHARACTER><ID>{crId}</ID><Title>Character {crId}</Title></CHARACTER>')
+    lines.append('</CHARACTERS>')
+    lines.append('<SCENES>')
+    arcs = ';'.join(f'PL{i}' for i in range(PLOT_LINES))
+    for scId in range(1, normalScenes + 1):
+        fields = ''
+        if scId % 7 == 0:
+            fields = f'<Fields><Field_SceneArcs>{arcs}</Field_SceneArcs></Fields>'
+        lines.append(
+            f'<SCENE><ID>{scId}</ID><Title>Scene {scId}</Title>{fields}'
+            f'<SceneContent><![CDATA[{CONTENT}]]></SceneContent>'
+            f'<Characters><CharID>{scId % 50 + 1}</CharID></Characters>'
+            f'<Locations><LocID>1</LocID></Locations><Items><ItemID>1</ItemID></Items></SCENE>'
+            )
+    for scId in range(normalScenes + 1, scenes + 1):
+        lines.append(
+            f'<SCENE><ID>{scId}</ID><Title>Plot point {scId}</Title><Unused>-1</Unused>'
+            f'<Fields><Field_SceneType>2</Field_SceneType>'
+            f'<Field_SceneAssoc>{scId % normalScenes + 1}</Field_SceneAssoc></Fields></SCENE>'
+            )
+    lines.append('</SCENES>')
+    lines.append('<CHAPTERS>')
+    chId = 0
+    for first in range(1, normalScenes + 1, SCENES_PER_CHAPTER):
+        chId += 1
+        last = min(first + SCENES_PER_CHAPTER, normalScenes + 1)
+        scIds = ''.join(f'<ScID>{scId}</ScID>' for scId in range(first, last))
+        lines.append(f'<CHAPTER><ID>{chId}</ID><Title>Chapter {chId}</Title><Scenes>{scIds}</Scenes></CHAPTER>')
+    for i in range(PLOT_LINES):
+        chId += 1
+        scIds = ''.join(
+            f'<ScID>{scId}</ScID>' for scId in range(normalScenes + 1 + i, scenes + 1, PLOT_LINES)
+            )
+        lines.append(
+            f'<CHAPTER><ID>{chId}</ID><Title>Plot line {i}</Title>'
+            f'<Fields><Field_ArcDefinition>PL{i}</Field_ArcDefinition></Fields>'
+            f'<Scenes>{scIds}</Scenes></CHAPTER>'
+            )
+    lines.append('</CHAPTERS>')
+    lines.append('</YWRITER7>')
+    with open(filePath, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+
+
+def read_project(filePath, eventParser):
+    """Read the project and return the elapsed time in seconds."""
+    ywPrj = Yw7File(filePath, eventParser=eventParser)
+    ywPrj.novel = Novel(tree=NvTree())
+    start = perf_counter()
+    ywPrj.read()
+    return perf_counter() - start
+
+
+def main(sizes, eventParser=False):
+    print(f'{"scenes":>8} {"seconds":>9} {"µs/scene":>9}')
+    with TemporaryDirectory() as tempDir:
+        for scenes in sizes:
+            filePath = os.path.join(tempDir, f'benchmark_{scenes}.yw7')
+            write_project(filePath, scenes)
+            seconds = read_project(filePath, eventParser)
+            print(f'{scenes:>8} {seconds:>9.3f} {seconds / scenes * 1e6:>9.1f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='yw7 reading benchmark')
+    parser.add_argument('sizes', type=int, nargs='*', default=SIZES, help='numbers of scenes')
+    parser.add_argument('-e', '--event-parser', action='store_true', dest='eventParser',
+                        help='use the event-driven parser')
+    args = parser.parse_args()
+    main(args.sizes, args.eventParser)